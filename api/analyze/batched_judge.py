@@ -0,0 +1,37 @@
+import logging
+from typing import Dict, List
+from .dynamic_batcher import AsyncDynamicBatcher
+from .judge_ai import JudgeAI
+
+logger = logging.getLogger(__name__)
+
+class BatchedJudge:
+    """
+    Micro-batches multi-turn judge requests into grouped evaluations.
+    
+    Callers await add_request() as if it were a single evaluation; an
+    AsyncDynamicBatcher collects up to batch_size requests (or whatever arrives
+    within wait_timeout seconds of the first one) and judges them in one call.
+    """
+    
+    def __init__(self, judge_ai: JudgeAI, batch_size: int = 10, wait_timeout: float = 0.05):
+        self.judge_ai = judge_ai
+        self._batcher = AsyncDynamicBatcher(
+            judge_ai.evaluate_multi_turn_batch,
+            max_batch_size=batch_size,
+            batch_wait_timeout_s=wait_timeout
+        )
+    
+    async def add_request(self, user_message: str, bot_response: str, conversation_history: List[Dict[str, str]]) -> Dict:
+        """
+        Queue a multi-turn evaluation and wait for its result.
+        
+        Args:
+            user_message: The user message that prompted the response
+            bot_response: The bot response to evaluate
+            conversation_history: Messages preceding the user message
+        
+        Returns:
+            Evaluation dict, as returned by JudgeAI.evaluate_multi_turn_response
+        """
+        return await self._batcher.submit((user_message, bot_response, conversation_history))
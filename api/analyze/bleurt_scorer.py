@@ -42,14 +42,14 @@ class BLEURTScorer:
             logger.info("BLEURT initialization complete")
             
         except ImportError as e:
-            logger.error(f"HuggingFace evaluate not available: {e}")
+            logger.error("HuggingFace evaluate not available: %s", e)
             logger.error("Please install: pip install evaluate")
             raise ImportError("HuggingFace evaluate not available. Please install with: pip install evaluate")
         except Exception as e:
-            logger.error(f"Failed to load BLEURT model: {e}")
-            logger.error(f"Exception type: {type(e).__name__}")
+            logger.error("Failed to load BLEURT model: %s", e)
+            logger.error("Exception type: %s", type(e).__name__)
             import traceback
-            logger.error(f"BLEURT loading traceback: {traceback.format_exc()}")
+            logger.error("BLEURT loading traceback: %s", traceback.format_exc())
             
             # Fallback to sentence transformer similarity
             logger.warning("BLEURT failed, falling back to SentenceTransformer semantic similarity...")
@@ -63,7 +63,7 @@ class BLEURTScorer:
                 logger.info("Fallback to SentenceTransformer successful")
                 return
             except Exception as fallback_e:
-                logger.error(f"Fallback to SentenceTransformer also failed: {fallback_e}")
+                logger.error("Fallback to SentenceTransformer also failed: %s", fallback_e)
                 raise RuntimeError(f"Both BLEURT and SentenceTransformer fallback failed: {e}")
     
     def compute_score(self, reference: str, candidate: str) -> float:
@@ -90,12 +90,12 @@ class BLEURTScorer:
             )
             raw_score = result['scores'][0]
             
-            logger.debug(f"BLEURT raw score: {raw_score:.3f}")
+            logger.debug("BLEURT raw score: %.3f", raw_score)
             
             return raw_score
             
         except Exception as e:
-            logger.error(f"Error computing BLEURT score: {e}")
+            logger.error("Error computing BLEURT score: %s", e)
             # Return a default low score if computation fails
             return -1.0
     
@@ -117,7 +117,7 @@ class BLEURTScorer:
             raise ValueError("References and candidates must have the same length")
             
         try:
-            logger.debug(f"Computing BLEURT scores for {len(references)} pairs...")
+            logger.debug("Computing BLEURT scores for %s pairs...", len(references))
             
             # Compute raw BLEURT scores using HuggingFace evaluate
             result = self.scorer.compute(
@@ -126,13 +126,14 @@ class BLEURTScorer:
             )
             raw_scores = result['scores']
             
-            logger.info(f"Computed BLEURT scores for {len(references)} pairs")
-            logger.debug(f"Raw score range: {min(raw_scores):.3f} - {max(raw_scores):.3f}")
+            logger.info("Computed BLEURT scores for %s pairs", len(references))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Raw score range: %.3f - %.3f", min(raw_scores), max(raw_scores))
             
             return raw_scores
             
         except Exception as e:
-            logger.error(f"Error computing batch BLEURT scores: {e}")
+            logger.error("Error computing batch BLEURT scores: %s", e)
             # Return default low scores if computation fails
             return [-1.0] * len(references)
     
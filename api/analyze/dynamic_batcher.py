@@ -0,0 +1,85 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class AsyncDynamicBatcher:
+    """
+    Coalesces concurrent single-item calls into one downstream batch call.
+    
+    Callers await submit() as if it were a single call; a background worker takes
+    the first queued item, gathers whatever else arrives within batch_wait_timeout_s
+    (up to max_batch_size), and resolves each caller with its slot of the batch result.
+    """
+    
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_batch_size: int = 32,
+        batch_wait_timeout_s: float = 0.002
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.batch_wait_timeout_s = batch_wait_timeout_s
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Strong references to in-flight dispatches so they are not garbage collected
+        self._dispatches = set()
+        
+        logger.info(f"AsyncDynamicBatcher initialized: max_batch_size={self.max_batch_size}, wait={self.batch_wait_timeout_s}s")
+    
+    async def submit(self, item: Any) -> Any:
+        """
+        Queue one item and wait for its result.
+        
+        Args:
+            item: Input for batch_fn
+        
+        Returns:
+            The batch_fn output at this item's position
+        """
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+    
+    async def _run(self):
+        """Collect queued items into batches and dispatch each batch without blocking collection."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_wait_timeout_s
+            while len(batch) < self.max_batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            task = asyncio.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+    
+    async def _dispatch(self, batch: List[Tuple[Any, asyncio.Future]]):
+        """Run one batch call and resolve each caller's future with its own result."""
+        try:
+            results = await self.batch_fn([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"Batch call returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            logger.error(f"Dynamic batch call failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -6,9 +6,12 @@ import json
 import logging
 import time
 from pathlib import Path
-from typing import Iterator, Dict, Any
+from typing import Iterator, Dict, Any, Optional
 
-from spacy_pipeline import get_nlp
+import numpy as np
+
+from spacy_pipeline import get_nlp_vector_only
+from vector_index import INDEX_BACKENDS
 
 # Configure logging
 logging.basicConfig(
@@ -50,29 +53,50 @@ def extract_texts(data_stream: Iterator[Dict[str, Any]]) -> Iterator[str]:
         yield item['text']
 
 
-def process_corpus(input_path: Path, batch_size: int = 32, mem0_client=None) -> None:
-    """Process JSONL corpus through spaCy pipeline with progress logging."""
+def process_corpus(
+    input_path: Path,
+    batch_size: int = 32,
+    mem0_client=None,
+    index_path: Optional[Path] = None,
+    backend: str = "hnsw"
+) -> None:
+    """Process JSONL corpus through spaCy pipeline with progress logging.
+    
+    With index_path, document vectors are also collected and saved as the
+    "hnsw", "ivfpq", "brute" or "brute_int8" index that retrieval.py loads from RETRIEVAL_INDEX_PATH.
+    """
     
     logger.info(f"Starting corpus ingestion from: {input_path}")
     logger.info(f"Batch size: {batch_size}")
     
-    # Initialize spaCy pipeline
-    logger.info("Loading spaCy pipeline...")
-    nlp = get_nlp(mem0_client=mem0_client)
-    logger.info(f"Pipeline loaded with components: {nlp.pipe_names}")
+    # Only doc.vector is read, so skip the tagger, parser, NER and custom components
+    logger.info("Loading spaCy vector-only pipeline...")
+    nlp = get_nlp_vector_only()
+    logger.info(f"Pipeline loaded: {nlp.meta['name']} (tokenizer and static vectors only)")
     
     # Load data stream
     data_stream = load_jsonl(input_path)
-    text_stream = extract_texts(data_stream)
+    
+    # Vectors and records for the ANN index, in document order
+    vectors = []
+    records = []
     
     # Process in batches
     processed_count = 0
     start_time = time.time()
     
     try:
-        for doc_batch in nlp.pipe(text_stream, batch_size=batch_size):
+        item_stream = ((item['text'], item) for item in data_stream)
+        for doc, item in nlp.pipe(item_stream, batch_size=batch_size, as_tuples=True):
             processed_count += 1
             
+            if index_path is not None and doc.has_vector:
+                vectors.append(doc.vector)
+                records.append({
+                    "text": item['text'],
+                    "metadata": {key: value for key, value in item.items() if key != 'text'}
+                })
+            
             # Log progress every 1000 documents
             if processed_count % 1000 == 0:
                 elapsed = time.time() - start_time
@@ -91,6 +115,13 @@ def process_corpus(input_path: Path, batch_size: int = 32, mem0_client=None) ->
         logger.info(f"Average rate: {avg_rate:.1f} documents/second")
         logger.info("=" * 60)
         
+        if index_path is not None:
+            if vectors:
+                index_class, _ = INDEX_BACKENDS[backend]
+                index_class.build(np.vstack(vectors), records).save(str(index_path))
+            else:
+                logger.warning("No document vectors produced; ANN index not written")
+        
     except KeyboardInterrupt:
         logger.info(f"\nIngestion interrupted. Processed {processed_count:,} documents.")
         raise
@@ -121,6 +152,20 @@ def main():
         help="Batch size for spaCy processing"
     )
     
+    parser.add_argument(
+        "--index",
+        type=Path,
+        default=None,
+        help="Also write an ANN index of the document vectors here (for RETRIEVAL_INDEX_PATH)"
+    )
+    
+    parser.add_argument(
+        "--backend",
+        choices=sorted(INDEX_BACKENDS),
+        default="hnsw",
+        help="Index type written by --index; set RETRIEVAL_BACKEND to match when serving"
+    )
+    
     args = parser.parse_args()
     
     # Validate input file
@@ -139,7 +184,7 @@ def main():
     try:
         # Note: mem0_client would need to be initialized here
         # For now, passing None - VectorExporter will handle gracefully
-        process_corpus(args.input, args.batch, mem0_client=None)
+        process_corpus(args.input, args.batch, mem0_client=None, index_path=args.index, backend=args.backend)
         return 0
     except KeyboardInterrupt:
         return 130  # Standard exit code for Ctrl+C
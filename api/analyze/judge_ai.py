@@ -1,27 +1,61 @@
 import logging
 import json
-from typing import Dict, List, Tuple, Optional
+import array
+import math
+from typing import Callable, Dict, List, Tuple, Optional, Union
 from openai import AsyncOpenAI
 import asyncio
+import numpy as np
 from .mt_bench_evaluator import MTBenchEvaluator, MTBenchEvaluation
 from .bleurt_scorer import BLEURTScorer
 
 logger = logging.getLogger(__name__)
 
+# Lower edges of the fair/good/excellent score buckets
+_SCORE_BUCKET_EDGES = np.array([0.5, 0.7, 0.9])
+
+# Per-turn score fields averaged by calculate_multi_turn_metrics
+_MULTI_TURN_SCORE_KEYS = (
+    "overall_score",
+    "relevance_score",
+    "consistency_score",
+    "technical_score",
+    "clarity_score",
+    "persona_score",
+)
+
 class JudgeAI:
-    def __init__(self, openai_client: AsyncOpenAI, use_mt_bench: bool = True, use_bleurt: bool = False):
+    def __init__(
+        self,
+        openai_client: AsyncOpenAI,
+        use_mt_bench: bool = True,
+        use_bleurt: bool = False,
+        fuse_size: int = 5,
+        pool_size: Optional[int] = None
+    ):
         self.openai_client = openai_client
         self.use_mt_bench = use_mt_bench
         self.use_bleurt = use_bleurt
         
         # Initialize MT-Bench evaluator if enabled
         if self.use_mt_bench:
-            self.mt_bench_evaluator = MTBenchEvaluator(openai_client)
+            self.mt_bench_evaluator = MTBenchEvaluator(openai_client, fuse_size=fuse_size, pool_size=pool_size)
             
         # Initialize BLEURT scorer (lazy loading)
         self.bleurt_scorer = None
         if self.use_bleurt:
             self.bleurt_scorer = BLEURTScorer()
+        
+        # Evaluation mode is fixed after construction, so resolve dispatch once
+        if self.use_mt_bench:
+            self._aggregate_impl = self._calculate_mt_bench_metrics
+            self._multi_turn_impl = self._evaluate_multi_turn_with_mt_bench
+        elif self.use_bleurt:
+            self._aggregate_impl = self._calculate_bleurt_only_metrics
+            self._multi_turn_impl = self._evaluate_multi_turn_with_legacy
+        else:
+            self._aggregate_impl = self._calculate_legacy_metrics
+            self._multi_turn_impl = self._evaluate_multi_turn_with_legacy
     
     async def evaluate_response(self, question: str, bot_response: str, expected_answer: str) -> Dict:
         """
@@ -37,10 +71,10 @@ class JudgeAI:
     
     async def _evaluate_with_mt_bench(self, question: str, bot_response: str, expected_answer: str) -> Dict:
         """Evaluate using MT-Bench methodology with optional BLEURT scoring."""
-        logger.info(f"=== JudgeAI MT-Bench Evaluation ===")
-        logger.info(f"Question: {question[:100]}...")
-        logger.info(f"Bot Response: {bot_response[:100]}...")
-        logger.info(f"Expected Answer: {expected_answer[:100] if expected_answer else 'None'}...")
+        logger.info("=== JudgeAI MT-Bench Evaluation ===")
+        logger.info("Question: %s...", question[:100])
+        logger.info("Bot Response: %s...", bot_response[:100])
+        logger.info("Expected Answer: %s...", expected_answer[:100] if expected_answer else 'None')
         
         try:
             mt_evaluation = await self.mt_bench_evaluator.evaluate_single_response(
@@ -49,10 +83,10 @@ class JudgeAI:
                 expected_answer=expected_answer
             )
             
-            logger.info(f"MT-Bench evaluation received:")
-            logger.info(f"  Overall Score: {mt_evaluation.overall_score:.3f}")
-            logger.info(f"  Dimension Scores: {mt_evaluation.dimension_scores}")
-            logger.info(f"  Confidence: {mt_evaluation.confidence:.3f}")
+            logger.info("MT-Bench evaluation received:")
+            logger.info("  Overall Score: %.3f", mt_evaluation.overall_score)
+            logger.info("  Dimension Scores: %s", mt_evaluation.dimension_scores)
+            logger.info("  Confidence: %.3f", mt_evaluation.confidence)
             
             # Convert MT-Bench evaluation to legacy format for compatibility
             legacy_evaluation = {
@@ -67,6 +101,7 @@ class JudgeAI:
                     "weaknesses": mt_evaluation.weaknesses
                 },
                 "evaluation_method": "mt_bench",
+                "evaluation_status": mt_evaluation.evaluation_status,
                 "confidence": mt_evaluation.confidence
             }
             
@@ -87,34 +122,34 @@ class JudgeAI:
                     legacy_evaluation["overall_score"] = weighted_score
                     legacy_evaluation["original_mt_bench_score"] = mt_evaluation.overall_score
                     
-                    logger.info(f"BLEURT score: {bleurt_score:.3f} ({bleurt_interpretation})")
-                    logger.info(f"Updated overall score: {weighted_score:.3f} (was {mt_evaluation.overall_score:.3f})")
+                    logger.info("BLEURT score: %.3f (%s)", bleurt_score, bleurt_interpretation)
+                    logger.info("Updated overall score: %.3f (was %.3f)", weighted_score, mt_evaluation.overall_score)
                     
                 except Exception as e:
-                    logger.error(f"BLEURT scoring failed: {e}")
+                    logger.error("BLEURT scoring failed: %s", e)
                     # Continue without BLEURT score
             
-            logger.info(f"Converted to legacy format:")
-            logger.info(f"  Content Similarity: {legacy_evaluation['content_similarity']:.3f}")
-            logger.info(f"  Style Fidelity: {legacy_evaluation['style_fidelity']:.3f}")
-            logger.info(f"  Overall Score: {legacy_evaluation['overall_score']:.3f}")
-            logger.info(f"  Evaluation Method: {legacy_evaluation['evaluation_method']}")
+            logger.info("Converted to legacy format:")
+            logger.info("  Content Similarity: %.3f", legacy_evaluation['content_similarity'])
+            logger.info("  Style Fidelity: %.3f", legacy_evaluation['style_fidelity'])
+            logger.info("  Overall Score: %.3f", legacy_evaluation['overall_score'])
+            logger.info("  Evaluation Method: %s", legacy_evaluation['evaluation_method'])
             
             return legacy_evaluation
             
         except Exception as e:
-            logger.error(f"MT-Bench evaluation failed, falling back to legacy: {e}")
-            logger.error(f"Exception details: {type(e).__name__}: {str(e)}")
+            logger.error("MT-Bench evaluation failed, falling back to legacy: %s", e)
+            logger.error("Exception details: %s: %s", type(e).__name__, str(e))
             import traceback
-            logger.error(f"MT-Bench fallback traceback: {traceback.format_exc()}")
+            logger.error("MT-Bench fallback traceback: %s", traceback.format_exc())
             return await self._evaluate_with_legacy(question, bot_response, expected_answer)
     
     async def _evaluate_with_bleurt_only(self, question: str, bot_response: str, expected_answer: str) -> Dict:
         """BLEURT-only evaluation for transcript tests."""
-        logger.info(f"=== BLEURT-Only Evaluation ===")
-        logger.info(f"Question: {question[:100]}...")
-        logger.info(f"Bot Response: {bot_response[:100]}...")
-        logger.info(f"Expected Answer: {expected_answer[:100] if expected_answer else 'None'}...")
+        logger.info("=== BLEURT-Only Evaluation ===")
+        logger.info("Question: %s...", question[:100])
+        logger.info("Bot Response: %s...", bot_response[:100])
+        logger.info("Expected Answer: %s...", expected_answer[:100] if expected_answer else 'None')
         
         try:
             if not expected_answer or not expected_answer.strip():
@@ -130,9 +165,9 @@ class JudgeAI:
             logger.info("Computing BLEURT score...")
             bleurt_score = self.bleurt_scorer.compute_score(expected_answer, bot_response)
             bleurt_interpretation = self.bleurt_scorer.get_score_interpretation(bleurt_score)
-            logger.info(f"BLEURT score computed successfully: {bleurt_score:.3f}")
+            logger.info("BLEURT score computed successfully: %.3f", bleurt_score)
             
-            logger.info(f"BLEURT score: {bleurt_score:.3f} ({bleurt_interpretation})")
+            logger.info("BLEURT score: %.3f (%s)", bleurt_score, bleurt_interpretation)
             
             # Return evaluation with BLEURT as the main score
             evaluation = {
@@ -153,20 +188,20 @@ class JudgeAI:
                 "quality_distribution": self._analyze_quality_distribution_raw_bleurt([bleurt_score])
             }
             
-            logger.info(f"BLEURT-only evaluation complete - Score: {bleurt_score:.3f}")
+            logger.info("BLEURT-only evaluation complete - Score: %.3f", bleurt_score)
             return evaluation
             
         except Exception as e:
-            logger.error(f"BLEURT-only evaluation failed: {e}")
-            logger.error(f"Exception type: {type(e).__name__}")
+            logger.error("BLEURT-only evaluation failed: %s", e)
+            logger.error("Exception type: %s", type(e).__name__)
             import traceback
-            logger.error(f"BLEURT evaluation traceback: {traceback.format_exc()}")
+            logger.error("BLEURT evaluation traceback: %s", traceback.format_exc())
             return self._default_evaluation(f"BLEURT evaluation error: {e}")
     
     async def _evaluate_with_legacy(self, question: str, bot_response: str, expected_answer: str) -> Dict:
         """Legacy evaluation method."""
         try:
-            logger.info(f"Evaluating response for question: {question[:50]}...")
+            logger.info("Evaluating response for question: %s...", question[:50])
             
             evaluation_prompt = f"""
             You are an expert AI evaluator. Compare the bot's response to the expected answer and provide scores.
@@ -249,25 +284,25 @@ class JudgeAI:
                                 f"BLEURT semantic similarity: {bleurt_score:.3f} - {bleurt_interpretation}"
                             )
                             
-                            logger.info(f"BLEURT score: {bleurt_score:.3f} ({bleurt_interpretation})")
-                            logger.info(f"Updated overall score: {weighted_score:.3f} (was {evaluation['overall_score']:.3f})")
+                            logger.info("BLEURT score: %.3f (%s)", bleurt_score, bleurt_interpretation)
+                            logger.info("Updated overall score: %.3f (was %.3f)", weighted_score, evaluation['overall_score'])
                             
                         except Exception as e:
-                            logger.error(f"BLEURT scoring failed: {e}")
+                            logger.error("BLEURT scoring failed: %s", e)
                             # Continue without BLEURT score
                     
-                    logger.info(f"Evaluation complete - Overall score: {evaluation.get('overall_score', 0):.2f}")
+                    logger.info("Evaluation complete - Overall score: %.2f", evaluation.get('overall_score', 0))
                     return evaluation
                 else:
                     logger.error("No valid JSON found in evaluation response")
                     return self._default_evaluation("JSON parsing failed")
                     
             except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse evaluation JSON: {e}")
+                logger.error("Failed to parse evaluation JSON: %s", e)
                 return self._default_evaluation(f"JSON decode error: {e}")
                 
         except Exception as e:
-            logger.error(f"Error evaluating response: {e}")
+            logger.error("Error evaluating response: %s", e)
             return self._default_evaluation(f"Evaluation error: {e}")
     
     def _default_evaluation(self, error_msg: str) -> Dict:
@@ -286,18 +321,38 @@ class JudgeAI:
             "evaluation_method": "legacy"
         }
     
-    async def batch_evaluate(self, test_results: List[Dict], qa_pairs: List[Dict[str, str]]) -> List[Dict]:
+    async def batch_evaluate(
+        self,
+        test_results: List[Dict],
+        qa_pairs: Union[List[Dict[str, str]], Dict[int, Dict[str, str]]],
+        use_batch_api: bool = False,
+        on_batch_status: Optional[Callable[[str, str], None]] = None
+    ) -> List[Dict]:
         """
         Evaluate multiple responses in batch.
+        
+        Args:
+            test_results: Question results to evaluate
+            qa_pairs: Reference Q&A pairs, either a list aligned with test_results or a
+                {question_index: qa_pair} index matched via each result's question_index
+                (so any slice of test_results can be evaluated against the same index)
+            use_batch_api: Judge MT-Bench prompts through the OpenAI Batch API
+            on_batch_status: Called with (batch_id, status) while a Batch API job runs
+        
+        Returns:
+            Evaluated result dicts in test_results order
         """
-        logger.info(f"=== JudgeAI batch_evaluate called ===")
-        logger.info(f"use_mt_bench: {self.use_mt_bench}")
-        logger.info(f"use_bleurt: {self.use_bleurt}")
-        logger.info(f"bleurt_scorer: {self.bleurt_scorer}")
+        if isinstance(qa_pairs, dict):
+            qa_pairs = [qa_pairs.get(result.get("question_index", i), {}) for i, result in enumerate(test_results)]
+        
+        logger.info("=== JudgeAI batch_evaluate called ===")
+        logger.info("use_mt_bench: %s", self.use_mt_bench)
+        logger.info("use_bleurt: %s", self.use_bleurt)
+        logger.info("bleurt_scorer: %s", self.bleurt_scorer)
         
         if self.use_mt_bench:
             logger.info("Using MT-Bench evaluation")
-            return await self._batch_evaluate_with_mt_bench(test_results, qa_pairs)
+            return await self._batch_evaluate_with_mt_bench(test_results, qa_pairs, use_batch_api, on_batch_status)
         elif self.use_bleurt:
             logger.info("Using BLEURT-only evaluation")
             return await self._batch_evaluate_with_bleurt_only(test_results, qa_pairs)
@@ -305,11 +360,17 @@ class JudgeAI:
             logger.info("Using legacy evaluation")
             return await self._batch_evaluate_with_legacy(test_results, qa_pairs)
     
-    async def _batch_evaluate_with_mt_bench(self, test_results: List[Dict], qa_pairs: List[Dict[str, str]]) -> List[Dict]:
+    async def _batch_evaluate_with_mt_bench(
+        self,
+        test_results: List[Dict],
+        qa_pairs: List[Dict[str, str]],
+        use_batch_api: bool = False,
+        on_batch_status: Optional[Callable[[str, str], None]] = None
+    ) -> List[Dict]:
         """Batch evaluate using MT-Bench."""
-        logger.info(f"=== JudgeAI MT-Bench Batch Evaluation ===")
-        logger.info(f"Test results count: {len(test_results)}")
-        logger.info(f"QA pairs count: {len(qa_pairs)}")
+        logger.info("=== JudgeAI MT-Bench Batch Evaluation ===")
+        logger.info("Test results count: %s", len(test_results))
+        logger.info("QA pairs count: %s", len(qa_pairs))
         
         try:
             # Extract questions and responses
@@ -319,27 +380,29 @@ class JudgeAI:
             
             for i, result in enumerate(test_results):
                 if result.get("error"):
-                    logger.warning(f"Test result {i} has error: {result.get('error')}")
+                    logger.warning("Test result %s has error: %s", i, result.get('error'))
                     continue
                 
                 if i < len(qa_pairs):
                     questions.append(qa_pairs[i].get("question", ""))
                     responses.append(result.get("bot_response", ""))
                     valid_indices.append(i)
-                    logger.info(f"Added valid test result {i}: {qa_pairs[i].get('question', '')[:50]}...")
+                    logger.debug("Added valid test result %s: %s...", i, qa_pairs[i].get('question', '')[:50])
                 else:
-                    logger.warning(f"Test result {i} has no corresponding QA pair")
+                    logger.warning("Test result %s has no corresponding QA pair", i)
             
-            logger.info(f"Valid test results for MT-Bench evaluation: {len(questions)}")
+            logger.info("Valid test results for MT-Bench evaluation: %s", len(questions))
             
             # Get MT-Bench evaluations
             logger.info("Calling MT-Bench batch evaluator...")
             mt_evaluations = await self.mt_bench_evaluator.evaluate_batch_responses(
-                [{"question": q, "answer": qa_pairs[i].get("answer", "")} for i, q in enumerate(questions)],
-                responses
+                [{"question": q, "answer": qa_pairs[valid_indices[i]].get("answer", "")} for i, q in enumerate(questions)],
+                responses,
+                use_batch_api=use_batch_api,
+                on_batch_status=on_batch_status
             )
             
-            logger.info(f"Received {len(mt_evaluations)} MT-Bench evaluations")
+            logger.info("Received %s MT-Bench evaluations", len(mt_evaluations))
             
             # Compute BLEURT scores in batch if enabled
             bleurt_scores = None
@@ -356,7 +419,7 @@ class JudgeAI:
                             list(valid_expected), 
                             list(valid_responses)
                         )
-                        logger.info(f"Computed {len(bleurt_scores)} BLEURT scores")
+                        logger.info("Computed %s BLEURT scores", len(bleurt_scores))
                         
                         # Pad bleurt_scores to match all responses (None for missing expected answers)
                         full_bleurt_scores = []
@@ -373,19 +436,20 @@ class JudgeAI:
                         bleurt_scores = [None] * len(responses)
                         
                 except Exception as e:
-                    logger.error(f"BLEURT batch scoring failed: {e}")
+                    logger.error("BLEURT batch scoring failed: %s", e)
                     bleurt_scores = [None] * len(responses)
             
             # Merge results
             evaluated_results = []
+            mt_positions = {index: position for position, index in enumerate(valid_indices)}
             for i, result in enumerate(test_results):
-                if i in valid_indices:
-                    mt_idx = valid_indices.index(i)
+                mt_idx = mt_positions.get(i)
+                if mt_idx is not None:
                     mt_eval = mt_evaluations[mt_idx]
                     
-                    logger.info(f"Converting MT-Bench evaluation {mt_idx} for test result {i}")
-                    logger.info(f"  MT-Bench Overall Score: {mt_eval.overall_score:.3f}")
-                    logger.info(f"  MT-Bench Dimension Scores: {mt_eval.dimension_scores}")
+                    logger.debug("Converting MT-Bench evaluation %s for test result %s", mt_idx, i)
+                    logger.debug("  MT-Bench Overall Score: %.3f", mt_eval.overall_score)
+                    logger.debug("  MT-Bench Dimension Scores: %s", mt_eval.dimension_scores)
                     
                     # Convert to legacy format
                     evaluation_data = {
@@ -400,6 +464,7 @@ class JudgeAI:
                             "weaknesses": mt_eval.weaknesses
                         },
                         "evaluation_method": "mt_bench",
+                        "evaluation_status": mt_eval.evaluation_status,
                         "confidence": mt_eval.confidence
                     }
                     
@@ -424,36 +489,36 @@ class JudgeAI:
                             f"BLEURT semantic similarity: {bleurt_score:.3f} - {bleurt_interpretation}"
                         )
                         
-                        logger.info(f"  Added BLEURT score: {bleurt_score:.3f} ({bleurt_interpretation})")
-                        logger.info(f"  Updated overall score: {weighted_score:.3f} (was {mt_eval.overall_score:.3f})")
+                        logger.debug("  Added BLEURT score: %.3f (%s)", bleurt_score, bleurt_interpretation)
+                        logger.debug("  Updated overall score: %.3f (was %.3f)", weighted_score, mt_eval.overall_score)
                     
                     result["evaluation"] = evaluation_data
                     result["expected_answer"] = qa_pairs[i].get("answer", "")
                     
-                    logger.info(f"  Legacy Overall Score: {result['evaluation']['overall_score']:.3f}")
-                    logger.info(f"  Legacy Content Similarity: {result['evaluation']['content_similarity']:.3f}")
-                    logger.info(f"  Legacy Style Fidelity: {result['evaluation']['style_fidelity']:.3f}")
+                    logger.debug("  Legacy Overall Score: %.3f", result['evaluation']['overall_score'])
+                    logger.debug("  Legacy Content Similarity: %.3f", result['evaluation']['content_similarity'])
+                    logger.debug("  Legacy Style Fidelity: %.3f", result['evaluation']['style_fidelity'])
                 else:
-                    logger.warning(f"Test result {i} not in valid indices, using default evaluation")
+                    logger.warning("Test result %s not in valid indices, using default evaluation", i)
                     result["evaluation"] = self._default_evaluation(result.get("error", "No expected answer found"))
                 
                 evaluated_results.append(result)
             
-            logger.info(f"Batch evaluation complete. Processed {len(evaluated_results)} results.")
+            logger.info("Batch evaluation complete. Processed %s results.", len(evaluated_results))
             return evaluated_results
             
         except Exception as e:
-            logger.error(f"MT-Bench batch evaluation failed, falling back to legacy: {e}")
-            logger.error(f"Exception details: {type(e).__name__}: {str(e)}")
+            logger.error("MT-Bench batch evaluation failed, falling back to legacy: %s", e)
+            logger.error("Exception details: %s: %s", type(e).__name__, str(e))
             import traceback
-            logger.error(f"MT-Bench batch fallback traceback: {traceback.format_exc()}")
+            logger.error("MT-Bench batch fallback traceback: %s", traceback.format_exc())
             return await self._batch_evaluate_with_legacy(test_results, qa_pairs)
     
     async def _batch_evaluate_with_bleurt_only(self, test_results: List[Dict], qa_pairs: List[Dict[str, str]]) -> List[Dict]:
         """BLEURT-only batch evaluation for transcript tests."""
-        logger.info(f"=== BLEURT-Only Batch Evaluation ===")
-        logger.info(f"Test results count: {len(test_results)}")
-        logger.info(f"QA pairs count: {len(qa_pairs)}")
+        logger.info("=== BLEURT-Only Batch Evaluation ===")
+        logger.info("Test results count: %s", len(test_results))
+        logger.info("QA pairs count: %s", len(qa_pairs))
         
         try:
             # Extract valid test results with expected answers
@@ -463,33 +528,34 @@ class JudgeAI:
             
             for i, result in enumerate(test_results):
                 if result.get("error"):
-                    logger.warning(f"Test result {i} has error: {result.get('error')}")
+                    logger.warning("Test result %s has error: %s", i, result.get('error'))
                     continue
                     
                 if i < len(qa_pairs) and qa_pairs[i].get("answer", "").strip():
                     valid_responses.append(result.get("bot_response", ""))
                     valid_expected.append(qa_pairs[i].get("answer", ""))
                     valid_indices.append(i)
-                    logger.info(f"Valid pair {i}: Expected='{qa_pairs[i].get('answer', '')[:50]}...', Response='{result.get('bot_response', '')[:50]}...'")
+                    logger.debug("Valid pair %s: Expected='%s...', Response='%s...'", i, qa_pairs[i].get('answer', '')[:50], result.get('bot_response', '')[:50])
                 else:
-                    logger.warning(f"Test result {i} has no valid expected answer")
+                    logger.warning("Test result %s has no valid expected answer", i)
             
-            logger.info(f"Valid pairs for BLEURT evaluation: {len(valid_responses)}")
+            logger.info("Valid pairs for BLEURT evaluation: %s", len(valid_responses))
             
             # Compute BLEURT scores in batch
             if valid_responses:
                 logger.info("About to call BLEURT batch_compute_scores...")
                 bleurt_scores = self.bleurt_scorer.batch_compute_scores(valid_expected, valid_responses)
-                logger.info(f"Computed {len(bleurt_scores)} BLEURT scores successfully")
+                logger.info("Computed %s BLEURT scores successfully", len(bleurt_scores))
             else:
                 logger.warning("No valid responses for BLEURT scoring")
                 bleurt_scores = []
             
             # Create evaluation results
             evaluated_results = []
+            bleurt_positions = {index: position for position, index in enumerate(valid_indices)}
             for i, result in enumerate(test_results):
-                if i in valid_indices:
-                    bleurt_idx = valid_indices.index(i)
+                bleurt_idx = bleurt_positions.get(i)
+                if bleurt_idx is not None:
                     bleurt_score = bleurt_scores[bleurt_idx]
                     bleurt_interpretation = self.bleurt_scorer.get_score_interpretation(bleurt_score)
                     
@@ -512,17 +578,17 @@ class JudgeAI:
                     }
                     result["expected_answer"] = qa_pairs[i].get("answer", "")
                     
-                    logger.info(f"Result {i}: BLEURT score = {bleurt_score:.3f} ({bleurt_interpretation})")
+                    logger.debug("Result %s: BLEURT score = %.3f (%s)", i, bleurt_score, bleurt_interpretation)
                 else:
                     result["evaluation"] = self._default_evaluation(result.get("error", "No expected answer"))
                 
                 evaluated_results.append(result)
             
-            logger.info(f"BLEURT-only batch evaluation complete. Processed {len(evaluated_results)} results.")
+            logger.info("BLEURT-only batch evaluation complete. Processed %s results.", len(evaluated_results))
             return evaluated_results
             
         except Exception as e:
-            logger.error(f"BLEURT-only batch evaluation failed: {e}")
+            logger.error("BLEURT-only batch evaluation failed: %s", e)
             # Fallback to default evaluations
             evaluated_results = []
             for result in test_results:
@@ -565,20 +631,15 @@ class JudgeAI:
         """
         Calculate aggregate metrics across all evaluations.
         """
-        if self.use_mt_bench:
-            return self._calculate_mt_bench_metrics(evaluated_results)
-        elif self.use_bleurt:
-            return self._calculate_bleurt_only_metrics(evaluated_results)
-        else:
-            return self._calculate_legacy_metrics(evaluated_results)
+        return self._aggregate_impl(evaluated_results)
     
     def _calculate_mt_bench_metrics(self, evaluated_results: List[Dict]) -> Dict:
         """Calculate metrics using MT-Bench methodology."""
-        logger.info(f"=== JudgeAI MT-Bench Metrics Calculation ===")
-        logger.info(f"Evaluated results count: {len(evaluated_results)}")
+        logger.info("=== JudgeAI MT-Bench Metrics Calculation ===")
+        logger.info("Evaluated results count: %s", len(evaluated_results))
         
         valid_results = [r for r in evaluated_results if not r.get("error") and r.get("evaluation")]
-        logger.info(f"Valid results count: {len(valid_results)}")
+        logger.info("Valid results count: %s", len(valid_results))
         
         if not valid_results:
             logger.warning("No valid results for MT-Bench metrics calculation")
@@ -593,9 +654,9 @@ class JudgeAI:
             eval_method = eval_data.get("evaluation_method", "unknown")
             
             if eval_method in ["mt_bench", "mt_bench_with_bleurt"]:
-                logger.info(f"Processing {eval_method} evaluation {i}:")
-                logger.info(f"  Overall Score: {eval_data['overall_score']:.3f}")
-                logger.info(f"  MT-Bench Scores: {eval_data.get('mt_bench_scores', {})}")
+                logger.debug("Processing %s evaluation %s:", eval_method, i)
+                logger.debug("  Overall Score: %.3f", eval_data['overall_score'])
+                logger.debug("  MT-Bench Scores: %s", eval_data.get('mt_bench_scores', {}))
                 
                 # Use original MT-Bench score for pure MT-Bench metrics
                 original_score = eval_data.get("original_mt_bench_score", eval_data["overall_score"])
@@ -606,20 +667,21 @@ class JudgeAI:
                     reasoning=eval_data["reasoning"]["content_analysis"],
                     strengths=eval_data["reasoning"].get("strengths", []),
                     weaknesses=eval_data["reasoning"].get("weaknesses", []),
-                    confidence=eval_data.get("confidence", 0.5)
+                    confidence=eval_data.get("confidence", 0.5),
+                    evaluation_status=eval_data.get("evaluation_status", "ok")
                 )
                 mt_evaluations.append(mt_eval)
                 
                 # Collect BLEURT scores if available
                 if "bleurt_score" in eval_data:
                     bleurt_scores_for_metrics.append(eval_data["bleurt_score"])
-                    logger.info(f"  BLEURT Score: {eval_data['bleurt_score']:.3f}")
+                    logger.debug("  BLEURT Score: %.3f", eval_data['bleurt_score'])
                 else:
                     bleurt_scores_for_metrics.append(None)
             else:
-                logger.warning(f"Result {i} uses {eval_method} method, skipping MT-Bench metrics")
+                logger.warning("Result %s uses %s method, skipping MT-Bench metrics", i, eval_method)
         
-        logger.info(f"MT-Bench evaluations extracted: {len(mt_evaluations)}")
+        logger.info("MT-Bench evaluations extracted: %s", len(mt_evaluations))
         
         metrics = self.mt_bench_evaluator.calculate_aggregate_metrics(mt_evaluations)
         
@@ -638,23 +700,24 @@ class JudgeAI:
                 "bleurt_pass_rate": len([s for s in valid_bleurt_scores if s >= 0.0]) / len(valid_bleurt_scores)
             }
             
-            logger.info(f"BLEURT metrics added:")
-            logger.info(f"  Average BLEURT Score: {bleurt_avg:.3f}")
-            logger.info(f"  BLEURT Score Range: {bleurt_min:.3f} - {bleurt_max:.3f}")
-            logger.info(f"  BLEURT Evaluations: {len(valid_bleurt_scores)}")
-            logger.info(f"  BLEURT Pass Rate: {metrics['bleurt_metrics']['bleurt_pass_rate']:.3f}")
+            logger.info("BLEURT metrics added:")
+            logger.info("  Average BLEURT Score: %.3f", bleurt_avg)
+            logger.info("  BLEURT Score Range: %.3f - %.3f", bleurt_min, bleurt_max)
+            logger.info("  BLEURT Evaluations: %s", len(valid_bleurt_scores))
+            logger.info("  BLEURT Pass Rate: %.3f", metrics['bleurt_metrics']['bleurt_pass_rate'])
         
-        logger.info(f"Combined metrics calculated: {json.dumps(metrics, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Combined metrics calculated: %s", json.dumps(metrics, indent=2))
         
         return metrics
     
     def _calculate_bleurt_only_metrics(self, evaluated_results: List[Dict]) -> Dict:
         """Calculate metrics for BLEURT-only evaluation."""
-        logger.info(f"=== BLEURT-Only Metrics Calculation ===")
-        logger.info(f"Evaluated results count: {len(evaluated_results)}")
+        logger.info("=== BLEURT-Only Metrics Calculation ===")
+        logger.info("Evaluated results count: %s", len(evaluated_results))
         
         valid_results = [r for r in evaluated_results if not r.get("error") and r.get("evaluation")]
-        logger.info(f"Valid results count: {len(valid_results)}")
+        logger.info("Valid results count: %s", len(valid_results))
         
         if not valid_results:
             logger.warning("No valid results for BLEURT-only metrics calculation")
@@ -677,7 +740,7 @@ class JudgeAI:
                 bleurt_scores.append(eval_data["bleurt_score"])
                 overall_scores.append(eval_data["overall_score"])
             else:
-                logger.warning(f"Missing bleurt_score in evaluation, evaluation method: {eval_data.get('evaluation_method', 'unknown')}")
+                logger.warning("Missing bleurt_score in evaluation, evaluation method: %s", eval_data.get('evaluation_method', 'unknown'))
         
         if not bleurt_scores:
             logger.error("No valid BLEURT scores found - BLEURT evaluation likely failed")
@@ -708,11 +771,11 @@ class JudgeAI:
             "quality_distribution": self._analyze_quality_distribution_raw_bleurt(bleurt_scores)
         }
         
-        logger.info(f"BLEURT-only metrics:")
-        logger.info(f"  Average BLEURT Score: {avg_bleurt:.3f}")
-        logger.info(f"  Score range: {min(bleurt_scores):.3f} - {max(bleurt_scores):.3f}")
-        logger.info(f"  Pass rate: {pass_rate:.3f}")
-        logger.info(f"  Total evaluations: {len(valid_results)}")
+        logger.info("BLEURT-only metrics:")
+        logger.info("  Average BLEURT Score: %.3f", avg_bleurt)
+        logger.info("  Score range: %.3f - %.3f", min(bleurt_scores), max(bleurt_scores))
+        logger.info("  Pass rate: %.3f", pass_rate)
+        logger.info("  Total evaluations: %s", len(valid_results))
         
         return metrics
     
@@ -739,6 +802,10 @@ class JudgeAI:
         passing_scores = [s for s in overall_scores if s >= 0.7]
         pass_rate = len(passing_scores) / len(overall_scores) if overall_scores else 0.0
         
+        # Bucket scores in one pass: poor < 0.5 <= fair < 0.7 <= good < 0.9 <= excellent
+        buckets = np.searchsorted(_SCORE_BUCKET_EDGES, np.asarray(overall_scores, dtype=np.float64), side="right")
+        counts = np.bincount(buckets, minlength=4)
+        
         return {
             "total_questions": len(evaluated_results),
             "successful_responses": len(valid_results),
@@ -747,10 +814,10 @@ class JudgeAI:
             "avg_overall_score": sum(overall_scores) / len(overall_scores) if overall_scores else 0.0,
             "pass_rate": pass_rate,
             "score_distribution": {
-                "excellent": len([s for s in overall_scores if s >= 0.9]),
-                "good": len([s for s in overall_scores if 0.7 <= s < 0.9]),
-                "fair": len([s for s in overall_scores if 0.5 <= s < 0.7]),
-                "poor": len([s for s in overall_scores if s < 0.5])
+                "excellent": int(counts[3]),
+                "good": int(counts[2]),
+                "fair": int(counts[1]),
+                "poor": int(counts[0])
             },
             "evaluation_method": "legacy"
         }
@@ -759,10 +826,7 @@ class JudgeAI:
         """
         Evaluate a single response in a multi-turn conversation.
         """
-        if self.use_mt_bench:
-            return await self._evaluate_multi_turn_with_mt_bench(user_message, bot_response, conversation_history)
-        else:
-            return await self._evaluate_multi_turn_with_legacy(user_message, bot_response, conversation_history)
+        return await self._multi_turn_impl(user_message, bot_response, conversation_history)
     
     async def _evaluate_multi_turn_with_mt_bench(self, user_message: str, bot_response: str, conversation_history: List[Dict[str, str]]) -> Dict:
         """Evaluate multi-turn response using MT-Bench."""
@@ -776,24 +840,61 @@ class JudgeAI:
                 context=context
             )
             
-            # Convert to legacy format
-            return {
-                "overall_score": mt_evaluation.overall_score,
-                "relevance_score": mt_evaluation.dimension_scores.get("relevance", 0.0),
-                "consistency_score": mt_evaluation.dimension_scores.get("accuracy", 0.0),
-                "technical_score": mt_evaluation.dimension_scores.get("accuracy", 0.0),
-                "clarity_score": mt_evaluation.dimension_scores.get("clarity", 0.0),
-                "persona_score": mt_evaluation.dimension_scores.get("helpfulness", 0.0),
-                "reasoning": mt_evaluation.reasoning,
-                "confidence": mt_evaluation.confidence,
-                "evaluation_method": "mt_bench",
-                "mt_bench_scores": mt_evaluation.dimension_scores
-            }
+            return self._multi_turn_result_from_mt_bench(mt_evaluation)
             
         except Exception as e:
-            logger.error(f"MT-Bench multi-turn evaluation failed, falling back to legacy: {e}")
+            logger.error("MT-Bench multi-turn evaluation failed, falling back to legacy: %s", e)
             return await self._evaluate_multi_turn_with_legacy(user_message, bot_response, conversation_history)
     
+    async def evaluate_multi_turn_batch(self, requests: List[Tuple[str, str, List[Dict[str, str]]]]) -> List[Dict]:
+        """
+        Evaluate several multi-turn responses together.
+        
+        With MT-Bench enabled the whole group is judged in one fused call;
+        otherwise each response is evaluated individually.
+        
+        Args:
+            requests: (user_message, bot_response, conversation_history) tuples
+            
+        Returns:
+            List of evaluation dicts in request order
+        """
+        if not self.use_mt_bench or len(requests) == 1:
+            return list(await asyncio.gather(*(
+                self.evaluate_multi_turn_response(user_message, bot_response, conversation_history)
+                for user_message, bot_response, conversation_history in requests
+            )))
+        
+        try:
+            mt_evaluations = await self.mt_bench_evaluator.evaluate_response_group([
+                (user_message, bot_response, self._format_conversation_history(conversation_history))
+                for user_message, bot_response, conversation_history in requests
+            ])
+            return [self._multi_turn_result_from_mt_bench(mt_evaluation) for mt_evaluation in mt_evaluations]
+        except Exception as e:
+            logger.error("Batched MT-Bench multi-turn evaluation failed, evaluating individually: %s", e)
+            return list(await asyncio.gather(*(
+                self.evaluate_multi_turn_response(user_message, bot_response, conversation_history)
+                for user_message, bot_response, conversation_history in requests
+            )))
+    
+    def _multi_turn_result_from_mt_bench(self, mt_evaluation: MTBenchEvaluation) -> Dict:
+        """Convert an MT-Bench evaluation to the multi-turn result format."""
+        # Convert to legacy format
+        return {
+            "overall_score": mt_evaluation.overall_score,
+            "relevance_score": mt_evaluation.dimension_scores.get("relevance", 0.0),
+            "consistency_score": mt_evaluation.dimension_scores.get("accuracy", 0.0),
+            "technical_score": mt_evaluation.dimension_scores.get("accuracy", 0.0),
+            "clarity_score": mt_evaluation.dimension_scores.get("clarity", 0.0),
+            "persona_score": mt_evaluation.dimension_scores.get("helpfulness", 0.0),
+            "reasoning": mt_evaluation.reasoning,
+            "confidence": mt_evaluation.confidence,
+            "evaluation_method": "mt_bench",
+            "evaluation_status": mt_evaluation.evaluation_status,
+            "mt_bench_scores": mt_evaluation.dimension_scores
+        }
+    
     async def _evaluate_multi_turn_with_legacy(self, user_message: str, bot_response: str, conversation_history: List[Dict[str, str]]) -> Dict:
         """Legacy multi-turn evaluation method."""
         try:
@@ -852,12 +953,12 @@ class JudgeAI:
                     return self._create_default_evaluation()
                     
             except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON from AI response: {e}")
-                logger.error(f"Response content: {content}")
+                logger.error("Failed to parse JSON from AI response: %s", e)
+                logger.error("Response content: %s", content)
                 return self._create_default_evaluation()
                 
         except Exception as e:
-            logger.error(f"Error evaluating multi-turn response: {e}")
+            logger.error("Error evaluating multi-turn response: %s", e)
             return self._create_default_evaluation()
 
     def calculate_multi_turn_metrics(self, responses: List[Dict]) -> Dict:
@@ -869,16 +970,25 @@ class JudgeAI:
             
         total_responses = len(responses)
         
+        # Conversations are short, so a typed buffer per score beats numpy setup cost
+        buffers = {key: array.array("d") for key in _MULTI_TURN_SCORE_KEYS}
+        for r in responses:
+            evaluation = r["evaluation"]
+            for key, buf in buffers.items():
+                buf.append(evaluation[key])
+        
+        overall = buffers["overall_score"]
+        
         # Calculate averages
         metrics = {
-            "avg_overall_score": sum(r["evaluation"]["overall_score"] for r in responses) / total_responses,
-            "avg_relevance_score": sum(r["evaluation"]["relevance_score"] for r in responses) / total_responses,
-            "avg_consistency_score": sum(r["evaluation"]["consistency_score"] for r in responses) / total_responses,
-            "avg_technical_score": sum(r["evaluation"]["technical_score"] for r in responses) / total_responses,
-            "avg_clarity_score": sum(r["evaluation"]["clarity_score"] for r in responses) / total_responses,
-            "avg_persona_score": sum(r["evaluation"]["persona_score"] for r in responses) / total_responses,
+            "avg_overall_score": math.fsum(overall) / total_responses,
+            "avg_relevance_score": math.fsum(buffers["relevance_score"]) / total_responses,
+            "avg_consistency_score": math.fsum(buffers["consistency_score"]) / total_responses,
+            "avg_technical_score": math.fsum(buffers["technical_score"]) / total_responses,
+            "avg_clarity_score": math.fsum(buffers["clarity_score"]) / total_responses,
+            "avg_persona_score": math.fsum(buffers["persona_score"]) / total_responses,
             "total_responses": total_responses,
-            "pass_rate": sum(1 for r in responses if r["evaluation"]["overall_score"] >= 0.7) / total_responses,
+            "pass_rate": sum(1 for score in overall if score >= 0.7) / total_responses,
             "evaluation_method": responses[0]["evaluation"].get("evaluation_method", "legacy") if responses else "legacy"
         }
         
@@ -1,13 +1,38 @@
 import logging
 import json
 import asyncio
-from typing import Dict, List, Optional, Any
-from openai import AsyncOpenAI
+import hashlib
+import heapq
+import os
+import numpy as np
+import orjson
+from collections import Counter, OrderedDict
+from operator import itemgetter
+from string import Template
+from typing import Dict, List, Optional, Any, AsyncIterator, Callable, Tuple
+from openai import AsyncOpenAI, RateLimitError, APIConnectionError, APITimeoutError, InternalServerError
+from aiolimiter import AsyncLimiter
+from tenacity import (
+    AsyncRetrying, RetryCallState, before_sleep_log, retry_if_exception_type,
+    stop_after_attempt, wait_random_exponential
+)
+from pydantic import BaseModel, ConfigDict, ValidationError
 from dataclasses import dataclass
 from enum import Enum
+from .score_kernels import dimension_stats
 
 logger = logging.getLogger(__name__)
 
+# Minimum score for an evaluation (or a single dimension) to count as passing
+PASS_THRESHOLD = 0.7
+
+# Stop reading single-item judge output once the scores are in, skipping the generated
+# reasoning/strengths/weaknesses tail; those fields then take their defaults
+JUDGE_STOP_AFTER_SCORES = os.getenv("JUDGE_STOP_AFTER_SCORES", "false").lower() == "true"
+
+# Lower edges of the fair/good/excellent score buckets
+_SCORE_BUCKET_EDGES = np.array([0.5, 0.7, 0.9])
+
 class EvaluationDimension(Enum):
     """MT-Bench evaluation dimensions"""
     RELEVANCE = "relevance"
@@ -19,9 +44,130 @@ class EvaluationDimension(Enum):
     HONESTY = "honesty"
     HARM_AVOIDANCE = "harm_avoidance"
 
-@dataclass
+# Static judge instructions, built once and sent as the system message so the
+# identical prefix is eligible for OpenAI prompt caching across calls
+_JUDGE_INTRO = "You are an expert AI evaluator using the MT-Bench methodology to assess response quality."
+
+_DIMENSION_CRITERIA = [
+    "- Relevance: How well does the response address the question?",
+    "- Accuracy: Is the information factually correct and reliable?",
+    "- Clarity: Is the response clear, well-structured, and easy to understand?",
+    "- Depth: Does the response provide sufficient detail and insight?",
+    "- Helpfulness: How useful and actionable is the response?"
+]
+
+_EVALUATION_FIELDS = [
+    '"overall_score": <float 0-1>,',
+    '"dimension_scores": {',
+    '  "relevance": <float 0-1>,',
+    '  "accuracy": <float 0-1>,',
+    '  "clarity": <float 0-1>,',
+    '  "depth": <float 0-1>,',
+    '  "helpfulness": <float 0-1>',
+    '},',
+    '"reasoning": "<detailed evaluation reasoning>",',
+    '"strengths": ["<strength1>", "<strength2>"],',
+    '"weaknesses": ["<weakness1>", "<weakness2>"],',
+    '"confidence": <float 0-1>'
+]
+
+_SCORING_GUIDELINES = [
+    "Scoring guidelines:",
+    "- 0.9-1.0: Exceptional quality",
+    "- 0.7-0.8: Good quality with minor issues",
+    "- 0.5-0.6: Acceptable with notable issues",
+    "- 0.0-0.4: Poor quality or incorrect"
+]
+
+_RUBRIC_PROMPT = "\n".join([
+    _JUDGE_INTRO,
+    "",
+    "Evaluate the response on these dimensions (0-10 scale):",
+    *_DIMENSION_CRITERIA,
+    "",
+    "Return ONLY a JSON object with this exact structure:",
+    "{",
+    *("  " + line for line in _EVALUATION_FIELDS),
+    "}",
+    "",
+    *_SCORING_GUIDELINES
+])
+
+_BATCHED_RUBRIC_PROMPT = "\n".join([
+    _JUDGE_INTRO,
+    "",
+    "You will be given several numbered items. Evaluate each item independently.",
+    "",
+    "Evaluate each response on these dimensions (0-10 scale):",
+    *_DIMENSION_CRITERIA,
+    "",
+    "Return ONLY a JSON object with one entry per item, in item order:",
+    "{",
+    '  "evaluations": [',
+    "    {",
+    '      "item": <item number>,',
+    *("      " + line for line in _EVALUATION_FIELDS),
+    "    }",
+    "  ]",
+    "}",
+    "",
+    *_SCORING_GUIDELINES
+])
+
+# Transient OpenAI failures worth retrying; InternalServerError covers 5xx responses
+_TRANSIENT_OPENAI_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+_BACKOFF = wait_random_exponential(multiplier=1, max=60)
+
+# Per-item user prompts. Session-stable persona and conversation context lead the
+# single-item prompt so successive turns share a long prefix after the static rubric,
+# which is what provider-side prompt caching matches on; per-turn text goes last.
+_ITEM_PROMPT_TEMPLATE = Template("${context_blocks}Question: $question\nResponse: $response$optional_blocks")
+_BATCHED_ITEM_PROMPT_TEMPLATE = Template("\n\n## Item $index\nQuestion: $question\nResponse: $response$optional_blocks")
+
+class DimensionScoresSchema(BaseModel):
+    """Per-dimension judge scores (0-1)"""
+    model_config = ConfigDict(extra="forbid")
+    
+    relevance: float
+    accuracy: float
+    clarity: float
+    depth: float
+    helpfulness: float
+
+class MTBenchEvaluationSchema(BaseModel):
+    """JSON schema the judge is constrained to via structured outputs"""
+    model_config = ConfigDict(extra="forbid")
+    
+    overall_score: float
+    dimension_scores: DimensionScoresSchema
+    reasoning: str
+    strengths: List[str]
+    weaknesses: List[str]
+    confidence: float
+
+class BatchedEvaluationItemSchema(MTBenchEvaluationSchema):
+    """One item of a fused judge response"""
+    item: int
+
+class BatchedEvaluationSchema(BaseModel):
+    """JSON schema for fused multi-item judge responses"""
+    model_config = ConfigDict(extra="forbid")
+    
+    evaluations: List[BatchedEvaluationItemSchema]
+
+def _json_schema_format(name: str, model: type) -> Dict[str, Any]:
+    """Build a strict structured-outputs response_format for a pydantic model."""
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": name, "schema": model.model_json_schema(), "strict": True}
+    }
+
+_RESPONSE_FORMAT = _json_schema_format("mtbench", MTBenchEvaluationSchema)
+_BATCHED_RESPONSE_FORMAT = _json_schema_format("mtbench_batch", BatchedEvaluationSchema)
+
+@dataclass(slots=True, frozen=True)
 class MTBenchEvaluation:
-    """Structured evaluation result from MT-Bench"""
+    """Structured evaluation result from MT-Bench (immutable; parsed results are shared via the parse cache)"""
     overall_score: float
     dimension_scores: Dict[str, float]
     reasoning: str
@@ -29,32 +175,79 @@ class MTBenchEvaluation:
     weaknesses: List[str]
     confidence: float
     evaluation_method: str = "mt_bench"
+    # Placeholder results are "failed" when the judge call itself failed after retries
+    # (excluded from scores, counted as failed_evaluations) and "unparsed" when a reply
+    # arrived but could not be parsed (kept in the scores as a zero-score evaluation)
+    evaluation_status: str = "ok"
 
 class MTBenchEvaluator:
     """
     MT-Bench evaluator for AI response quality assessment.
     Based on the MT-Bench framework from Hugging Face.
+    
+    Up to max_concurrency judge calls run at once, so the AsyncOpenAI client's
+    httpx pool should allow at least that many connections (config.py sizes it
+    at 2x OPENAI_MAX_CONCURRENCY with HTTP/2 and 60s keep-alive); pass that size
+    as pool_size to be warned when it is too small.
     """
     
-    def __init__(self, openai_client: AsyncOpenAI, model: str = "gpt-4"):
+    def __init__(
+        self, 
+        openai_client: AsyncOpenAI, 
+        model: str = "gpt-4o-mini", 
+        max_concurrency: int = 10,
+        fuse_size: int = 5,
+        fuse_max_chars: int = 12000,
+        rpm: int = 500,
+        tpm: int = 40000,
+        cache_size: int = 10000,
+        stop_after_scores: bool = JUDGE_STOP_AFTER_SCORES,
+        pool_size: Optional[int] = None
+    ):
         self.openai_client = openai_client
         self.model = model
-        self.evaluation_dimensions = [
+        self.max_concurrency = max_concurrency
+        # Number of batch items judged together in one fused prompt
+        self.fuse_size = max(1, fuse_size)
+        # Character budget per fused prompt; items are binned by length before fusing
+        self.fuse_max_chars = fuse_max_chars
+        # Cancel single-item judge streams as soon as overall and dimension scores are parsed
+        self.stop_after_scores = stop_after_scores
+        # Shared cap on in-flight judge calls across batch and multi-turn evaluation, taken in _get_ai_evaluation
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        if pool_size is not None and pool_size < max_concurrency:
+            logger.warning(
+                f"OpenAI client allows {pool_size} connections but max_concurrency is {max_concurrency}; "
+                f"judge calls will queue for connections"
+            )
+        # Per-minute request and token budgets matching the account's OpenAI quota
+        self.tpm = tpm
+        self._rpm_limiter = AsyncLimiter(rpm, 60)
+        self._tpm_limiter = AsyncLimiter(tpm, 60)
+        # LRU caches: prompt hash -> raw judge output, raw output -> parsed evaluation
+        self.cache_size = cache_size
+        self._judge_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._parse_cache: "OrderedDict[str, MTBenchEvaluation]" = OrderedDict()
+        self.evaluation_dimensions = (
             EvaluationDimension.RELEVANCE,
             EvaluationDimension.ACCURACY, 
             EvaluationDimension.CLARITY,
             EvaluationDimension.DEPTH,
             EvaluationDimension.HELPFULNESS
-        ]
-        logger.info(f"MTBenchEvaluator initialized with model: {model}")
-        logger.info(f"Evaluation dimensions: {[dim.value for dim in self.evaluation_dimensions]}")
+        )
+        self._dim_names = tuple(dim.value for dim in self.evaluation_dimensions)
+        self._default_dim_scores = {name: 0.0 for name in self._dim_names}
+        self._default_dimension_averages = {f"avg_{name}": 0.0 for name in self._dim_names}
+        logger.info("MTBenchEvaluator initialized with model: %s", model)
+        logger.info("Evaluation dimensions: %s", list(self._dim_names))
     
     async def evaluate_single_response(
         self, 
         question: str, 
         response: str, 
         context: Optional[str] = None,
-        expected_answer: Optional[str] = None
+        expected_answer: Optional[str] = None,
+        persona_context: Optional[str] = None
     ) -> MTBenchEvaluation:
         """
         Evaluate a single response using MT-Bench methodology.
@@ -64,49 +257,45 @@ class MTBenchEvaluator:
             response: The AI's response to evaluate
             context: Optional context or conversation history
             expected_answer: Optional expected answer for comparison
+            persona_context: Optional persona context for evaluation
             
         Returns:
             MTBenchEvaluation object with scores and reasoning
         """
         try:
-            logger.info(f"=== MT-Bench Single Response Evaluation ===")
-            logger.info(f"Question: {question[:100]}...")
-            logger.info(f"Response: {response[:100]}...")
-            logger.info(f"Context provided: {context is not None}")
-            logger.info(f"Expected answer provided: {expected_answer is not None}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("=== MT-Bench Single Response Evaluation ===")
+                logger.debug("Question: %s...", question[:100])
+                logger.debug("Response: %s...", response[:100])
+                logger.debug("Context provided: %s, expected answer provided: %s",
+                             context is not None, expected_answer is not None)
             
             # Build evaluation prompt based on MT-Bench methodology
-            prompt = self._build_evaluation_prompt(question, response, context, expected_answer)
-            logger.info(f"Evaluation prompt length: {len(prompt)} characters")
-            logger.debug(f"Evaluation prompt: {prompt}")
+            prompt = self._build_evaluation_prompt(question, response, context, expected_answer, persona_context)
+            logger.debug("Evaluation prompt: %s", prompt)
             
             # Get evaluation from AI judge
-            logger.info("Calling AI judge for evaluation...")
             ai_evaluation = await self._get_ai_evaluation(prompt)
-            logger.info(f"AI evaluation response length: {len(ai_evaluation)} characters")
-            logger.debug(f"AI evaluation response: {ai_evaluation}")
+            logger.debug("AI evaluation response: %s", ai_evaluation)
             
             # Parse and structure the evaluation
-            logger.info("Parsing AI evaluation response...")
             evaluation = self._parse_evaluation_response(ai_evaluation)
+            if evaluation.evaluation_status == "ok":
+                self._cache_judge_output(prompt, ai_evaluation)
             
-            logger.info(f"=== MT-Bench Evaluation Complete ===")
-            logger.info(f"Overall Score: {evaluation.overall_score:.3f}")
-            logger.info(f"Dimension Scores:")
-            for dim, score in evaluation.dimension_scores.items():
-                logger.info(f"  {dim}: {score:.3f}")
-            logger.info(f"Confidence: {evaluation.confidence:.3f}")
-            logger.info(f"Strengths: {evaluation.strengths}")
-            logger.info(f"Weaknesses: {evaluation.weaknesses}")
-            logger.info(f"Reasoning: {evaluation.reasoning[:200]}...")
+            logger.info("MT-Bench evaluation complete: overall %.3f, confidence %.3f",
+                        evaluation.overall_score, evaluation.confidence)
+            if logger.isEnabledFor(logging.DEBUG):
+                for dim, score in evaluation.dimension_scores.items():
+                    logger.debug("  %s: %.3f", dim, score)
+                logger.debug("Strengths: %s", evaluation.strengths)
+                logger.debug("Weaknesses: %s", evaluation.weaknesses)
+                logger.debug("Reasoning: %s...", evaluation.reasoning[:200])
             
             return evaluation
             
         except Exception as e:
-            logger.error(f"Error in MT-Bench evaluation: {e}")
-            logger.error(f"Exception details: {type(e).__name__}: {str(e)}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.exception("Error in MT-Bench evaluation: %s: %s", type(e).__name__, e)
             return self._create_default_evaluation(f"Evaluation error: {e}")
     
     async def evaluate_multi_turn_conversation(
@@ -124,44 +313,46 @@ class MTBenchEvaluator:
         Returns:
             List of MTBenchEvaluation objects for each response
         """
-        logger.info(f"=== MT-Bench Multi-Turn Evaluation ===")
-        logger.info(f"Conversation length: {len(conversation)} messages")
-        logger.info(f"Persona context provided: {persona_context is not None}")
-        
-        evaluations = []
+        logger.info("=== MT-Bench Multi-Turn Evaluation ===")
+        logger.info("Conversation length: %s messages", len(conversation))
+        logger.info("Persona context provided: %s", persona_context is not None)
         
+        # Each turn's context depends only on earlier messages, so build every job up front
+        turns = []
+        context = ""
         for i, message in enumerate(conversation):
             if message["role"] == "assistant":
-                logger.info(f"Evaluating assistant response {len(evaluations) + 1}...")
-                
                 # Get the user message that prompted this response
                 user_message = ""
                 if i > 0 and conversation[i-1]["role"] == "user":
                     user_message = conversation[i-1]["content"]
                 
-                # Get conversation context up to this point
-                context = self._format_conversation_context(conversation[:i])
-                
-                # Evaluate this response
-                evaluation = await self.evaluate_single_response(
-                    question=user_message,
-                    response=message["content"],
-                    context=context,
-                    persona_context=persona_context
-                )
-                
-                evaluations.append(evaluation)
-                
-                # Rate limiting
-                await asyncio.sleep(0.2)
+                turns.append((user_message, message["content"], context))
+            
+            # Extend the running context so each turn sees every earlier message
+            line = self._format_context_line(message)
+            context = f"{context}\n{line}" if context else line
         
-        logger.info(f"Multi-turn evaluation complete. Evaluated {len(evaluations)} responses.")
+        async def evaluate_turn(user_message: str, response: str, context: str) -> MTBenchEvaluation:
+            return await self.evaluate_single_response(
+                question=user_message,
+                response=response,
+                context=context,
+                persona_context=persona_context
+            )
+        
+        logger.info("Evaluating %s assistant responses concurrently...", len(turns))
+        evaluations = list(await asyncio.gather(*(evaluate_turn(*turn) for turn in turns)))
+        
+        logger.info("Multi-turn evaluation complete. Evaluated %s responses.", len(evaluations))
         return evaluations
     
     async def evaluate_batch_responses(
         self, 
         qa_pairs: List[Dict[str, str]], 
-        responses: List[str]
+        responses: List[str],
+        use_batch_api: bool = False,
+        on_batch_status: Optional[Callable[[str, str], None]] = None
     ) -> List[MTBenchEvaluation]:
         """
         Evaluate multiple question-response pairs in batch.
@@ -169,32 +360,254 @@ class MTBenchEvaluator:
         Args:
             qa_pairs: List of dicts with 'question' and 'answer' keys
             responses: List of AI responses to evaluate
+            use_batch_api: Submit through the OpenAI Batch API (cheaper, but
+                results may take up to 24h); falls back to online calls on failure
+            on_batch_status: Called with (batch_id, status) as the Batch API job progresses
             
         Returns:
             List of MTBenchEvaluation objects
         """
-        logger.info(f"=== MT-Bench Batch Evaluation ===")
-        logger.info(f"QA pairs count: {len(qa_pairs)}")
-        logger.info(f"Responses count: {len(responses)}")
+        if use_batch_api:
+            try:
+                return await self.evaluate_batch_responses_via_batch_api(qa_pairs, responses, on_batch_status)
+            except Exception as e:
+                logger.error("Batch API evaluation failed, falling back to online evaluation: %s", e)
         
-        evaluations = []
+        evaluations: List[Optional[MTBenchEvaluation]] = [None] * min(len(qa_pairs), len(responses))
+        async for idx, evaluation in self.evaluate_batch_responses_stream(qa_pairs, responses):
+            evaluations[idx] = evaluation
         
-        for i, (qa_pair, response) in enumerate(zip(qa_pairs, responses)):
-            logger.info(f"Evaluating batch item {i + 1}/{len(qa_pairs)}...")
-            logger.info(f"Question: {qa_pair['question'][:50]}...")
-            logger.info(f"Response: {response[:50]}...")
+        logger.info("Batch evaluation complete. Evaluated %s responses.", len(evaluations))
+        return evaluations
+    
+    async def evaluate_batch_responses_stream(
+        self, 
+        qa_pairs: List[Dict[str, str]], 
+        responses: List[str]
+    ) -> AsyncIterator[Tuple[int, MTBenchEvaluation]]:
+        """
+        Evaluate question-response pairs, yielding each result as soon as its chunk finishes.
+        
+        Args:
+            qa_pairs: List of dicts with 'question' and 'answer' keys
+            responses: List of AI responses to evaluate
             
-            evaluation = await self.evaluate_single_response(
-                question=qa_pair["question"],
+        Yields:
+            (index, MTBenchEvaluation) tuples in completion order, where index
+            is the position of the pair in qa_pairs
+        """
+        logger.info("=== MT-Bench Batch Evaluation ===")
+        logger.info("QA pairs count: %s", len(qa_pairs))
+        logger.info("Responses count: %s", len(responses))
+        logger.info("Max concurrency: %s", self.max_concurrency)
+        logger.info("Fuse size: %s", self.fuse_size)
+        
+        items = [
+            (qa_pair["question"], response, None, qa_pair.get("answer"))
+            for qa_pair, response in zip(qa_pairs, responses)
+        ]
+        index_chunks = self._length_binned_chunks(items)
+        
+        async def _evaluate_chunk(
+            chunk_index: int, index_chunk: List[int]
+        ) -> Tuple[List[int], List[MTBenchEvaluation]]:
+            chunk = [items[idx] for idx in index_chunk]
+            try:
+                logger.info("Evaluating batch chunk %s/%s (%s items)...", chunk_index + 1, len(index_chunks), len(chunk))
+                if len(chunk) == 1:
+                    question, response, context, expected_answer = chunk[0]
+                    return index_chunk, [await self.evaluate_single_response(
+                        question=question,
+                        response=response,
+                        context=context,
+                        expected_answer=expected_answer
+                    )]
+                return index_chunk, await self._evaluate_fused(chunk)
+            except Exception as e:
+                logger.error("Batch chunk failed: %s", e)
+                return index_chunk, [self._create_default_evaluation(f"Evaluation error: {e}") for _ in chunk]
+        
+        tasks = [asyncio.create_task(_evaluate_chunk(i, chunk)) for i, chunk in enumerate(index_chunks)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index_chunk, results = await next_done
+                for idx, evaluation in zip(index_chunk, results):
+                    yield idx, evaluation
+        finally:
+            # Stop outstanding judge calls if the consumer abandons the stream
+            for task in tasks:
+                task.cancel()
+    
+    def _length_binned_chunks(self, items: List[tuple]) -> List[List[int]]:
+        """
+        Group item indices into length-homogeneous chunks for fused judging.
+        
+        Items are sorted by prompt size so each fused call holds similarly sized
+        items, and a chunk closes once it reaches fuse_size or fuse_max_chars.
+        
+        Args:
+            items: (question, response, context, expected_answer) tuples
+            
+        Returns:
+            Lists of indices into items, one list per chunk
+        """
+        sizes = np.fromiter(
+            (sum(len(part) for part in item if part) for item in items),
+            dtype=np.int64, count=len(items)
+        )
+        chunks: List[List[int]] = []
+        current: List[int] = []
+        current_chars = 0
+        for idx in np.argsort(sizes, kind="stable").tolist():
+            size = int(sizes[idx])
+            if current and (len(current) >= self.fuse_size or current_chars + size > self.fuse_max_chars):
+                chunks.append(current)
+                current, current_chars = [], 0
+            current.append(idx)
+            current_chars += size
+        if current:
+            chunks.append(current)
+        return chunks
+    
+    async def evaluate_response_group(
+        self, 
+        items: List[Tuple[str, str, Optional[str]]]
+    ) -> List[MTBenchEvaluation]:
+        """
+        Evaluate several independent responses with a single fused judge call.
+        
+        Args:
+            items: (question, response, context) tuples
+            
+        Returns:
+            List of MTBenchEvaluation objects in item order
+        """
+        if not items:
+            return []
+        if len(items) == 1:
+            question, response, context = items[0]
+            return [await self.evaluate_single_response(question=question, response=response, context=context)]
+        return await self._evaluate_fused([(question, response, context, None) for question, response, context in items])
+    
+    async def _evaluate_fused(self, items: List[tuple]) -> List[MTBenchEvaluation]:
+        """
+        Evaluate several items with one judge call, falling back to
+        per-item calls if the fused response cannot be parsed.
+        
+        Args:
+            items: List of (question, response, context, expected_answer) tuples
+            
+        Returns:
+            List of MTBenchEvaluation objects in item order
+        """
+        prompt = self._build_batched_evaluation_prompt(items)
+        try:
+            ai_evaluation = await self._get_ai_evaluation(prompt, max_tokens=600 * len(items), batched=True)
+            evaluations = self._parse_batched_evaluation_response(ai_evaluation, len(items))
+            self._cache_judge_output(prompt, ai_evaluation, batched=True)
+            return evaluations
+        except Exception as e:
+            logger.warning("Fused evaluation of %s items failed, evaluating individually: %s", len(items), e)
+        
+        evaluations = []
+        for question, response, context, expected_answer in items:
+            evaluations.append(await self.evaluate_single_response(
+                question=question,
                 response=response,
-                expected_answer=qa_pair.get("answer")
-            )
-            evaluations.append(evaluation)
+                context=context,
+                expected_answer=expected_answer
+            ))
+        return evaluations
+    
+    async def evaluate_batch_responses_via_batch_api(
+        self, 
+        qa_pairs: List[Dict[str, str]], 
+        responses: List[str],
+        on_batch_status: Optional[Callable[[str, str], None]] = None
+    ) -> List[MTBenchEvaluation]:
+        """
+        Evaluate question-response pairs with a single OpenAI Batch API job.
+        
+        Args:
+            qa_pairs: List of dicts with 'question' and 'answer' keys
+            responses: List of AI responses to evaluate
+            on_batch_status: Called with (batch_id, status) after submission and each poll
             
-            # Rate limiting
-            await asyncio.sleep(0.3)
+        Returns:
+            List of MTBenchEvaluation objects in input order
+            
+        Raises:
+            RuntimeError: If the batch job does not complete
+        """
+        logger.info("=== MT-Bench Batch API Evaluation ===")
+        logger.info("QA pairs count: %s", len(qa_pairs))
         
-        logger.info(f"Batch evaluation complete. Evaluated {len(evaluations)} responses.")
+        lines = []
+        for i, (qa_pair, response) in enumerate(zip(qa_pairs, responses)):
+            prompt = self._build_evaluation_prompt(
+                qa_pair["question"], response, expected_answer=qa_pair.get("answer")
+            )
+            lines.append(orjson.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._build_chat_request(prompt)
+            }))
+        
+        batch_input = await self.openai_client.files.create(
+            file=("mt_bench_batch.jsonl", b"\n".join(lines)),
+            purpose="batch"
+        )
+        batch = await self.openai_client.batches.create(
+            input_file_id=batch_input.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info("Submitted batch %s with %s requests", batch.id, len(lines))
+        if on_batch_status:
+            on_batch_status(batch.id, batch.status)
+        
+        # Poll with exponential backoff until the job reaches a terminal state
+        delay = 5.0
+        try:
+            while batch.status not in ("completed", "failed", "expired", "cancelled"):
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 60.0)
+                batch = await self.openai_client.batches.retrieve(batch.id)
+                logger.info("Batch %s status: %s", batch.id, batch.status)
+                if on_batch_status:
+                    on_batch_status(batch.id, batch.status)
+        except asyncio.CancelledError:
+            # The caller gave up on this job, so stop paying for the rest of it
+            try:
+                await self.openai_client.batches.cancel(batch.id)
+                logger.info("Cancelled batch %s", batch.id)
+            except Exception as e:
+                logger.error("Error cancelling batch %s: %s", batch.id, e)
+            raise
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+        
+        output = await self.openai_client.files.content(batch.output_file_id)
+        contents: Dict[int, str] = {}
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            item = orjson.loads(line)
+            body = (item.get("response") or {}).get("body") or {}
+            choices = body.get("choices") or []
+            if choices:
+                contents[int(item["custom_id"])] = choices[0]["message"]["content"].strip()
+        
+        evaluations = []
+        for i in range(len(lines)):
+            if i in contents:
+                evaluations.append(self._parse_evaluation_response(contents[i]))
+            else:
+                evaluations.append(self._create_default_evaluation(f"No batch result for item {i}"))
+        
+        logger.info("Batch API evaluation complete. Evaluated %s responses.", len(evaluations))
         return evaluations
     
     def calculate_aggregate_metrics(self, evaluations: List[MTBenchEvaluation]) -> Dict[str, Any]:
@@ -207,73 +620,157 @@ class MTBenchEvaluator:
         Returns:
             Dictionary with aggregate metrics
         """
-        logger.info(f"=== Calculating MT-Bench Aggregate Metrics ===")
-        logger.info(f"Evaluations count: {len(evaluations)}")
+        logger.info("Calculating MT-Bench aggregate metrics for %d evaluations", len(evaluations))
+        
+        # Failed placeholders are counted separately so their zero scores do not skew the averages
+        total_count = len(evaluations)
+        evaluations = [e for e in evaluations if e.evaluation_status != "failed"]
+        failed_count = total_count - len(evaluations)
+        if failed_count:
+            logger.warning("%d of %d evaluations failed and are excluded from scoring", failed_count, total_count)
         
         if not evaluations:
             logger.warning("No evaluations provided, returning default metrics")
-            return self._create_default_metrics()
+            return self._create_default_metrics(failed_count)
         
         # Calculate overall scores
-        overall_scores = [e.overall_score for e in evaluations]
-        avg_overall = sum(overall_scores) / len(overall_scores)
-        logger.info(f"Overall scores: {overall_scores}")
-        logger.info(f"Average overall score: {avg_overall:.3f}")
+        count = len(evaluations)
+        overall_scores = np.fromiter((e.overall_score for e in evaluations), dtype=np.float64, count=count)
+        avg_overall = float(overall_scores.mean())
+        logger.debug("Overall scores: %s", overall_scores)
         
-        # Calculate dimension averages
+        # Calculate dimension averages over an (N, D) score matrix
+        dim_names = self._dim_names
+        dim_matrix = np.array(
+            [[e.dimension_scores.get(dim_name, 0.0) for dim_name in dim_names] for e in evaluations],
+            dtype=np.float64
+        )
+        dim_means = dimension_stats(dim_matrix, PASS_THRESHOLD)[0]
         dimension_averages = {}
-        for dimension in self.evaluation_dimensions:
-            dim_name = dimension.value
-            scores = [e.dimension_scores.get(dim_name, 0.0) for e in evaluations]
-            avg_score = sum(scores) / len(scores) if scores else 0.0
+        for idx, dim_name in enumerate(dim_names):
+            avg_score = float(dim_means[idx])
             dimension_averages[f"avg_{dim_name}"] = avg_score
-            logger.info(f"Dimension {dim_name} scores: {scores}")
-            logger.info(f"Average {dim_name} score: {avg_score:.3f}")
+            logger.debug("Average %s score: %.3f", dim_name, avg_score)
         
         # Calculate pass rates
-        pass_rate = sum(1 for score in overall_scores if score >= 0.7) / len(overall_scores)
-        logger.info(f"Pass rate (>=0.7): {pass_rate:.3f} ({sum(1 for score in overall_scores if score >= 0.7)}/{len(overall_scores)})")
+        passed = int(np.count_nonzero(overall_scores >= PASS_THRESHOLD))
+        pass_rate = passed / count
         
-        # Score distribution
+        # Score distribution; searchsorted keeps out-of-range scores in the end buckets
+        poor, fair, good, excellent = np.bincount(
+            np.searchsorted(_SCORE_BUCKET_EDGES, overall_scores, side="right"), minlength=4
+        ).tolist()
         score_distribution = {
-            "excellent": len([s for s in overall_scores if s >= 0.9]),
-            "good": len([s for s in overall_scores if 0.7 <= s < 0.9]),
-            "fair": len([s for s in overall_scores if 0.5 <= s < 0.7]),
-            "poor": len([s for s in overall_scores if s < 0.5])
+            "excellent": excellent,
+            "good": good,
+            "fair": fair,
+            "poor": poor
         }
-        logger.info(f"Score distribution: {score_distribution}")
         
-        # Common strengths and weaknesses
-        all_strengths = []
-        all_weaknesses = []
-        for eval in evaluations:
-            all_strengths.extend(eval.strengths)
-            all_weaknesses.extend(eval.weaknesses)
-        
-        # Get most common strengths/weaknesses
-        from collections import Counter
-        common_strengths = Counter(all_strengths).most_common(5)
-        common_weaknesses = Counter(all_weaknesses).most_common(5)
-        
-        logger.info(f"Common strengths: {common_strengths}")
-        logger.info(f"Common weaknesses: {common_weaknesses}")
+        # Common strengths and weaknesses, counted without building flat lists
+        strength_counts: Counter = Counter()
+        weakness_counts: Counter = Counter()
+        for evaluation in evaluations:
+            strength_counts.update(evaluation.strengths)
+            weakness_counts.update(evaluation.weaknesses)
         
         metrics = {
-            "total_evaluations": len(evaluations),
+            "total_evaluations": total_count,
+            "failed_evaluations": failed_count,
             "avg_overall_score": avg_overall,
             "pass_rate": pass_rate,
             "score_distribution": score_distribution,
             "dimension_averages": dimension_averages,
-            "common_strengths": [item[0] for item in common_strengths],
-            "common_weaknesses": [item[0] for item in common_weaknesses],
+            "common_strengths": self._top_feedback(strength_counts),
+            "common_weaknesses": self._top_feedback(weakness_counts),
             "evaluation_method": "mt_bench"
         }
         
-        logger.info(f"=== Aggregate Metrics Complete ===")
-        logger.info(f"Final metrics: {json.dumps(metrics, indent=2)}")
+        logger.info("Aggregate metrics complete: avg %.3f, pass rate %.3f (%d/%d), distribution %s",
+                    avg_overall, pass_rate, passed, count, score_distribution)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Final metrics: %s", json.dumps(metrics, indent=2))
         
         return metrics
     
+    async def calculate_aggregate_metrics_stream(
+        self, 
+        evaluations: AsyncIterator[Any]
+    ) -> Dict[str, Any]:
+        """
+        Calculate aggregate metrics incrementally from a stream of evaluations.
+        
+        Running means (Welford updates), pass counts and score buckets are
+        updated per result, so the full evaluation list is never materialized.
+        
+        Args:
+            evaluations: Async iterator of MTBenchEvaluation objects or of the
+                (index, MTBenchEvaluation) tuples yielded by evaluate_batch_responses_stream
+            
+        Returns:
+            Dictionary with aggregate metrics
+        """
+        count = 0
+        failed_count = 0
+        passed = 0
+        mean_overall = 0.0
+        dim_means = np.zeros(len(self._dim_names), dtype=np.float64)
+        buckets = np.zeros(4, dtype=np.int64)
+        strength_counts: Counter = Counter()
+        weakness_counts: Counter = Counter()
+        
+        async for item in evaluations:
+            evaluation = item[1] if isinstance(item, tuple) else item
+            if evaluation.evaluation_status == "failed":
+                failed_count += 1
+                continue
+            count += 1
+            score = evaluation.overall_score
+            mean_overall += (score - mean_overall) / count
+            dim_scores = np.fromiter(
+                (evaluation.dimension_scores.get(name, 0.0) for name in self._dim_names),
+                dtype=np.float64, count=len(self._dim_names)
+            )
+            dim_means += (dim_scores - dim_means) / count
+            passed += score >= PASS_THRESHOLD
+            buckets[np.searchsorted(_SCORE_BUCKET_EDGES, score, side="right")] += 1
+            strength_counts.update(evaluation.strengths)
+            weakness_counts.update(evaluation.weaknesses)
+        
+        if failed_count:
+            logger.warning("%d of %d evaluations failed and are excluded from scoring", failed_count, count + failed_count)
+        if not count:
+            logger.warning("No evaluations provided, returning default metrics")
+            return self._create_default_metrics(failed_count)
+        
+        poor, fair, good, excellent = buckets.tolist()
+        metrics = {
+            "total_evaluations": count + failed_count,
+            "failed_evaluations": failed_count,
+            "avg_overall_score": mean_overall,
+            "pass_rate": passed / count,
+            "score_distribution": {
+                "excellent": excellent,
+                "good": good,
+                "fair": fair,
+                "poor": poor
+            },
+            "dimension_averages": {
+                f"avg_{name}": float(mean) for name, mean in zip(self._dim_names, dim_means)
+            },
+            "common_strengths": self._top_feedback(strength_counts),
+            "common_weaknesses": self._top_feedback(weakness_counts),
+            "evaluation_method": "mt_bench"
+        }
+        
+        logger.info("Streamed aggregate metrics complete: avg %.3f, pass rate %.3f (%d/%d)",
+                    mean_overall, metrics["pass_rate"], passed, count)
+        return metrics
+    
+    def _top_feedback(self, counts: Counter, k: int = 5) -> List[str]:
+        """Return the k most frequent strengths/weaknesses via a bounded heap."""
+        return [text for text, _ in heapq.nlargest(k, counts.items(), key=itemgetter(1))]
+    
     def _build_evaluation_prompt(
         self, 
         question: str, 
@@ -282,159 +779,346 @@ class MTBenchEvaluator:
         expected_answer: Optional[str] = None,
         persona_context: Optional[str] = None
     ) -> str:
-        """Build the MT-Bench evaluation prompt."""
-        logger.debug("Building MT-Bench evaluation prompt...")
-        
-        prompt_parts = [
-            "You are an expert AI evaluator using the MT-Bench methodology to assess response quality.",
-            "",
-            "Question: " + question,
-            "Response: " + response
-        ]
+        """Build the per-item part of the MT-Bench prompt; the rubric is sent separately."""
+        context_blocks = ""
+        optional = ""
+        
+        if persona_context:
+            context_blocks += "Persona Context:\n" + persona_context + "\n\n"
         
         if context:
-            prompt_parts.extend(["", "Context:", context])
+            context_blocks += "Context:\n" + context + "\n\n"
         
         if expected_answer:
-            prompt_parts.extend(["", "Expected Answer:", expected_answer])
+            optional += "\n\nExpected Answer:\n" + expected_answer
         
-        if persona_context:
-            prompt_parts.extend(["", "Persona Context:", persona_context])
-        
-        prompt_parts.extend([
-            "",
-            "Evaluate the response on these dimensions (0-10 scale):",
-            "- Relevance: How well does the response address the question?",
-            "- Accuracy: Is the information factually correct and reliable?",
-            "- Clarity: Is the response clear, well-structured, and easy to understand?",
-            "- Depth: Does the response provide sufficient detail and insight?",
-            "- Helpfulness: How useful and actionable is the response?",
-            "",
-            "Return ONLY a JSON object with this exact structure:",
-            "{",
-            '  "overall_score": <float 0-1>,',
-            '  "dimension_scores": {',
-            '    "relevance": <float 0-1>,',
-            '    "accuracy": <float 0-1>,',
-            '    "clarity": <float 0-1>,',
-            '    "depth": <float 0-1>,',
-            '    "helpfulness": <float 0-1>',
-            '  },',
-            '  "reasoning": "<detailed evaluation reasoning>",',
-            '  "strengths": ["<strength1>", "<strength2>"],',
-            '  "weaknesses": ["<weakness1>", "<weakness2>"],',
-            '  "confidence": <float 0-1>',
-            "}",
-            "",
-            "Scoring guidelines:",
-            "- 0.9-1.0: Exceptional quality",
-            "- 0.7-0.8: Good quality with minor issues",
-            "- 0.5-0.6: Acceptable with notable issues",
-            "- 0.0-0.4: Poor quality or incorrect"
-        ])
-        
-        prompt = "\n".join(prompt_parts)
-        logger.debug(f"Built prompt with {len(prompt)} characters")
+        return _ITEM_PROMPT_TEMPLATE.substitute(
+            context_blocks=context_blocks, question=question, response=response, optional_blocks=optional
+        )
+    
+    def _build_batched_evaluation_prompt(self, items: List[tuple]) -> str:
+        """Build the per-item part of a fused MT-Bench prompt covering several items."""
+        prompt = f"Evaluate each of the following {len(items)} items independently."
+        
+        for i, (question, response, context, expected_answer) in enumerate(items):
+            optional = ""
+            if context:
+                optional += "\nContext:\n" + context
+            if expected_answer:
+                optional += "\nExpected Answer:\n" + expected_answer
+            prompt += _BATCHED_ITEM_PROMPT_TEMPLATE.substitute(
+                index=i, question=question, response=response, optional_blocks=optional
+            )
+        
+        logger.debug("Built batched prompt for %s items with %s characters", len(items), len(prompt))
         return prompt
     
-    async def _get_ai_evaluation(self, prompt: str) -> str:
-        """Get evaluation from AI judge."""
+    def _build_chat_request(self, prompt: str, max_tokens: int = 600, batched: bool = False) -> Dict[str, Any]:
+        """Build the chat completion arguments for a single or fused judge prompt."""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": _BATCHED_RUBRIC_PROMPT if batched else _RUBRIC_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.1,
+            "max_tokens": max_tokens,
+            "response_format": _BATCHED_RESPONSE_FORMAT if batched else _RESPONSE_FORMAT
+        }
+    
+    def _judge_cache_key(self, prompt: str, batched: bool = False) -> str:
+        """Judge cache key: a hash of the model, rubric and item prompt."""
+        rubric = _BATCHED_RUBRIC_PROMPT if batched else _RUBRIC_PROMPT
+        return hashlib.blake2b(f"{self.model}|{rubric}|{prompt}".encode("utf-8"), digest_size=16).hexdigest()
+    
+    def _cache_judge_output(self, prompt: str, content: str, batched: bool = False) -> None:
+        """Remember judge output for a prompt; callers only pass output that parsed."""
+        self._cache_put(self._judge_cache, self._judge_cache_key(prompt, batched), content)
+    
+    async def _get_ai_evaluation(self, prompt: str, max_tokens: int = 600, batched: bool = False) -> str:
+        """
+        Get evaluation from AI judge.
+        
+        Cached output is returned without a call. Fresh output is not cached here:
+        callers cache it with _cache_judge_output once it parses, so a truncated,
+        refused or malformed reply is requested again next time.
+        """
+        request = self._build_chat_request(prompt, max_tokens=max_tokens, batched=batched)
+        rubric = request["messages"][0]["content"]
+        cached = self._cache_get(self._judge_cache, self._judge_cache_key(prompt, batched))
+        if cached is not None:
+            logger.debug("Judge cache hit")
+            return cached
+        
         logger.debug("Calling OpenAI API for evaluation...")
+        # Rough token estimate: ~4 characters per prompt token plus the completion budget
+        estimated_tokens = min((len(rubric) + len(prompt)) // 4 + max_tokens, self.tpm)
+        
         try:
-            response = await self.openai_client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.1,
-                max_tokens=1500
-            )
-            content = response.choices[0].message.content.strip()
-            logger.debug(f"OpenAI API response received: {len(content)} characters")
-            return content
+            async for attempt in AsyncRetrying(
+                retry=retry_if_exception_type(_TRANSIENT_OPENAI_ERRORS),
+                wait=self._retry_wait,
+                stop=stop_after_attempt(6),
+                before_sleep=before_sleep_log(logger, logging.WARNING),
+                reraise=True
+            ):
+                with attempt:
+                    await self._tpm_limiter.acquire(estimated_tokens)
+                    # Every judge call (single, fused or multi-turn) passes through here
+                    async with self._semaphore:
+                        async with self._rpm_limiter:
+                            stream = await self.openai_client.chat.completions.create(**request, stream=True)
+                        content = (await self._read_until_json_closes(
+                            stream, stop_after_scores=self.stop_after_scores and not batched
+                        )).strip()
         except Exception as e:
-            logger.error(f"Error calling OpenAI API: {e}")
+            logger.error("Error calling OpenAI API: %s", e)
             raise e
+        
+        logger.debug("OpenAI API response received: %s characters", len(content))
+        return content
+    
+    async def _read_until_json_closes(self, stream, stop_after_scores: bool = False) -> str:
+        """
+        Accumulate streamed content, stopping once the top-level JSON object closes.
+        
+        Args:
+            stream: Streaming chat completion; closed on return, which aborts the HTTP response
+            stop_after_scores: Also stop when the first nested object (dimension_scores,
+                which the schema orders right after overall_score) closes; the scores-only
+                prefix is returned closed off as a JSON object
+        
+        Returns:
+            The content read so far, ending at the closing brace when one was seen
+        """
+        parts = []
+        depth = 0
+        started = False
+        # Braces inside JSON strings (reasoning, strengths, weaknesses) do not count
+        in_string = False
+        escaped = False
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                if not started:
+                    brace_idx = delta.find('{')
+                    if brace_idx == -1:
+                        parts.append(delta)
+                        continue
+                    started = True
+                    parts.append(delta[:brace_idx])
+                    delta = delta[brace_idx:]
+                for idx, char in enumerate(delta):
+                    if in_string:
+                        if escaped:
+                            escaped = False
+                        elif char == '\\':
+                            escaped = True
+                        elif char == '"':
+                            in_string = False
+                    elif char == '"':
+                        in_string = True
+                    elif char == '{':
+                        depth += 1
+                    elif char == '}':
+                        depth -= 1
+                        if depth == 0:
+                            parts.append(delta[:idx + 1])
+                            return "".join(parts)
+                        if stop_after_scores and depth == 1:
+                            logger.debug("Judge scores complete, cancelling the rest of the stream")
+                            parts.append(delta[:idx + 1])
+                            parts.append('}')
+                            return "".join(parts)
+                parts.append(delta)
+        finally:
+            await stream.close()
+        return "".join(parts)
+    
+    def _retry_wait(self, retry_state: RetryCallState) -> float:
+        """Honor a 429's Retry-After header, otherwise back off exponentially with jitter."""
+        error = retry_state.outcome.exception() if retry_state.outcome else None
+        if isinstance(error, RateLimitError):
+            retry_after = self._retry_after_seconds(error, default=None)
+            if retry_after is not None:
+                return retry_after
+        return _BACKOFF(retry_state)
+    
+    def _retry_after_seconds(self, error: RateLimitError, default: Optional[float] = 1.0) -> Optional[float]:
+        """Read the Retry-After header from a 429 response, if present."""
+        try:
+            retry_after = error.response.headers.get("retry-after")
+            return default if retry_after is None else max(float(retry_after), 0.0)
+        except (AttributeError, TypeError, ValueError):
+            return default
+    
+    def _cache_get(self, cache: OrderedDict, key: str) -> Optional[Any]:
+        """Look up an LRU cache entry and mark it as recently used."""
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+    
+    def _cache_put(self, cache: OrderedDict, key: str, value: Any) -> None:
+        """Store an LRU cache entry, evicting the oldest beyond cache_size."""
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
     
     def _parse_evaluation_response(self, response: str) -> MTBenchEvaluation:
         """Parse AI evaluation response into structured format."""
+        cached = self._cache_get(self._parse_cache, response)
+        if cached is not None:
+            return cached
+        
+        evaluation = self._parse_evaluation_response_uncached(response)
+        self._cache_put(self._parse_cache, response, evaluation)
+        return evaluation
+    
+    def _parse_evaluation_response_uncached(self, response: str) -> MTBenchEvaluation:
+        """Parse AI evaluation response without consulting the parse cache."""
         logger.debug("Parsing AI evaluation response...")
         try:
-            # Extract JSON from response
-            start_idx = response.find('{')
-            end_idx = response.rfind('}') + 1
-            if start_idx == -1 or end_idx == 0:
-                logger.error("No valid JSON found in response")
-                logger.error(f"Response content: {response}")
-                raise ValueError("No valid JSON found in response")
-            
-            json_str = response[start_idx:end_idx]
-            logger.debug(f"Extracted JSON string: {json_str}")
-            
-            data = json.loads(json_str)
-            logger.debug(f"Parsed JSON data: {data}")
-            
-            # Validate and normalize scores
-            overall_score = float(data.get("overall_score", 0.0))
-            dimension_scores = data.get("dimension_scores", {})
-            
-            # Ensure all dimension scores are floats
-            for dim in self.evaluation_dimensions:
-                dim_name = dim.value
-                if dim_name not in dimension_scores:
-                    dimension_scores[dim_name] = 0.0
-                    logger.warning(f"Missing dimension score for {dim_name}, defaulting to 0.0")
-                else:
-                    dimension_scores[dim_name] = float(dimension_scores[dim_name])
-            
-            evaluation = MTBenchEvaluation(
-                overall_score=overall_score,
-                dimension_scores=dimension_scores,
-                reasoning=data.get("reasoning", "No reasoning provided"),
-                strengths=data.get("strengths", []),
-                weaknesses=data.get("weaknesses", []),
-                confidence=float(data.get("confidence", 0.5))
-            )
+            # Structured outputs return schema-valid JSON, validated in a single pass
+            return self._evaluation_from_schema(MTBenchEvaluationSchema.model_validate_json(response))
+        except ValidationError:
+            logger.debug("Response is not schema-valid JSON, scanning for an embedded object...")
+        
+        try:
+            data = self._loads_embedded_json(response)
+            logger.debug("Parsed JSON data: %s", data)
             
-            logger.debug(f"Created MTBenchEvaluation: {evaluation}")
-            return evaluation
+            return self._evaluation_from_data(data)
             
-        except (json.JSONDecodeError, ValueError, KeyError) as e:
-            logger.error(f"Failed to parse evaluation response: {e}")
-            logger.error(f"Response content: {response}")
-            logger.error(f"Exception type: {type(e).__name__}")
-            import traceback
-            logger.error(f"Parse error traceback: {traceback.format_exc()}")
-            return self._create_default_evaluation(f"Parsing error: {e}")
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error("Failed to parse evaluation response (%s): %s", type(e).__name__, e)
+            logger.debug("Response content: %s", response, exc_info=True)
+            return self._create_default_evaluation(f"Parsing error: {e}", evaluation_status="unparsed")
+    
+    def _parse_batched_evaluation_response(self, response: str, expected_count: int) -> List[MTBenchEvaluation]:
+        """
+        Parse a fused judge response into one evaluation per item.
+        
+        Raises:
+            ValueError: If the response is not valid JSON or does not cover every item
+        """
+        try:
+            parsed = BatchedEvaluationSchema.model_validate_json(response)
+            if len(parsed.evaluations) == expected_count and sorted(
+                entry.item for entry in parsed.evaluations
+            ) == list(range(expected_count)):
+                ordered = sorted(parsed.evaluations, key=lambda entry: entry.item)
+                return [self._evaluation_from_schema(entry) for entry in ordered]
+        except ValidationError:
+            logger.debug("Batched response is not schema-valid JSON, scanning for an embedded object...")
+        
+        entries = self._loads_embedded_json(response).get("evaluations", [])
+        if len(entries) != expected_count:
+            raise ValueError(f"Expected {expected_count} evaluations, got {len(entries)}")
+        
+        # Prefer the judge's item numbers, but fall back to position if they are unusable
+        by_item = {}
+        for entry in entries:
+            item = entry.get("item")
+            if isinstance(item, int) and 0 <= item < expected_count:
+                by_item[item] = entry
+        if len(by_item) != expected_count:
+            by_item = dict(enumerate(entries))
+        
+        return [self._evaluation_from_data(by_item[i]) for i in range(expected_count)]
+    
+    def _loads_embedded_json(self, response: str) -> Dict[str, Any]:
+        """
+        Decode the outermost JSON object embedded in a judge response.
+        
+        Raises:
+            ValueError: If no JSON object is present or it fails to decode
+        """
+        # Fast path: JSON-mode output is the object itself, so skip the brace scans
+        if response.startswith('{') and response.endswith('}'):
+            try:
+                return orjson.loads(response)
+            except orjson.JSONDecodeError:
+                logger.debug("Response looks like bare JSON but failed to decode, scanning...")
+        
+        raw = response.encode("utf-8")
+        start_idx = raw.find(b'{')
+        end_idx = raw.rfind(b'}') + 1
+        if start_idx == -1 or end_idx == 0:
+            raise ValueError("No valid JSON found in response")
+        
+        # orjson decodes straight from a memoryview slice, so the object is never copied
+        return orjson.loads(memoryview(raw)[start_idx:end_idx])
+    
+    def _evaluation_from_schema(self, parsed: MTBenchEvaluationSchema) -> MTBenchEvaluation:
+        """Build an MTBenchEvaluation from a schema-validated judge response."""
+        return MTBenchEvaluation(
+            overall_score=parsed.overall_score,
+            dimension_scores=parsed.dimension_scores.model_dump(),
+            reasoning=parsed.reasoning,
+            strengths=parsed.strengths,
+            weaknesses=parsed.weaknesses,
+            confidence=parsed.confidence
+        )
+    
+    def _evaluation_from_data(self, data: Dict[str, Any]) -> MTBenchEvaluation:
+        """Build an MTBenchEvaluation from a decoded judge JSON object."""
+        # Validate and normalize scores
+        overall_score = float(data.get("overall_score", 0.0))
+        dimension_scores = data.get("dimension_scores", {})
+        
+        # Ensure all dimension scores are floats, defaulting missing ones to 0.0
+        present = {name: float(dimension_scores[name]) for name in self._dim_names if name in dimension_scores}
+        if len(present) < len(self._dim_names):
+            missing = [name for name in self._dim_names if name not in present]
+            logger.warning("Missing dimension scores for %s, defaulting to 0.0", missing)
+        dimension_scores = {**self._default_dim_scores, **present}
+        
+        return MTBenchEvaluation(
+            overall_score=overall_score,
+            dimension_scores=dimension_scores,
+            reasoning=data.get("reasoning", "No reasoning provided"),
+            strengths=data.get("strengths", []),
+            weaknesses=data.get("weaknesses", []),
+            confidence=float(data.get("confidence", 0.5))
+        )
     
     def _format_conversation_context(self, conversation: List[Dict[str, str]]) -> str:
         """Format conversation history for context."""
-        formatted = []
-        for msg in conversation:
-            role = msg["role"].capitalize()
-            content = msg["content"]
-            formatted.append(f"{role}: {content}")
-        return "\n".join(formatted)
-    
-    def _create_default_evaluation(self, error_msg: str) -> MTBenchEvaluation:
-        """Create default evaluation when evaluation fails."""
-        logger.warning(f"Creating default evaluation due to error: {error_msg}")
+        return "\n".join(self._format_context_line(msg) for msg in conversation)
+    
+    def _format_context_line(self, msg: Dict[str, str]) -> str:
+        """Format a single conversation message as a context line."""
+        return f"{msg['role'].capitalize()}: {msg['content']}"
+    
+    def _create_default_evaluation(self, error_msg: str, evaluation_status: str = "failed") -> MTBenchEvaluation:
+        """Create default evaluation when evaluation fails; see MTBenchEvaluation.evaluation_status."""
+        logger.warning("Creating default evaluation due to error: %s", error_msg)
         return MTBenchEvaluation(
             overall_score=0.0,
-            dimension_scores={dim.value: 0.0 for dim in self.evaluation_dimensions},
+            dimension_scores=dict(self._default_dim_scores),
             reasoning=f"Evaluation failed: {error_msg}",
             strengths=[],
             weaknesses=[f"Evaluation error: {error_msg}"],
-            confidence=0.0
+            confidence=0.0,
+            evaluation_status=evaluation_status
         )
     
-    def _create_default_metrics(self) -> Dict[str, Any]:
-        """Create default metrics when no evaluations available."""
+    def _create_default_metrics(self, failed_count: int = 0) -> Dict[str, Any]:
+        """Create default metrics when no valid evaluations are available."""
         logger.warning("Creating default metrics - no evaluations available")
         return {
-            "total_evaluations": 0,
+            "total_evaluations": failed_count,
+            "failed_evaluations": failed_count,
             "avg_overall_score": 0.0,
             "pass_rate": 0.0,
             "score_distribution": {"excellent": 0, "good": 0, "fair": 0, "poor": 0},
-            "dimension_averages": {f"avg_{dim.value}": 0.0 for dim in self.evaluation_dimensions},
+            "dimension_averages": dict(self._default_dimension_averages),
             "common_strengths": [],
             "common_weaknesses": [],
             "evaluation_method": "mt_bench"
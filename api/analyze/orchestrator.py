@@ -1,70 +1,417 @@
 import asyncio
+import functools
+import hashlib
 import logging
+import os
+import random
 import time
-from typing import Dict, List, Optional
-from openai import AsyncOpenAI
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Any, AsyncIterator, Callable, Dict, Final, List, Optional, Tuple, Union
+import numpy as np
+import orjson
+from aiolimiter import AsyncLimiter
+from openai import AsyncOpenAI, APIConnectionError, APIStatusError, RateLimitError
 from .tester_ai import TesterAI
 from .judge_ai import JudgeAI
+from .mt_bench_evaluator import PASS_THRESHOLD
+from .score_kernels import dimension_stats
+from .batched_judge import BatchedJudge
+from .dynamic_batcher import AsyncDynamicBatcher
+from .response_store import ResponseStore
+from .semantic_cache import SemanticCache
+from .session_store import SessionStore
 
 logger = logging.getLogger(__name__)
 
+# GavinBot replies keyed by sha256 of (persona, question) -> (response, stored_at).
+# Only enable when the chat handler is deterministic (temperature 0); otherwise a
+# cached reply would hide the sampling variance the stress tests are measuring.
+RESPONSE_CACHE_ENABLED = os.getenv("GAVIN_RESPONSE_CACHE", "false").lower() == "true"
+RESPONSE_CACHE_TTL = float(os.getenv("GAVIN_RESPONSE_CACHE_TTL", "1800"))
+# SQLite file backing the cross-process L2 cache; empty (the default) disables it
+RESPONSE_STORE_PATH = os.getenv("GAVIN_RESPONSE_STORE", "")
+# Nearest-neighbour replies for paraphrased questions. Off by default: like the exact
+# cache, a hit skips the handler, and near-duplicates also hide wording sensitivity.
+SEMANTIC_CACHE_ENABLED = os.getenv("GAVIN_SEMANTIC_CACHE", "false").lower() == "true"
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("GAVIN_SEMANTIC_CACHE_THRESHOLD", "0.92"))
+SEMANTIC_EMBED_MODEL = os.getenv("GAVIN_SEMANTIC_EMBED_MODEL", "text-embedding-3-small")
+# SQLite file recording sessions so other workers and restarts can serve them; empty disables it
+SESSION_STORE_PATH = os.getenv("ANALYZE_SESSION_STORE", "")
+# How often long-polls and streams re-read a session that is running in another worker
+REMOTE_SESSION_POLL_INTERVAL = float(os.getenv("ANALYZE_REMOTE_POLL_INTERVAL", "1.0"))
+# Parsed Q&A pairs keyed by input kind + sha256 of the transcript/content text; kept
+# in-process, and also shared through the response store only when GAVIN_RESPONSE_STORE is set
+QA_CACHE_ENABLED = os.getenv("GAVIN_QA_CACHE", "true").lower() == "true"
+QA_CACHE_SIZE = int(os.getenv("GAVIN_QA_CACHE_SIZE", "64"))
+_QA_CACHE: "OrderedDict[bytes, List[Dict[str, str]]]" = OrderedDict()
+_RESPONSE_CACHE: Dict[bytes, Tuple[str, float]] = {}
+# Same keys -> future of the GavinBot call currently fetching that reply
+_INFLIGHT: Dict[bytes, asyncio.Future] = {}
+
+# Wall-clock budget per session; GavinBot retries stop once it would be exceeded
+SESSION_DEADLINE = float(os.getenv("ANALYZE_SESSION_DEADLINE", "900"))
+# Progress events buffered per status stream before the oldest are dropped
+PROGRESS_STREAM_BUFFER = int(os.getenv("ANALYZE_PROGRESS_STREAM_BUFFER", "64"))
+# Judge content-analysis responses through the OpenAI Batch API (half price, slower turnaround)
+JUDGE_USE_BATCH_API = os.getenv("JUDGE_USE_BATCH_API", "false").lower() == "true"
+# Proactive throttle for GavinBot calls shared by all sessions: concurrent calls,
+# requests/min and estimated tokens/min (prompt overhead + question length / 4)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+GAVIN_BOT_RPM = int(os.getenv("GAVIN_BOT_RPM", "500"))
+GAVIN_BOT_TPM = int(os.getenv("GAVIN_BOT_TPM", "200000"))
+GAVIN_PROMPT_TOKEN_ESTIMATE = int(os.getenv("GAVIN_PROMPT_TOKEN_ESTIMATE", "1500"))
+# Per-attempt limit on a GavinBot call once it holds a throttle slot; a timeout is retried
+GAVIN_BOT_TIMEOUT = float(os.getenv("GAVIN_BOT_TIMEOUT", "60"))
+# Threads for CPU-bound aggregation, kept apart from the default executor used for SQLite I/O
+AGGREGATE_WORKERS = int(os.getenv("ANALYZE_AGGREGATE_WORKERS", "2"))
+# Content analyses with more results than this build their MT-Bench analysis off the event loop on completion
+MT_BENCH_PREWARM_THRESHOLD = int(os.getenv("ANALYZE_MT_BENCH_PREWARM_THRESHOLD", "500"))
+
+
+class _LeaderCancelled(Exception):
+    """Set on an _INFLIGHT future when the task making the call is cancelled; joiners retry."""
+
+
+def _json_default(obj: Any) -> Any:
+    """Fallback for types orjson does not encode natively."""
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def to_json_bytes(payload: Any) -> bytes:
+    """
+    Serialize a status or results payload for the API with orjson.
+    
+    Args:
+        payload: Dict as returned by the orchestrator's status/results getters
+        
+    Returns:
+        UTF-8 JSON bytes; integer keys and numpy values are encoded directly
+    """
+    return orjson.dumps(payload, default=_json_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+def status_delta(previous: Dict, current: Dict) -> Dict:
+    """
+    Diff two consecutive session statuses for a progress stream.
+    
+    Args:
+        previous: Status last sent to the client
+        current: Newer status of the same session
+        
+    Returns:
+        Top-level keys whose values changed; a changed progress snapshot is reduced
+        to just its changed fields
+    """
+    delta = {key: value for key, value in current.items() if previous.get(key) != value}
+    old_progress, new_progress = previous.get("progress"), delta.get("progress")
+    if new_progress is not None and type(old_progress) is type(new_progress):
+        delta["progress"] = {
+            name: getattr(new_progress, name)
+            for name in new_progress.__dataclass_fields__
+            if getattr(old_progress, name) != getattr(new_progress, name)
+        }
+    return delta
+
+def _is_retryable(error: BaseException) -> bool:
+    """Throttling, 5xx, connection and timeout errors are transient; other 4xx errors are not."""
+    if isinstance(error, APIStatusError):
+        return isinstance(error, RateLimitError) or error.status_code >= 500
+    return isinstance(error, (APIConnectionError, asyncio.TimeoutError))
+
+def _retry_after_seconds(error: RateLimitError) -> float:
+    """Read the Retry-After header from a 429 response, or 0 if absent."""
+    try:
+        return max(float(error.response.headers.get("retry-after", 0)), 0.0)
+    except (AttributeError, TypeError, ValueError):
+        return 0.0
+
+async def _retrying_call(
+    coro_factory,
+    tries: int = 4,
+    base: float = 0.4,
+    cap: float = 8.0,
+    deadline: Optional[float] = None,
+    on_retry: Optional[Callable[[int, BaseException], None]] = None
+):
+    """
+    Await coro_factory() with jittered exponential backoff on transient errors.
+    
+    Args:
+        coro_factory: Zero-argument callable returning a fresh coroutine per attempt
+        tries: Maximum number of attempts
+        base: Backoff base in seconds, doubled per retry
+        cap: Maximum backoff before jitter
+        deadline: time.monotonic() value after which no further retry is started
+        on_retry: Called with (failed attempt number, error) before each retry
+        
+    Returns:
+        The result of the first successful attempt
+    """
+    for attempt in range(tries):
+        try:
+            return await coro_factory()
+        except Exception as e:
+            if attempt == tries - 1 or not _is_retryable(e):
+                raise
+            delay = min(cap, base * 2 ** attempt) * (0.5 + random.random())
+            if isinstance(e, RateLimitError):
+                # A 429's Retry-After says exactly when capacity returns
+                delay = max(delay, _retry_after_seconds(e))
+            if deadline is not None and time.monotonic() + delay > deadline:
+                logger.warning("Session deadline reached; not retrying after: %s", e)
+                raise
+            logger.warning("Transient error (attempt %d/%d), retrying in %.2fs: %s", attempt + 1, tries, delay, e)
+            if on_retry:
+                on_retry(attempt + 1, e)
+            await asyncio.sleep(delay)
+
+@dataclass(frozen=True, slots=True)
+class Progress:
+    """Immutable progress snapshot for stress-test and content-analysis sessions"""
+    current_step: str
+    questions_total: int = 0
+    questions_completed: int = 0
+    evaluations_completed: int = 0
+    evaluation_progress: float = 0.0
+
+@dataclass(frozen=True, slots=True)
+class MultiTurnProgress:
+    """Immutable progress snapshot for multi-turn sessions"""
+    current_step: str
+    # Both counted in user turns, the unit each turn's evaluation completes
+    total_messages: int = 0
+    processed_messages: int = 0
+
+# Session statuses after which no further progress is made
+FINISHED_STATUSES: Final[Tuple[str, ...]] = ("completed", "failed", "cancelled")
+
+# Human-readable MT-Bench dimensions; key order is the column order of EvalTable.dimension_scores
+MT_BENCH_DIMENSION_DESCRIPTIONS: Final[Dict[str, str]] = {
+    "relevance": "How well the response addresses the question",
+    "accuracy": "Factual correctness and reliability of information",
+    "clarity": "Clear, well-structured, and easy to understand",
+    "depth": "Sufficient detail and insight provided",
+    "helpfulness": "Useful and actionable response"
+}
+MT_BENCH_DIMENSIONS: Final[Tuple[str, ...]] = tuple(MT_BENCH_DIMENSION_DESCRIPTIONS)
+
+@dataclass(slots=True)
+class EvalRow:
+    """Non-numeric fields of one MT-Bench evaluated result"""
+    question_index: int
+    question: str
+    bot_response: str
+    expected_answer: str
+    reasoning: Dict
+    strengths: List[str]
+    weaknesses: List[str]
+
+@dataclass(slots=True)
+class EvalTable:
+    """MT-Bench evaluated results as rows plus column arrays for the numeric fields"""
+    rows: List[EvalRow]
+    overall_score: np.ndarray
+    # Shape (N, len(MT_BENCH_DIMENSIONS))
+    dimension_scores: np.ndarray
+    content_similarity: np.ndarray
+    style_fidelity: np.ndarray
+    confidence: np.ndarray
+
+@dataclass(slots=True)
+class Session:
+    """State for one stress-test, content-analysis, or multi-turn session"""
+    session_id: int
+    session_name: str
+    session_type: str
+    status: str
+    start_time: float
+    # Writers swap in a new snapshot, so readers can share the current one without copying
+    progress: Union[Progress, MultiTurnProgress]
+    # Raw input is released once parsed; only its hash is kept for provenance
+    transcript_text: Optional[str] = None
+    content_text: Optional[str] = None
+    transcript_sha256: Optional[str] = None
+    content_sha256: Optional[str] = None
+    # OpenAI Batch API job judging this session, when JUDGE_USE_BATCH_API is on
+    batch_id: Optional[str] = None
+    batch_status: Optional[str] = None
+    qa_pairs: List[Dict] = field(default_factory=list)
+    questions: List[str] = field(default_factory=list)
+    test_results: List[Dict] = field(default_factory=list)
+    evaluated_results: List[Dict] = field(default_factory=list)
+    messages: List[Dict[str, str]] = field(default_factory=list)
+    responses: List[Dict] = field(default_factory=list)
+    evaluations: List[Dict] = field(default_factory=list)
+    aggregate_metrics: Dict = field(default_factory=dict)
+    end_time: Optional[float] = None
+    duration: Optional[float] = None
+    error: Optional[str] = None
+    # Monotonic start for duration accounting; start_time/end_time stay wall-clock for display
+    t0_monotonic: float = field(default_factory=time.monotonic)
+    # Bumped and signalled on every progress change so status readers can long-poll
+    progress_version: int = 0
+    progress_event: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    # Per-stream queues of (progress_version, progress) events, fed by update_progress
+    progress_subscribers: List[asyncio.Queue] = field(default_factory=list, repr=False)
+    # (results key, analysis) memo for _extract_mt_bench_analysis
+    mt_bench_analysis: Optional[Tuple[tuple, Dict]] = field(default=None, repr=False)
+    # Called from update_progress whenever status has changed since the last call
+    on_status_change: Optional[Callable[["Session"], None]] = field(default=None, repr=False)
+    reported_status: Optional[str] = field(default=None, repr=False)
+    # Pipeline task running this session in this process; cancelled by cancel_session
+    run_task: Optional[asyncio.Task] = field(default=None, repr=False)
+    
+    def update_progress(self, **changes):
+        """Swap in a new progress snapshot and wake anyone waiting for a change."""
+        if changes:
+            self.progress = replace(self.progress, **changes)
+        self.progress_version += 1
+        self.progress_event.set()
+        self.progress_event.clear()
+        event = (self.progress_version, self.progress)
+        for queue in self.progress_subscribers:
+            # A slow subscriber only needs the latest snapshots, so drop its oldest event
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+        if self.on_status_change is not None and self.status != self.reported_status:
+            self.reported_status = self.status
+            self.on_status_change(self)
+
+# Session fields written to a SessionStore; the rest is per-process runtime state
+_SESSION_STATE_FIELDS = (
+    "session_id", "session_name", "session_type", "status", "start_time",
+    "transcript_sha256", "content_sha256", "batch_id", "batch_status",
+    "end_time", "duration", "progress_version", "error"
+)
+_SESSION_RESULT_FIELDS = (
+    "qa_pairs", "questions", "test_results", "evaluated_results",
+    "messages", "responses", "evaluations", "aggregate_metrics"
+)
+
 class AnalyzeOrchestrator:
-    def __init__(self, openai_client: AsyncOpenAI, gavin_bot_handler, use_mt_bench: bool = True):
+    def __init__(
+        self,
+        openai_client: AsyncOpenAI,
+        gavin_bot_handler,
+        use_mt_bench: bool = True,
+        judge_marshal_size: Optional[int] = None,
+        enable_dynamic_batch: bool = True,
+        openai_pool_size: Optional[int] = None
+    ):
+        # The client is used as configured (config.py builds it on a pooled HTTP/2 transport,
+        # openai_pool_size connections); the GavinBot handler should call OpenAI through this
+        # same client so both share one warm connection pool
         self.openai_client = openai_client
         self.gavin_bot_handler = gavin_bot_handler
+        # Specializes itself to the handler's return shape on first use
+        self._call_bot = self._detect_bot_call
+        # Held for the duration of each GavinBot call, across all sessions
+        self._call_sem = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+        self._bot_rpm_limiter = AsyncLimiter(GAVIN_BOT_RPM, 60)
+        self._bot_tpm_limiter = AsyncLimiter(GAVIN_BOT_TPM, 60)
+        # Handlers exposing batch(handle, {"messages": [...]}) -> [reply, ...] get concurrent
+        # questions coalesced into one downstream call
+        self._batcher: Optional[AsyncDynamicBatcher] = None
+        if enable_dynamic_batch and callable(getattr(gavin_bot_handler, "batch", None)):
+            self._batcher = AsyncDynamicBatcher(
+                self._call_bot_batch,
+                max_batch_size=int(os.getenv("GAVIN_BOT_BATCH_SIZE", "32")),
+                batch_wait_timeout_s=float(os.getenv("GAVIN_BOT_BATCH_WAIT", "0.002"))
+            )
         self.tester_ai = TesterAI(openai_client)
+        # Q&A triples marshalled into one judge prompt; latency-vs-K flattens out around 5-10
+        self.judge_marshal_size = judge_marshal_size or int(os.getenv("JUDGE_MARSHAL_SIZE", "8"))
         # Initialize JudgeAI with BLEURT enabled and MT-Bench disabled for transcript tests
         self.judge_ai_transcript = JudgeAI(openai_client, use_mt_bench=False, use_bleurt=True)
         # Initialize separate JudgeAI with MT-Bench for multi-turn tests
-        self.judge_ai_multiturn = JudgeAI(openai_client, use_mt_bench=use_mt_bench, use_bleurt=False)
+        self.judge_ai_multiturn = JudgeAI(
+            openai_client, use_mt_bench=use_mt_bench, use_bleurt=False, fuse_size=self.judge_marshal_size,
+            pool_size=openai_pool_size
+        )
+        # Concurrent multi-turn evaluations are grouped into fused judge calls
+        self._judge_batcher = BatchedJudge(
+            self.judge_ai_multiturn,
+            batch_size=int(os.getenv("JUDGE_BATCH_SIZE", str(self.judge_marshal_size))),
+            wait_timeout=float(os.getenv("JUDGE_BATCH_WAIT_TIMEOUT", "0.05"))
+        )
         
-        # Test session state
-        self.current_session = None
-        self.current_multi_turn_session = None
+        # Test session state, keyed by session_id; only the most recent sessions are kept
+        self._sessions: "OrderedDict[int, Session]" = OrderedDict()
+        self.max_sessions = int(os.getenv("ANALYZE_MAX_SESSIONS", "32"))
+        self._latest_session_id: Optional[int] = None
+        self._latest_multi_turn_id: Optional[int] = None
         self.session_id = 0
+        self.response_cache_hits = 0
+        self.response_cache_misses = 0
+        self.semantic_cache_hits = 0
+        self.bot_retries = 0
+        self._response_store: Optional[ResponseStore] = None
+        self._semantic_cache: Optional[SemanticCache] = None
+        if SEMANTIC_CACHE_ENABLED:
+            self._semantic_cache = SemanticCache(
+                self._embed_question,
+                threshold=SEMANTIC_CACHE_THRESHOLD,
+                max_entries=int(os.getenv("GAVIN_SEMANTIC_CACHE_SIZE", "5000")),
+                store_path=RESPONSE_STORE_PATH or None,
+                ttl=RESPONSE_CACHE_TTL
+            )
+        # Only an explicitly configured path opens a SQLite file; the Q&A cache is on by
+        # default and must not create one in the working directory on its own
+        if (RESPONSE_CACHE_ENABLED or QA_CACHE_ENABLED) and RESPONSE_STORE_PATH:
+            try:
+                self._response_store = ResponseStore(RESPONSE_STORE_PATH, RESPONSE_CACHE_TTL)
+            except Exception as e:
+                logger.error("Could not open response store, continuing with in-process cache only: %s", e)
+        self._cpu_pool = ThreadPoolExecutor(max_workers=AGGREGATE_WORKERS, thread_name_prefix="analyze-aggregate")
+        self._session_store: Optional[SessionStore] = None
+        if SESSION_STORE_PATH:
+            try:
+                self._session_store = SessionStore(SESSION_STORE_PATH)
+                self._latest_session_id = self._session_store.latest_id()
+                self._latest_multi_turn_id = self._session_store.latest_id(multi_turn=True)
+            except Exception as e:
+                logger.error("Could not open session store, keeping sessions in memory only: %s", e)
+                self._session_store = None
         
-        logger.info(f"=== AnalyzeOrchestrator Initialized ===")
-        logger.info(f"Transcript tests: BLEURT-only evaluation")
-        logger.info(f"Multi-turn tests: MT-Bench evaluation (use_mt_bench={use_mt_bench})")
-        logger.info(f"Transcript JudgeAI: BLEURT-only (no GPT-4 evaluation)")
-        logger.info(f"Multi-turn JudgeAI: MT-Bench only (no BLEURT)")
+        logger.info("=== AnalyzeOrchestrator Initialized ===")
+        logger.info("Transcript tests: BLEURT-only evaluation")
+        logger.info("Multi-turn tests: MT-Bench evaluation (use_mt_bench=%s)", use_mt_bench)
+        logger.info("Transcript JudgeAI: BLEURT-only (no GPT-4 evaluation)")
+        logger.info("Multi-turn JudgeAI: MT-Bench only (no BLEURT)")
     
     async def start_stress_test(self, transcript_text: str, session_name: str = None) -> Dict:
         """
         Start a complete analysis session.
         Returns session info and begins async processing.
         """
-        self.session_id += 1
-        session_name = session_name or f"Analysis_{self.session_id}_{int(time.time())}"
+        self.session_id = self._next_session_id("stress_test")
+        now = time.time()
+        session_name = session_name or f"Analysis_{self.session_id}_{int(now)}"
         
-        logger.info(f"Starting analysis session: {session_name}")
+        logger.info("Starting analysis session: %s", session_name)
         
         # Initialize session state
-        self.current_session = {
-            "session_id": self.session_id,
-            "session_name": session_name,
-            "status": "parsing_transcript",
-            "start_time": time.time(),
-            "transcript_text": transcript_text,
-            "qa_pairs": [],
-            "questions": [],
-            "test_results": [],
-            "evaluated_results": [],
-            "aggregate_metrics": {},
-            "progress": {
-                "current_step": "parsing_transcript",
-                "questions_total": 0,
-                "questions_completed": 0,
-                "evaluations_completed": 0
-            }
-        }
+        session = Session(
+            session_id=self.session_id,
+            session_name=session_name,
+            session_type="stress_test",
+            status="parsing_transcript",
+            start_time=now,
+            transcript_text=transcript_text,
+            progress=Progress(current_step="parsing_transcript")
+        )
+        self._store_session(session)
+        self._latest_session_id = session.session_id
         
         # Initialize BLEURT model for transcript test (will be loaded lazily during evaluation)
         if self.judge_ai_transcript.use_bleurt and self.judge_ai_transcript.bleurt_scorer:
             logger.info("BLEURT model will load when transcript test starts (BLEURT-only evaluation)")
         
         # Start async processing
-        asyncio.create_task(self._run_stress_test_async())
+        session.run_task = asyncio.create_task(self._run_stress_test_async(session))
         
         return {
             "session_id": self.session_id,
@@ -78,33 +425,27 @@ class AnalyzeOrchestrator:
         Start a content analysis session specifically for content analysis.
         Returns session info and begins async processing.
         """
-        self.session_id += 1
-        session_name = session_name or f"Content_Analysis_{self.session_id}_{int(time.time())}"
+        self.session_id = self._next_session_id("content_analysis")
+        now = time.time()
+        session_name = session_name or f"Content_Analysis_{self.session_id}_{int(now)}"
         
-        logger.info(f"Starting content analysis session: {session_name}")
+        logger.info("Starting content analysis session: %s", session_name)
         
         # Initialize session state
-        self.current_session = {
-            "session_id": self.session_id,
-            "session_name": session_name,
-            "status": "parsing_content",
-            "start_time": time.time(),
-            "content_text": content_text,
-            "qa_pairs": [],
-            "questions": [],
-            "test_results": [],
-            "evaluated_results": [],
-            "aggregate_metrics": {},
-            "progress": {
-                "current_step": "parsing_content",
-                "questions_total": 0,
-                "questions_completed": 0,
-                "evaluations_completed": 0
-            }
-        }
+        session = Session(
+            session_id=self.session_id,
+            session_name=session_name,
+            session_type="content_analysis",
+            status="parsing_content",
+            start_time=now,
+            content_text=content_text,
+            progress=Progress(current_step="parsing_content")
+        )
+        self._store_session(session)
+        self._latest_session_id = session.session_id
         
         # Start async processing
-        asyncio.create_task(self._run_content_analysis_async())
+        session.run_task = asyncio.create_task(self._run_content_analysis_async(session))
         
         return {
             "session_id": self.session_id,
@@ -113,345 +454,990 @@ class AnalyzeOrchestrator:
             "message": "Content analysis initiated. Check dashboard for progress."
         }
     
-    async def _run_stress_test_async(self):
+    async def _run_stress_test_async(self, session: Session):
         """
         Run the complete stress test pipeline asynchronously.
         """
         try:
-            session = self.current_session
-            
-            # Step 1: Parse transcript and extract Q&A pairs
-            logger.info("Step 1: Parsing transcript...")
-            session["status"] = "parsing_transcript"
-            session["progress"]["current_step"] = "parsing_transcript"
-            
-            qa_pairs = await self.tester_ai.parse_transcript(session["transcript_text"])
-            session["qa_pairs"] = qa_pairs
-            
-            if not qa_pairs:
-                session["status"] = "failed"
-                session["error"] = "No Q&A pairs extracted from transcript"
-                return
-            
-            # Step 2: Extract questions for testing
-            logger.info("Step 2: Extracting questions...")
-            questions = await self.tester_ai.extract_questions_from_qa_pairs(qa_pairs)
-            session["questions"] = questions
-            session["progress"]["questions_total"] = len(questions)
-            
-            # Step 3: Fire questions sequentially and get bot responses
-            logger.info("Step 3: Testing bot responses...")
-            session["status"] = "testing_responses"
-            session["progress"]["current_step"] = "testing_responses"
-            
-            test_results = await self.tester_ai.fire_questions_sequentially(
-                questions, 
-                self._handle_question_callback
-            )
-            session["test_results"] = test_results
-            
-            # Step 4: Evaluate responses
-            logger.info("Step 4: Evaluating responses...")
-            session["status"] = "evaluating_responses"
-            session["progress"]["current_step"] = "evaluating_responses"
-            session["progress"]["evaluation_progress"] = 0
-            
-            logger.info(f"=== Starting Response Evaluation (Transcript Test) ===")
-            logger.info(f"Test results count: {len(test_results)}")
-            logger.info(f"QA pairs count: {len(qa_pairs)}")
-            logger.info(f"Using BLEURT-only evaluation for transcript test")
-            logger.info(f"No GPT-4 evaluation - pure BLEURT semantic similarity scoring")
+            logger.info("=== Starting Response Evaluation (Transcript Test) ===")
+            logger.info("Using BLEURT-only evaluation for transcript test")
+            logger.info("No GPT-4 evaluation - pure BLEURT semantic similarity scoring")
             
             # Check if BLEURT model needs loading and update status accordingly
             if self.judge_ai_transcript.use_bleurt and not self.judge_ai_transcript.bleurt_scorer._model_loaded:
-                session["progress"]["current_step"] = "loading_bleurt"
+                session.update_progress(current_step="loading_bleurt")
                 logger.info("BLEURT model needs loading (this may take 1-2 minutes)...")
                 
                 # Gradual progress indication during model loading
                 for i in range(5):
-                    session["progress"]["evaluation_progress"] = (i + 1) / 5.0
+                    session.update_progress(evaluation_progress=(i + 1) / 5.0)
                     await asyncio.sleep(0.2)  # Allow status updates to be seen
             
-            # Switch to evaluation step
-            session["progress"]["current_step"] = "evaluating_responses"
-            session["progress"]["evaluation_progress"] = 0
+            # Steps 1-4: Parse the transcript, fire each question as soon as its Q&A pair
+            # is parsed, and evaluate responses as they arrive
+            logger.info("Steps 1-4: Parsing transcript, testing and evaluating bot responses...")
+            session.status = "parsing_transcript"
+            session.update_progress(current_step="parsing_transcript", evaluation_progress=0.0)
             
-            # Run evaluation with progress updates
-            evaluated_results = await self.judge_ai_transcript.batch_evaluate(test_results, qa_pairs)
-            session["evaluated_results"] = evaluated_results
-            session["progress"]["evaluations_completed"] = len(evaluated_results)
-            session["progress"]["evaluation_progress"] = 1.0  # Complete
+            transcript_text = session.transcript_text
+            session.transcript_sha256 = hashlib.sha256(transcript_text.encode()).hexdigest()
+            session.transcript_text = None
+            qa_pairs: List[Dict[str, str]] = []
+            questions: List[str] = []
+            # Filled as pairs arrive so every evaluation chunk looks up its references in O(1)
+            qa_index: Dict[int, Dict[str, str]] = {}
             
-            logger.info(f"Evaluation complete. Evaluated {len(evaluated_results)} results.")
+            async def _stream_questions(text: str) -> AsyncIterator[str]:
+                async for pair in self._cached_parse_stream(
+                    "transcript", session.transcript_sha256, text, self.tester_ai.stream_transcript
+                ):
+                    qa_pairs.append(pair)
+                    question = pair.get("question")
+                    if not question:
+                        continue
+                    qa_index[len(questions)] = pair
+                    questions.append(question)
+                    if len(questions) == 1:
+                        session.status = "testing_responses"
+                        session.update_progress(current_step="testing_responses", questions_total=1)
+                    else:
+                        session.update_progress(questions_total=len(questions))
+                    yield question
+            
+            test_results, evaluated_results = await self._pipeline_evaluate(
+                _stream_questions(transcript_text), qa_index, session, self.judge_ai_transcript
+            )
+            del transcript_text
+            session.qa_pairs = qa_pairs
+            session.questions = questions
+            logger.info("Questions count: %s", len(questions))
+            logger.info("QA pairs count: %s", len(qa_pairs))
+            
+            if not qa_pairs:
+                session.status = "failed"
+                session.error = "No Q&A pairs extracted from transcript"
+                session.update_progress()
+                return
+            
+            session.test_results = test_results
+            session.evaluated_results = evaluated_results
+            session.status = "evaluating_responses"
+            session.update_progress(
+                current_step="evaluating_responses",
+                evaluations_completed=len(evaluated_results), evaluation_progress=1.0
+            )
+            
+            logger.info("Evaluation complete. Evaluated %s results.", len(evaluated_results))
             
             # Log evaluation results summary
             valid_evaluations = [r for r in evaluated_results if not r.get("error") and r.get("evaluation")]
             if valid_evaluations:
-                overall_scores = [r["evaluation"]["overall_score"] for r in valid_evaluations]
-                avg_score = sum(overall_scores) / len(overall_scores)
-                logger.info(f"Evaluation Summary:")
-                logger.info(f"  Valid evaluations: {len(valid_evaluations)}")
-                logger.info(f"  Average overall score: {avg_score:.3f}")
-                logger.info(f"  Score range: {min(overall_scores):.3f} - {max(overall_scores):.3f}")
-                logger.info(f"  Evaluation methods used: {list(set(r['evaluation'].get('evaluation_method', 'unknown') for r in valid_evaluations))}")
+                overall_scores = np.fromiter(
+                    (r["evaluation"]["overall_score"] for r in valid_evaluations), dtype=np.float32, count=len(valid_evaluations)
+                )
+                methods, method_counts = np.unique(
+                    [r["evaluation"].get("evaluation_method", "unknown") for r in valid_evaluations], return_counts=True
+                )
+                logger.info("Evaluation Summary:")
+                logger.info("  Valid evaluations: %s", len(valid_evaluations))
+                logger.info("  Average overall score: %.3f", overall_scores.mean())
+                logger.info("  Score range: %.3f - %.3f", overall_scores.min(), overall_scores.max())
+                logger.info("  Evaluation methods used: %s", dict(zip(methods.tolist(), method_counts.tolist())))
                 
                 # Log MT-Bench specific metrics if available
                 mt_bench_results = [r for r in valid_evaluations if r["evaluation"].get("evaluation_method") == "mt_bench"]
                 if mt_bench_results:
-                    logger.info(f"MT-Bench Results:")
-                    logger.info(f"  MT-Bench evaluations: {len(mt_bench_results)}")
+                    logger.info("MT-Bench Results:")
+                    logger.info("  MT-Bench evaluations: %s", len(mt_bench_results))
                     for i, result in enumerate(mt_bench_results[:3]):  # Log first 3 for brevity
                         eval_data = result["evaluation"]
-                        logger.info(f"  Result {i+1}: Overall={eval_data['overall_score']:.3f}, "
-                                  f"Relevance={eval_data.get('mt_bench_scores', {}).get('relevance', 0):.3f}, "
-                                  f"Accuracy={eval_data.get('mt_bench_scores', {}).get('accuracy', 0):.3f}")
+                        logger.info("  Result %d: Overall=%.3f, Relevance=%.3f, Accuracy=%.3f",
+                                  i + 1, eval_data['overall_score'],
+                                  eval_data.get('mt_bench_scores', {}).get('relevance', 0),
+                                  eval_data.get('mt_bench_scores', {}).get('accuracy', 0))
             
             # Step 5: Calculate aggregate metrics
             logger.info("Step 5: Calculating metrics...")
-            session["status"] = "calculating_metrics"
-            session["progress"]["current_step"] = "calculating_metrics"
+            session.status = "calculating_metrics"
+            session.update_progress(current_step="calculating_metrics")
             
-            aggregate_metrics = self.judge_ai_transcript.calculate_aggregate_metrics(evaluated_results)
-            session["aggregate_metrics"] = aggregate_metrics
+            aggregate_metrics = await self._run_cpu(self.judge_ai_transcript.calculate_aggregate_metrics, evaluated_results)
+            session.aggregate_metrics = aggregate_metrics
             
-            logger.info(f"=== Final Aggregate Metrics (BLEURT-Only) ===")
+            logger.info("=== Final Aggregate Metrics (BLEURT-Only) ===")
             for key, value in aggregate_metrics.items():
-                logger.info(f"{key}: {value}")
-            logger.info(f"Average BLEURT score: {aggregate_metrics.get('avg_bleurt_score', 0):.3f}")
-            logger.info(f"BLEURT pass rate (>= 0.0): {aggregate_metrics.get('pass_rate', 0):.3f}")
-            logger.info(f"Score range: {aggregate_metrics.get('min_bleurt_score', 0):.3f} - {aggregate_metrics.get('max_bleurt_score', 0):.3f}")
+                logger.info("%s: %s", key, value)
+            logger.info("Average BLEURT score: %.3f", aggregate_metrics.get('avg_bleurt_score', 0))
+            logger.info("BLEURT pass rate (>= 0.0): %.3f", aggregate_metrics.get('pass_rate', 0))
+            logger.info("Score range: %.3f - %.3f", aggregate_metrics.get('min_bleurt_score', 0), aggregate_metrics.get('max_bleurt_score', 0))
             
             # Complete
-            session["status"] = "completed"
-            session["end_time"] = time.time()
-            session["duration"] = session["end_time"] - session["start_time"]
-            session["progress"]["current_step"] = "completed"
+            session.status = "completed"
+            session.end_time = time.time()
+            session.duration = time.monotonic() - session.t0_monotonic
+            session.update_progress(current_step="completed")
             
-            logger.info(f"Analysis completed successfully. Overall score: {aggregate_metrics.get('avg_overall_score', 0):.2f}")
+            logger.info("Analysis completed successfully. Overall score: %.2f", aggregate_metrics.get('avg_overall_score', 0))
             
+        except asyncio.CancelledError:
+            self._mark_cancelled(session)
+            raise
         except Exception as e:
-            logger.error(f"Analysis failed: {e}")
-            logger.error(f"Exception details: {type(e).__name__}: {str(e)}")
+            logger.error("Analysis failed: %s", e)
+            logger.error("Exception details: %s: %s", type(e).__name__, str(e))
             import traceback
-            logger.error(f"Analysis failure traceback: {traceback.format_exc()}")
-            if self.current_session:
-                self.current_session["status"] = "failed"
-                self.current_session["error"] = str(e)
-                self.current_session["end_time"] = time.time()
+            logger.error("Analysis failure traceback: %s", traceback.format_exc())
+            session.status = "failed"
+            session.error = str(e)
+            session.end_time = time.time()
+            session.update_progress()
+    
+    def _mark_cancelled(self, session: Session):
+        """Record that a session's pipeline task was cancelled."""
+        logger.info("Session %s cancelled during %s", session.session_id, session.status)
+        session.status = "cancelled"
+        session.error = "Cancelled by request"
+        session.end_time = time.time()
+        session.duration = time.monotonic() - session.t0_monotonic
+        session.update_progress()
+    
+    def _record_batch_status(self, session: Session, batch_id: str, status: str):
+        """Track a session's Batch API job so status polls can report it."""
+        session.batch_id = batch_id
+        session.batch_status = status
+        session.update_progress()
+    
+    async def _cached_parse(self, kind: str, text_sha256: str, text: str, parse) -> List[Dict[str, str]]:
+        """
+        Parse input text into Q&A pairs, reusing earlier results for identical text.
+        
+        Args:
+            kind: "transcript" or "content", keeping the two parsers' results apart
+            text_sha256: Hex SHA-256 of text
+            text: Input text
+            parse: Tester coroutine function producing Q&A pairs from text
+            
+        Returns:
+            List of {"question", "answer"} dicts
+        """
+        if not QA_CACHE_ENABLED:
+            return await parse(text)
+        
+        cache_key = b"qa:" + kind.encode() + b":" + bytes.fromhex(text_sha256)
+        cached = await self._qa_cache_get(cache_key, kind)
+        if cached is not None:
+            return cached
+        
+        qa_pairs = await parse(text)
+        self._qa_cache_put(cache_key, qa_pairs)
+        return qa_pairs
+    
+    async def _cached_parse_stream(self, kind: str, text_sha256: str, text: str, stream) -> AsyncIterator[Dict[str, str]]:
+        """
+        Streaming counterpart of _cached_parse: yield Q&A pairs as the parser produces them.
+        
+        Args:
+            kind: "transcript" or "content", keeping the two parsers' results apart
+            text_sha256: Hex SHA-256 of text
+            text: Input text
+            stream: Tester async generator function yielding Q&A pairs from text
+            
+        Yields:
+            {"question", "answer"} dicts in input order; if the parser fails or is
+            truncated, the pairs produced so far are still yielded but not cached
+        """
+        cache_key = b"qa:" + kind.encode() + b":" + bytes.fromhex(text_sha256)
+        cached = await self._qa_cache_get(cache_key, kind) if QA_CACHE_ENABLED else None
+        if cached is not None:
+            for pair in cached:
+                yield pair
+            return
+        
+        qa_pairs = []
+        try:
+            async for pair in stream(text):
+                qa_pairs.append(pair)
+                yield pair
+        except Exception as e:
+            logger.error("Error streaming %s Q&A pairs, not caching the %s parsed: %s", kind, len(qa_pairs), e)
+            return
+        if QA_CACHE_ENABLED:
+            self._qa_cache_put(cache_key, qa_pairs)
+    
+    async def _qa_cache_get(self, cache_key: bytes, kind: str) -> Optional[List[Dict[str, str]]]:
+        """Look up parsed Q&A pairs in the in-process cache, then the response store."""
+        cached = _QA_CACHE.get(cache_key)
+        if cached is None and self._response_store:
+            stored = await self._response_store.aget(cache_key)
+            if stored:
+                cached = orjson.loads(stored)
+        if cached is None:
+            return None
+        logger.info("Reusing %s parsed Q&A pairs for identical %s", len(cached), kind)
+        _QA_CACHE[cache_key] = cached
+        _QA_CACHE.move_to_end(cache_key)
+        return [dict(pair) for pair in cached]
+    
+    def _qa_cache_put(self, cache_key: bytes, qa_pairs: List[Dict[str, str]]):
+        """Remember non-empty parse results in the in-process cache and the response store."""
+        if not qa_pairs:
+            return
+        _QA_CACHE[cache_key] = [dict(pair) for pair in qa_pairs]
+        while len(_QA_CACHE) > QA_CACHE_SIZE:
+            _QA_CACHE.popitem(last=False)
+        if self._response_store:
+            self._response_store.set_in_background(cache_key, orjson.dumps(qa_pairs).decode("utf-8"))
+    
+    async def _fire_bounded(self, questions: Union[List[str], AsyncIterator[str]], session: Session, cap: Optional[int] = None) -> AsyncIterator[Dict]:
+        """
+        Fire questions through GavinBot concurrently, yielding results as they complete.
+        
+        Args:
+            questions: Questions to send, either a list or an async stream that is
+                consumed while earlier questions are already in flight
+            session: Session whose progress is updated as results arrive
+            cap: Maximum questions in flight; defaults to QUESTION_CONCURRENCY (8)
+            
+        Yields:
+            Question result dicts in completion order (see question_index for position)
+        """
+        semaphore = asyncio.Semaphore(cap or int(os.getenv("QUESTION_CONCURRENCY", "8")))
+        # Finished question tasks, plus the feeder task once the question source is exhausted
+        finished: asyncio.Queue = asyncio.Queue()
+        tasks: List[asyncio.Task] = []
+        
+        async def _fire(i: int, question: str) -> Dict:
+            async with semaphore:
+                return await self._handle_question_callback(
+                    question, i, deadline=session.t0_monotonic + SESSION_DEADLINE
+                )
+        
+        def _submit(question: str):
+            task = asyncio.create_task(_fire(len(tasks), question))
+            task.add_done_callback(finished.put_nowait)
+            tasks.append(task)
+        
+        async def _feed():
+            if isinstance(questions, list):
+                for question in questions:
+                    _submit(question)
+            else:
+                async for question in questions:
+                    _submit(question)
+        
+        feeder = asyncio.create_task(_feed())
+        feeder.add_done_callback(finished.put_nowait)
+        fed = False
+        completed = 0
+        try:
+            while not fed or completed < len(tasks):
+                task = await finished.get()
+                if task is feeder:
+                    # Re-raises a failure of the question source
+                    feeder.result()
+                    fed = True
+                    continue
+                result = task.result()
+                completed += 1
+                session.update_progress(questions_completed=completed)
+                yield result
+        finally:
+            # Stop outstanding questions if the consumer abandons the stream
+            feeder.cancel()
+            for task in tasks:
+                task.cancel()
+    
+    async def _pipeline_evaluate(self, questions: Union[List[str], AsyncIterator[str]], qa_index: Dict[int, Dict[str, str]], session: Session, judge_ai: JudgeAI) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Evaluate bot responses while the remaining questions are still in flight.
+        
+        A producer feeds finished question results into a bounded queue; a consumer
+        pulls up to PIPELINE_BATCH_SIZE of them (waiting at most PIPELINE_BATCH_WAIT
+        seconds for stragglers) and judges each chunk against the shared Q&A index.
+        A None sentinel marks the end of the producer.
+        
+        Args:
+            questions: Questions to send, their indexes are the qa_index keys. An async
+                stream must add each question's qa_index entry before yielding it.
+            qa_index: {question_index: qa_pair} evaluation references
+            session: Session whose progress is updated
+            judge_ai: Judge used for batch evaluation
+            
+        Returns:
+            Tuple of (test_results, evaluated_results), both in question order
+        """
+        batch_size = max(1, int(os.getenv("PIPELINE_BATCH_SIZE", "8")))
+        batch_wait = float(os.getenv("PIPELINE_BATCH_WAIT", "0.5"))
+        queue: asyncio.Queue = asyncio.Queue(maxsize=64)
+        test_results: Dict[int, Dict] = {}
+        evaluated_results: List[Dict] = []
+        # A streamed question count is only known from the progress the stream reports
+        known_total = len(questions) if isinstance(questions, list) else None
+        
+        async def _produce():
+            try:
+                async for result in self._fire_bounded(questions, session):
+                    test_results[result["question_index"]] = result
+                    await queue.put(result)
+            finally:
+                await queue.put(None)
+        
+        async def _consume():
+            loop = asyncio.get_running_loop()
+            done = False
+            while not done:
+                item = await queue.get()
+                if item is None:
+                    break
+                chunk = [item]
+                deadline = loop.time() + batch_wait
+                while len(chunk) < batch_size:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                    if item is None:
+                        done = True
+                        break
+                    chunk.append(item)
+                
+                evaluated_results.extend(await judge_ai.batch_evaluate(chunk, qa_index))
+                session.update_progress(
+                    evaluations_completed=len(evaluated_results),
+                    evaluation_progress=len(evaluated_results) / max(known_total or session.progress.questions_total, 1)
+                )
+        
+        producer = asyncio.create_task(_produce())
+        try:
+            await asyncio.gather(producer, _consume())
+        finally:
+            # A failed consumer must not leave the producer blocked on a full queue
+            producer.cancel()
+        evaluated_results.sort(key=lambda result: result.get("question_index", 0))
+        return [test_results[i] for i in sorted(test_results)], evaluated_results
+    
+    async def _collect_bounded(self, questions: List[str], session: Session) -> List[Dict]:
+        """Fire questions with bounded concurrency and return results in question order."""
+        test_results: List[Optional[Dict]] = [None] * len(questions)
+        async for result in self._fire_bounded(questions, session):
+            test_results[result["question_index"]] = result
+        return test_results
     
-    async def _handle_question_callback(self, question: str, question_index: int) -> Dict:
+    async def _handle_question_callback(self, question: str, question_index: int, session: Optional[Session] = None, deadline: Optional[float] = None) -> Dict:
         """
         Callback to handle individual question through GavinBot.
         """
+        started_ns = time.monotonic_ns()
         try:
             # Update progress
-            if self.current_session:
-                self.current_session["progress"]["questions_completed"] = question_index + 1
+            if session:
+                session.update_progress(questions_completed=question_index + 1)
             
-            logger.info(f"Getting GavinBot response for question {question_index + 1}")
+            logger.debug("Getting GavinBot response for question %d", question_index + 1)
             
             # Call the existing GavinBot handler
-            bot_response = await self._get_gavin_bot_response(question)
+            if deadline is None and session:
+                deadline = session.t0_monotonic + SESSION_DEADLINE
+            bot_response = await self._get_gavin_bot_response(question, deadline)
             
             return {
                 "question_index": question_index,
                 "question": question,
                 "bot_response": bot_response,
                 "timestamp": time.time(),
+                "latency_ms": (time.monotonic_ns() - started_ns) / 1e6,
                 "status": "success"
             }
             
         except Exception as e:
-            logger.error(f"Error getting bot response for question {question_index}: {e}")
+            logger.error("Error getting bot response for question %d: %s", question_index, e)
             return {
                 "question_index": question_index,
                 "question": question,
                 "bot_response": None,
                 "timestamp": time.time(),
+                "latency_ms": (time.monotonic_ns() - started_ns) / 1e6,
                 "status": "error",
                 "error": str(e)
             }
     
-    async def _get_gavin_bot_response(self, question: str) -> str:
+    async def _get_gavin_bot_response(self, question: str, deadline: Optional[float] = None) -> str:
         """
         Get response from GavinBot using existing chat handler.
+        
+        Identical questions already in flight share one handler call; when the
+        response cache is enabled, fresh replies from the in-process cache or the
+        shared SQLite store skip the handler entirely, as do replies to sufficiently
+        similar questions when the semantic cache is enabled.
+        Transient OpenAI failures are retried with backoff until the deadline
+        (a time.monotonic() value) would be passed.
         """
         try:
-            # Call the gavin_bot_handler with the correct message format
-            response = await self.gavin_bot_handler("gavinwood", {
-                "message": question,
-                "history": []
-            })
-            # Extract the actual message content from the response
-            if isinstance(response, dict) and "message" in response:
-                return response["message"]
-            elif isinstance(response, str):
-                return response
-            else:
-                logger.error(f"Unexpected response format: {response}")
-                return None
+            cache_key = hashlib.sha256(
+                orjson.dumps({"m": question, "p": "gavinwood"}, option=orjson.OPT_SORT_KEYS)
+            ).digest()
+            if RESPONSE_CACHE_ENABLED:
+                cached = _RESPONSE_CACHE.get(cache_key)
+                if cached:
+                    if time.monotonic() - cached[1] < RESPONSE_CACHE_TTL:
+                        self.response_cache_hits += 1
+                        return cached[0]
+                    del _RESPONSE_CACHE[cache_key]
+                if self._response_store:
+                    stored = await self._response_store.aget(cache_key)
+                    if stored:
+                        _RESPONSE_CACHE[cache_key] = (stored, time.monotonic())
+                        self.response_cache_hits += 1
+                        return stored
+                self.response_cache_misses += 1
+            
+            embedding = None
+            if self._semantic_cache:
+                try:
+                    embedding = await self._semantic_cache.embed(question)
+                except Exception as e:
+                    logger.warning("Semantic cache embedding failed, calling GavinBot directly: %s", e)
+                hit = self._semantic_cache.nearest(embedding) if embedding is not None else None
+                if hit:
+                    logger.info("Semantic cache hit (similarity %.3f) for question %r", hit[2], hit[0][:50])
+                    self.semantic_cache_hits += 1
+                    return hit[1]
+            
+            # Singleflight: wait on an identical in-flight request instead of duplicating it.
+            # If that request's own caller is cancelled, this caller makes the call itself.
+            while (inflight := _INFLIGHT.get(cache_key)) is not None:
+                logger.info("Joining in-flight GavinBot request for identical question")
+                try:
+                    return await asyncio.shield(inflight)
+                except _LeaderCancelled:
+                    logger.info("In-flight GavinBot request was cancelled by its caller, retrying")
+            
+            future = asyncio.get_running_loop().create_future()
+            # Mark the exception retrieved so an unawaited failure does not log a warning
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            _INFLIGHT[cache_key] = future
+            try:
+                message = await _retrying_call(
+                    lambda: self._throttled_bot_call(question), deadline=deadline, on_retry=self._count_bot_retry
+                )
+                future.set_result(message)
+            except asyncio.CancelledError:
+                # Joiners belong to other tasks (possibly other sessions) and must not
+                # inherit this cancellation, so they get a retryable error instead
+                future.set_exception(_LeaderCancelled())
+                raise
+            except Exception as e:
+                future.set_exception(e)
+                raise
+            finally:
+                _INFLIGHT.pop(cache_key, None)
+            
+            if RESPONSE_CACHE_ENABLED and message:
+                _RESPONSE_CACHE[cache_key] = (message, time.monotonic())
+                if self._response_store:
+                    self._response_store.set_in_background(cache_key, message)
+            if embedding is not None and message:
+                self._semantic_cache.put(embedding, question, message)
+            return message
             
         except Exception as e:
-            logger.error(f"Error getting GavinBot response: {e}")
+            logger.error("Error getting GavinBot response: %s", e)
             raise e
     
-    def get_session_status(self) -> Optional[Dict]:
+    def _count_bot_retry(self, attempt: int, error: BaseException):
+        """Tally GavinBot retries so retry storms show up in session status."""
+        self.bot_retries += 1
+    
+    async def _embed_question(self, question: str) -> List[float]:
+        """Embed a question for the semantic cache."""
+        response = await self.openai_client.embeddings.create(model=SEMANTIC_EMBED_MODEL, input=question)
+        return response.data[0].embedding
+    
+    async def _throttled_bot_call(self, question: str) -> Optional[str]:
+        """Call GavinBot once the shared concurrency, request and token budgets allow it."""
+        estimated_tokens = min(GAVIN_PROMPT_TOKEN_ESTIMATE + len(question) // 4, GAVIN_BOT_TPM)
+        await self._bot_tpm_limiter.acquire(estimated_tokens)
+        async with self._bot_rpm_limiter:
+            if self._batcher:
+                # The concurrency slot is taken per batch call, so queued questions don't cap the batch size
+                return await asyncio.wait_for(self._batcher.submit(question), GAVIN_BOT_TIMEOUT)
+            async with self._call_sem:
+                return await asyncio.wait_for(self._call_bot(question), GAVIN_BOT_TIMEOUT)
+    
+    async def _call_bot_batch(self, questions: List[str]) -> List[Optional[str]]:
+        """Send coalesced questions through the handler's batch entry point."""
+        async with self._call_sem:
+            replies = await self.gavin_bot_handler.batch("gavinwood", {"messages": questions})
+        return [reply["message"] if isinstance(reply, dict) else reply for reply in replies]
+    
+    async def _detect_bot_call(self, question: str) -> Optional[str]:
+        """
+        Call the GavinBot handler once and pick the reply extractor for its return shape.
+        
+        Handlers return either a dict with a "message" key or the reply string; later
+        calls go straight to the matching fast path, which still logs and returns None
+        for a reply of another shape (e.g. an error payload).
+        """
+        response = await self.gavin_bot_handler("gavinwood", {"message": question, "history": []})
+        if isinstance(response, dict) and "message" in response:
+            self._call_bot = self._call_bot_dict
+            return response["message"]
+        if isinstance(response, str):
+            self._call_bot = self._call_bot_str
+            return response
+        logger.error("Unexpected response format: %s", response)
+        return None
+    
+    async def _call_bot_dict(self, question: str) -> Optional[str]:
+        """Fast path for handlers returning {"message": ...}."""
+        response = await self.gavin_bot_handler("gavinwood", {"message": question, "history": []})
+        try:
+            return response["message"]
+        except (KeyError, TypeError):
+            logger.error("Unexpected response format: %s", response)
+            return None
+    
+    async def _call_bot_str(self, question: str) -> Optional[str]:
+        """Fast path for handlers returning the reply string."""
+        response = await self.gavin_bot_handler("gavinwood", {"message": question, "history": []})
+        if not isinstance(response, str):
+            logger.error("Unexpected response format: %s", response)
+            return None
+        return response
+    
+    async def _run_cpu(self, fn, *args):
+        """Run a CPU-bound call on the aggregation thread pool so the event loop stays responsive."""
+        return await asyncio.get_running_loop().run_in_executor(self._cpu_pool, functools.partial(fn, *args))
+    
+    def _next_session_id(self, session_type: str) -> int:
+        """Allocate a session id, from the session store when one is shared."""
+        if self._session_store:
+            try:
+                return self._session_store.allocate_id(session_type)
+            except Exception as e:
+                logger.error("Could not allocate session id from store: %s", e)
+        return self.session_id + 1
+    
+    def _store_session(self, session: Session):
+        """Register a new session, evicting the oldest beyond max_sessions."""
+        self._cache_session(session)
+        if self._session_store:
+            session.on_status_change = self._persist_session
+            session.reported_status = session.status
+            self._persist_session(session)
+    
+    def _cache_session(self, session: Session):
+        """Keep a session in the in-process LRU."""
+        self._sessions[session.session_id] = session
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+    
+    def _persist_session(self, session: Session):
+        """Encode a session on the event loop and write it to the session store in the background."""
+        state = {name: getattr(session, name) for name in _SESSION_STATE_FIELDS}
+        state["progress"] = session.progress
+        results = {name: getattr(session, name) for name in _SESSION_RESULT_FIELDS}
+        self._session_store.save_in_background(
+            session.session_id, session.session_type, to_json_bytes(state), to_json_bytes(results)
+        )
+    
+    def _restore_session(self, session_id: int) -> Optional[Session]:
+        """
+        Rebuild a session saved by this or another worker.
+        
+        Finished sessions are cached like local ones. A session still running
+        elsewhere is returned as its last saved snapshot, without results, and is
+        re-read on the next lookup.
+        """
+        record = self._session_store.load(session_id, include_results=False)
+        if record is None:
+            return None
+        finished = record["status"] in FINISHED_STATUSES
+        if finished:
+            record = self._session_store.load(session_id)
+            if record is None:
+                return None
+        results = record.pop("results", {})
+        progress_type = MultiTurnProgress if record["session_type"] == "multi_turn" else Progress
+        record["progress"] = progress_type(**record["progress"])
+        session = Session(**record, **results)
+        if finished:
+            self._cache_session(session)
+        return session
+    
+    def get_session(self, session_id: Optional[int] = None, multi_turn: bool = False) -> Optional[Session]:
+        """
+        Look up a session by id.
+        
+        Args:
+            session_id: Session to fetch; defaults to the latest session of the requested kind
+            multi_turn: Whether the default should be the latest multi-turn session
+            
+        Returns:
+            The Session, or None if it is unknown or has been evicted (and is not in the session store)
+        """
+        if session_id is None:
+            session_id = self._latest_multi_turn_id if multi_turn else self._latest_session_id
+        session = self._sessions.get(session_id)
+        if session is not None:
+            self._sessions.move_to_end(session_id)
+        elif session_id is not None and self._session_store:
+            session = self._restore_session(session_id)
+        return session
+    
+    async def cancel_session(self, session_id: Optional[int] = None, multi_turn: bool = False) -> Optional[Dict]:
         """
-        Get current session status and progress.
+        Cancel a running session, aborting its in-flight bot and judge calls.
+        
+        Cancelling the session's pipeline task propagates into every task it fans out
+        to; their HTTP requests are dropped and streamed judge responses are closed,
+        so no further tokens are generated or paid for.
+        
+        Args:
+            session_id: Session to cancel; defaults to the latest session of the requested kind
+            multi_turn: Whether this is a multi-turn session
+        
+        Returns:
+            Status after cancellation (as from get_session_status / get_multi_turn_status),
+            or None if unknown. Finished sessions and sessions running in another worker
+            are returned unchanged.
         """
-        if not self.current_session:
+        session = self.get_session(session_id, multi_turn=multi_turn)
+        if not session:
             return None
         
-        # Return a copy of current session state (excluding large data)
+        task = session.run_task
+        if task is not None and not task.done():
+            task.cancel()
+            # Wait for the pipeline to unwind so the returned status is final
+            await asyncio.wait({task})
+        
+        if multi_turn:
+            return self._multi_turn_view(session)
+        return self.get_session_status(session.session_id)
+    
+    async def wait_progress(self, session_id: Optional[int], since: int, timeout: float = 30, multi_turn: bool = False) -> Optional[Dict]:
+        """
+        Long-poll a session until its progress moves past a known version.
+        
+        Args:
+            session_id: Session to watch; defaults to the latest session of the requested kind
+            since: progress_version the caller already has
+            timeout: Maximum seconds to wait before returning the unchanged status
+            multi_turn: Whether this is a multi-turn session
+            
+        Returns:
+            Current status (as from get_session_status / get_multi_turn_status), or None if unknown
+        """
+        session = self.get_session(session_id, multi_turn=multi_turn)
+        if not session:
+            return None
+        
+        deadline = time.monotonic() + timeout
+        while session.progress_version == since and session.status not in FINISHED_STATUSES:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if self._is_remote(session):
+                session = await self._next_remote_snapshot(session, remaining)
+                continue
+            try:
+                await asyncio.wait_for(session.progress_event.wait(), remaining)
+            except asyncio.TimeoutError:
+                break
+        
+        if multi_turn:
+            return self._multi_turn_view(session)
+        return self.get_session_status(session.session_id)
+    
+    async def stream_progress(self, session_id: Optional[int], multi_turn: bool = False) -> AsyncIterator[Dict]:
+        """
+        Yield a session's status now and after every progress change until it finishes.
+        
+        Args:
+            session_id: Session to watch; defaults to the latest session of the requested kind
+            multi_turn: Whether this is a multi-turn session
+            
+        Yields:
+            Status dicts, as from get_session_status / get_multi_turn_status
+        """
+        session = self.get_session(session_id, multi_turn=multi_turn)
+        if not session:
+            return
+        
+        def view() -> Dict:
+            if multi_turn:
+                return self._multi_turn_view(session)
+            return self.get_session_status(session.session_id)
+        
+        queue: asyncio.Queue = asyncio.Queue(maxsize=PROGRESS_STREAM_BUFFER)
+        subscribed = session
+        subscribed.progress_subscribers.append(queue)
+        try:
+            yield view()
+            while session.status not in FINISHED_STATUSES:
+                if self._is_remote(session):
+                    version = session.progress_version
+                    session = await self._next_remote_snapshot(session, REMOTE_SESSION_POLL_INTERVAL)
+                    if session.progress_version == version:
+                        continue
+                else:
+                    await queue.get()
+                    # Collapse a backlog of events into one status carrying the latest snapshot
+                    while not queue.empty():
+                        queue.get_nowait()
+                yield view()
+        finally:
+            subscribed.progress_subscribers.remove(queue)
+    
+    def _is_remote(self, session: Session) -> bool:
+        """Whether a session is a store snapshot of one running in another worker."""
+        return self._session_store is not None and self._sessions.get(session.session_id) is not session
+    
+    async def _next_remote_snapshot(self, session: Session, wait: float) -> Session:
+        """Wait up to one poll interval, then re-read a remotely running session from the store."""
+        await asyncio.sleep(min(REMOTE_SESSION_POLL_INTERVAL, wait))
+        return self._restore_session(session.session_id) or session
+    
+    def get_session_status(self, session_id: Optional[int] = None) -> Optional[Dict]:
+        """
+        Get session status and progress; defaults to the latest stress-test/content session.
+        """
+        session = self.get_session(session_id)
+        if not session:
+            return None
+        
+        # Current session state (excluding large data); progress is the shared immutable
+        # snapshot, which to_json_bytes encodes directly as a dataclass
         status = {
-            "session_id": self.current_session["session_id"],
-            "session_name": self.current_session["session_name"],
-            "status": self.current_session["status"],
-            "progress": self.current_session["progress"].copy(),
-            "start_time": self.current_session["start_time"],
-            "evaluation_method": "bleurt_only"
+            "session_id": session.session_id,
+            "session_name": session.session_name,
+            "status": session.status,
+            "progress": session.progress,
+            "progress_version": session.progress_version,
+            "start_time": session.start_time,
+            "evaluation_method": "bleurt_only",
+            "judge_batch": {"id": session.batch_id, "status": session.batch_status} if session.batch_id else None,
+            "response_cache": {
+                "enabled": RESPONSE_CACHE_ENABLED,
+                "hits": self.response_cache_hits,
+                "misses": self.response_cache_misses,
+                "semantic_hits": self.semantic_cache_hits
+            },
+            "bot_retries": self.bot_retries
         }
         
-        if "end_time" in self.current_session:
-            status["end_time"] = self.current_session["end_time"]
-            status["duration"] = self.current_session["duration"]
+        if session.end_time is not None:
+            status["end_time"] = session.end_time
+            status["duration"] = session.duration
         
-        if "aggregate_metrics" in self.current_session:
-            status["aggregate_metrics"] = self.current_session["aggregate_metrics"]
-            
-            # Add BLEURT summary for BLEURT-only transcript tests
-            if status["aggregate_metrics"].get("evaluation_method") == "bleurt_only":
-                status["bleurt_summary"] = {
-                    "avg_bleurt_score": status["aggregate_metrics"].get("avg_bleurt_score", 0.0),
-                    "pass_rate": status["aggregate_metrics"].get("pass_rate", 0.0),
-                    "total_evaluations": status["aggregate_metrics"].get("successful_responses", 0),
-                    "score_range": f"{status['aggregate_metrics'].get('min_bleurt_score', 0):.2f} - {status['aggregate_metrics'].get('max_bleurt_score', 0):.2f}"
-                }
+        status["aggregate_metrics"] = session.aggregate_metrics
         
-        if "error" in self.current_session:
-            status["error"] = self.current_session["error"]
+        # Add BLEURT summary for BLEURT-only transcript tests
+        if status["aggregate_metrics"].get("evaluation_method") == "bleurt_only":
+            status["bleurt_summary"] = {
+                "avg_bleurt_score": status["aggregate_metrics"].get("avg_bleurt_score", 0.0),
+                "pass_rate": status["aggregate_metrics"].get("pass_rate", 0.0),
+                "total_evaluations": status["aggregate_metrics"].get("successful_responses", 0),
+                "score_range": f"{status['aggregate_metrics'].get('min_bleurt_score', 0):.2f} - {status['aggregate_metrics'].get('max_bleurt_score', 0):.2f}"
+            }
+        
+        if session.error is not None:
+            status["error"] = session.error
         
         return status
     
-    def get_detailed_results(self) -> Optional[Dict]:
+    def get_detailed_results(self, session_id: Optional[int] = None) -> Optional[Dict]:
         """
-        Get detailed test results for completed session.
+        Get detailed test results for a completed session; defaults to the latest one.
         """
-        if not self.current_session or self.current_session["status"] not in ["completed", "failed"]:
+        session = self.get_session(session_id)
+        if not session or session.status not in FINISHED_STATUSES:
             return None
         
         # Get base results
         results = {
-            "session_info": self.get_session_status(),
-            "qa_pairs": self.current_session.get("qa_pairs", []),
-            "evaluated_results": self.current_session.get("evaluated_results", []),
-            "aggregate_metrics": self.current_session.get("aggregate_metrics", {})
+            "session_info": self.get_session_status(session.session_id),
+            "transcript_sha256": session.transcript_sha256,
+            "content_sha256": session.content_sha256,
+            "qa_pairs": session.qa_pairs,
+            "evaluated_results": session.evaluated_results,
+            "aggregate_metrics": session.aggregate_metrics
         }
         
         # No MT-Bench analysis for transcript tests (using legacy + BLEURT only)
+        if session.session_type == "content_analysis":
+            results["mt_bench_analysis"] = self._extract_mt_bench_analysis(session)
         
         return results
     
-    def _extract_mt_bench_analysis(self) -> Dict:
+    @staticmethod
+    def _mt_bench_table(evaluated_results: List[Dict]) -> EvalTable:
+        """
+        Split MT-Bench evaluated results into rows and numeric column arrays in one pass.
+        
+        Args:
+            evaluated_results: Evaluated result dicts from JudgeAI.batch_evaluate
+            
+        Returns:
+            EvalTable covering only results judged with MT-Bench
+        """
+        rows: List[EvalRow] = []
+        numeric: List[Tuple[float, ...]] = []
+        for i, result in enumerate(evaluated_results):
+            eval_data = result.get("evaluation") or {}
+            if eval_data.get("evaluation_method") != "mt_bench":
+                continue
+            reasoning = eval_data.get("reasoning", {})
+            dim_scores = eval_data.get("mt_bench_scores", {})
+            rows.append(EvalRow(
+                question_index=i,
+                question=result.get("question", ""),
+                bot_response=result.get("bot_response", ""),
+                expected_answer=result.get("expected_answer", ""),
+                reasoning=reasoning,
+                strengths=reasoning.get("strengths", []),
+                weaknesses=reasoning.get("weaknesses", [])
+            ))
+            numeric.append((
+                eval_data.get("overall_score", 0.0),
+                *(dim_scores.get(dim, 0.0) for dim in MT_BENCH_DIMENSIONS),
+                eval_data.get("content_similarity", 0.0),
+                eval_data.get("style_fidelity", 0.0),
+                eval_data.get("confidence", 0.0)
+            ))
+        
+        matrix = np.array(numeric, dtype=np.float64).reshape(len(numeric), len(MT_BENCH_DIMENSIONS) + 4)
+        dims_end = 1 + len(MT_BENCH_DIMENSIONS)
+        return EvalTable(
+            rows=rows,
+            overall_score=matrix[:, 0],
+            dimension_scores=matrix[:, 1:dims_end],
+            content_similarity=matrix[:, dims_end],
+            style_fidelity=matrix[:, dims_end + 1],
+            confidence=matrix[:, dims_end + 2]
+        )
+    
+    def _extract_mt_bench_analysis(self, session: Session) -> Dict:
         """
         Extract detailed MT-Bench analysis for dashboard display.
+        
+        The analysis is memoized on the session; evaluated_results is only replaced
+        or appended to, so its identity, length and the session status identify it.
+        Callers share the returned dict and must not mutate it.
         """
-        evaluated_results = self.current_session.get("evaluated_results", [])
-        aggregate_metrics = self.current_session.get("aggregate_metrics", {})
+        key = (id(session.evaluated_results), len(session.evaluated_results), session.status)
+        if session.mt_bench_analysis is not None and session.mt_bench_analysis[0] == key:
+            return session.mt_bench_analysis[1]
         
-        # Extract individual MT-Bench evaluations
-        mt_bench_evaluations = []
-        for i, result in enumerate(evaluated_results):
-            if result.get("evaluation", {}).get("evaluation_method") == "mt_bench":
-                eval_data = result["evaluation"]
-                mt_bench_evaluations.append({
-                    "question_index": i,
-                    "question": result.get("question", ""),
-                    "bot_response": result.get("bot_response", ""),
-                    "expected_answer": result.get("expected_answer", ""),
-                    "overall_score": eval_data.get("overall_score", 0.0),
-                    "dimension_scores": eval_data.get("mt_bench_scores", {}),
-                    "content_similarity": eval_data.get("content_similarity", 0.0),
-                    "style_fidelity": eval_data.get("style_fidelity", 0.0),
-                    "confidence": eval_data.get("confidence", 0.0),
-                    "reasoning": eval_data.get("reasoning", {}),
-                    "strengths": eval_data.get("reasoning", {}).get("strengths", []),
-                    "weaknesses": eval_data.get("reasoning", {}).get("weaknesses", [])
-                })
-        
-        # Calculate dimension breakdowns
+        aggregate_metrics = session.aggregate_metrics
+        table = self._mt_bench_table(session.evaluated_results)
+        
+        # Plain Python values for the JSON payload, converted once per column
+        overall = table.overall_score.tolist()
+        dim_columns = table.dimension_scores.T.tolist()
+        dim_rows = table.dimension_scores.tolist()
+        content_similarity = table.content_similarity.tolist()
+        style_fidelity = table.style_fidelity.tolist()
+        confidence = table.confidence.tolist()
+        
+        mt_bench_evaluations = [
+            {
+                "question_index": row.question_index,
+                "question": row.question,
+                "bot_response": row.bot_response,
+                "expected_answer": row.expected_answer,
+                "overall_score": overall[k],
+                "dimension_scores": dict(zip(MT_BENCH_DIMENSIONS, dim_rows[k])),
+                "content_similarity": content_similarity[k],
+                "style_fidelity": style_fidelity[k],
+                "confidence": confidence[k],
+                "reasoning": row.reasoning,
+                "strengths": row.strengths,
+                "weaknesses": row.weaknesses
+            }
+            for k, row in enumerate(table.rows)
+        ]
+        
+        # Calculate dimension breakdowns; pass rates and ranges for every dimension come from one pass
         dimension_breakdown = {}
-        if aggregate_metrics.get("dimension_averages"):
-            for dim_key, avg_score in aggregate_metrics["dimension_averages"].items():
-                dim_name = dim_key.replace("avg_", "")
+        dimension_averages = aggregate_metrics.get("dimension_averages")
+        if dimension_averages:
+            question_indexes = [row.question_index for row in table.rows]
+            _, dim_pass_rates, dim_mins, dim_maxs = dimension_stats(table.dimension_scores, PASS_THRESHOLD)
+            dim_pass_rates, dim_mins, dim_maxs = dim_pass_rates.tolist(), dim_mins.tolist(), dim_maxs.tolist()
+            for j, dim_name in enumerate(MT_BENCH_DIMENSIONS):
                 dimension_breakdown[dim_name] = {
-                    "average_score": avg_score,
-                    "description": self._get_dimension_description(dim_name),
+                    "average_score": dimension_averages.get(f"avg_{dim_name}", 0.0),
+                    "pass_rate": dim_pass_rates[j],
+                    "min_score": dim_mins[j],
+                    "max_score": dim_maxs[j],
+                    "description": MT_BENCH_DIMENSION_DESCRIPTIONS[dim_name],
                     "individual_scores": [
-                        {
-                            "question_index": eval["question_index"],
-                            "score": eval["dimension_scores"].get(dim_name, 0.0)
-                        }
-                        for eval in mt_bench_evaluations
+                        {"question_index": index, "score": score}
+                        for index, score in zip(question_indexes, dim_columns[j])
                     ]
                 }
         
+        score_percentiles = {}
+        if table.rows:
+            p25, p50, p75 = np.percentile(table.overall_score, (25, 50, 75)).tolist()
+            score_percentiles = {"p25": p25, "p50": p50, "p75": p75}
+        
         result = {
             "evaluation_method": "mt_bench",
-            "total_evaluations": len(mt_bench_evaluations),
+            "total_evaluations": len(table.rows),
             "individual_evaluations": mt_bench_evaluations,
             "dimension_breakdown": dimension_breakdown,
             "score_distribution": aggregate_metrics.get("score_distribution", {}),
+            "score_percentiles": score_percentiles,
             "common_strengths": aggregate_metrics.get("common_strengths", []),
             "common_weaknesses": aggregate_metrics.get("common_weaknesses", []),
             "pass_rate": aggregate_metrics.get("pass_rate", 0.0),
             "average_overall_score": aggregate_metrics.get("avg_overall_score", 0.0)
         }
         
-        logger.info(f"  MT-Bench analysis result: {result}")
+        logger.debug("  MT-Bench analysis result: %s", result)
+        session.mt_bench_analysis = (key, result)
         return result
     
     def _get_dimension_description(self, dimension: str) -> str:
         """Get human-readable description of MT-Bench dimensions."""
-        descriptions = {
-            "relevance": "How well the response addresses the question",
-            "accuracy": "Factual correctness and reliability of information",
-            "clarity": "Clear, well-structured, and easy to understand",
-            "depth": "Sufficient detail and insight provided",
-            "helpfulness": "Useful and actionable response"
-        }
-        return descriptions.get(dimension, f"Score for {dimension}")
+        return MT_BENCH_DIMENSION_DESCRIPTIONS.get(dimension, f"Score for {dimension}")
 
     async def start_multi_turn_test(self, messages: List[Dict[str, str]], session_name: str = None) -> Dict:
         """
         Start a multi-turn test session.
         Returns session info and begins async processing.
         """
-        self.session_id += 1
-        session_name = session_name or f"MultiTurn_{self.session_id}_{int(time.time())}"
+        self.session_id = self._next_session_id("multi_turn")
+        now = time.time()
+        session_name = session_name or f"MultiTurn_{self.session_id}_{int(now)}"
         
-        logger.info(f"Starting multi-turn test session: {session_name}")
+        logger.info("Starting multi-turn test session: %s", session_name)
         logger.info("Multi-turn test uses MT-Bench evaluation only (BLEURT is for transcript tests)")
         
         # Initialize session state
-        self.current_multi_turn_session = {
-            "session_id": self.session_id,
-            "session_name": session_name,
-            "status": "processing",
-            "start_time": time.time(),
-            "messages": messages,
-            "responses": [],
-            "evaluations": [],
-            "aggregate_metrics": {},
-            "progress": {
-                "current_step": "processing",
-                "total_messages": len(messages),
-                "processed_messages": 0
-            }
-        }
+        session = Session(
+            session_id=self.session_id,
+            session_name=session_name,
+            session_type="multi_turn",
+            status="processing",
+            start_time=now,
+            messages=messages,
+            progress=MultiTurnProgress(
+                current_step="processing",
+                total_messages=sum(1 for message in messages if message["role"] == "user")
+            )
+        )
+        self._store_session(session)
+        self._latest_multi_turn_id = session.session_id
         
         # Start async processing
-        asyncio.create_task(self._run_multi_turn_test_async())
+        session.run_task = asyncio.create_task(self._run_multi_turn_test_async(session))
         
         return {
             "session_id": self.session_id,
@@ -460,131 +1446,186 @@ class AnalyzeOrchestrator:
             "message": "Multi-turn test initiated. Check dashboard for progress."
         }
 
-    async def _run_multi_turn_test_async(self):
+    async def _run_multi_turn_test_async(self, session: Session):
         """
         Run the multi-turn test pipeline asynchronously.
         """
         try:
-            session = self.current_multi_turn_session
-            
-            # Process each message and get bot response
-            for i, message in enumerate(session["messages"]):
-                if message["role"] == "user":
-                    # Get bot response
-                    bot_response = await self._get_gavin_bot_response(message["content"])
-                    
-                    # Evaluate response using MT-Bench for multi-turn
-                    evaluation = await self.judge_ai_multiturn.evaluate_multi_turn_response(
-                        user_message=message["content"],
-                        bot_response=bot_response,
-                        conversation_history=session["messages"][:i]
+            messages = session.messages
+            
+            # Each user turn only reads the scripted history before it, so turns run concurrently
+            semaphore = asyncio.Semaphore(int(os.getenv("MULTI_TURN_CONCURRENCY", "8")))
+            
+            async def _process_turn(i: int, message: Dict[str, str]) -> Dict:
+                # The semaphore only bounds GavinBot calls; judge calls are throttled by the
+                # evaluator, and releasing the slot first lets more turns share a fused batch
+                async with semaphore:
+                    bot_response = await self._get_gavin_bot_response(
+                        message["content"], session.t0_monotonic + SESSION_DEADLINE
                     )
-                    
-                    # Store results
-                    session["responses"].append({
-                        "user_message": message["content"],
-                        "bot_response": bot_response,
-                        "evaluation": evaluation
-                    })
-                    
-                    # Update progress
-                    session["progress"]["processed_messages"] = i + 1
+                
+                # Evaluate response using MT-Bench for multi-turn, batched with concurrent turns
+                evaluation = await self._judge_batcher.add_request(
+                    user_message=message["content"],
+                    bot_response=bot_response,
+                    conversation_history=messages[:i]
+                )
+                
+                # Update progress
+                session.update_progress(processed_messages=session.progress.processed_messages + 1)
+                return {
+                    "user_message": message["content"],
+                    "bot_response": bot_response,
+                    "evaluation": evaluation
+                }
+            
+            # Tasks are kept in message order, so responses line up with the conversation;
+            # the task group cancels the remaining turns as soon as one of them fails
+            async with asyncio.TaskGroup() as turns:
+                tasks = [
+                    turns.create_task(_process_turn(i, message))
+                    for i, message in enumerate(messages)
+                    if message["role"] == "user"
+                ]
+            session.responses = [task.result() for task in tasks]
+            session.update_progress(processed_messages=len(session.responses))
             
             # Calculate aggregate metrics using MT-Bench
-            session["aggregate_metrics"] = self.judge_ai_multiturn.calculate_multi_turn_metrics(session["responses"])
+            session.aggregate_metrics = await self._run_cpu(self.judge_ai_multiturn.calculate_multi_turn_metrics, session.responses)
             
             # Complete
-            session["status"] = "completed"
-            session["end_time"] = time.time()
-            session["duration"] = session["end_time"] - session["start_time"]
-            session["progress"]["current_step"] = "completed"
+            session.status = "completed"
+            session.end_time = time.time()
+            session.duration = time.monotonic() - session.t0_monotonic
+            session.update_progress(current_step="completed")
             
-            logger.info(f"Multi-turn test completed successfully. Overall score: {session['aggregate_metrics'].get('avg_overall_score', 0):.2f}")
+            logger.info("Multi-turn test completed successfully. Overall score: %.2f", session.aggregate_metrics.get('avg_overall_score', 0))
             
+        except asyncio.CancelledError:
+            self._mark_cancelled(session)
+            raise
         except Exception as e:
-            logger.error(f"Multi-turn test failed: {e}")
-            if self.current_multi_turn_session:
-                self.current_multi_turn_session["status"] = "failed"
-                self.current_multi_turn_session["error"] = str(e)
-                self.current_multi_turn_session["end_time"] = time.time()
+            if isinstance(e, ExceptionGroup):
+                e = e.exceptions[0]
+            logger.error("Multi-turn test failed: %s", e)
+            session.status = "failed"
+            session.error = str(e)
+            session.end_time = time.time()
+            session.update_progress()
 
-    def get_multi_turn_status(self) -> Optional[Dict]:
-        """Get current multi-turn test session status."""
-        if not self.current_multi_turn_session:
+    def get_multi_turn_status(self, session_id: Optional[int] = None) -> Optional[Dict]:
+        """Get multi-turn test session status; defaults to the latest multi-turn session."""
+        session = self.get_session(session_id, multi_turn=True)
+        if not session:
             return None
-        return self.current_multi_turn_session
+        return self._multi_turn_view(session)
 
-    def get_multi_turn_results(self) -> Optional[Dict]:
-        """Get detailed results from completed multi-turn test session."""
-        if not self.current_multi_turn_session or self.current_multi_turn_session["status"] != "completed":
+    def get_multi_turn_results(self, session_id: Optional[int] = None) -> Optional[Dict]:
+        """Get detailed results from a completed multi-turn test session."""
+        session = self.get_session(session_id, multi_turn=True)
+        if not session or session.status != "completed":
             return None
-        return self.current_multi_turn_session 
+        return self._multi_turn_view(session)
 
-    async def _run_content_analysis_async(self):
+    def _multi_turn_view(self, session: Session) -> Dict:
+        """Serialize a multi-turn session for the API."""
+        view = {
+            "session_id": session.session_id,
+            "session_name": session.session_name,
+            "status": session.status,
+            "start_time": session.start_time,
+            "messages": session.messages,
+            "responses": session.responses,
+            "evaluations": session.evaluations,
+            "aggregate_metrics": session.aggregate_metrics,
+            "progress": session.progress,
+            "progress_version": session.progress_version
+        }
+        if session.end_time is not None:
+            view["end_time"] = session.end_time
+        if session.duration is not None:
+            view["duration"] = session.duration
+        if session.error is not None:
+            view["error"] = session.error
+        return view
+
+    async def _run_content_analysis_async(self, session: Session):
         """
         Run the complete content analysis pipeline asynchronously.
         """
         try:
-            session = self.current_session
-            
             # Step 1: Parse content and generate questions
             logger.info("Step 1: Parsing content for questions...")
-            session["status"] = "parsing_content"
-            session["progress"]["current_step"] = "parsing_content"
+            session.status = "parsing_content"
+            session.update_progress(current_step="parsing_content")
             
-            qa_pairs = await self.tester_ai.parse_content_for_analysis(session["content_text"])
-            session["qa_pairs"] = qa_pairs
+            content_text = session.content_text
+            session.content_sha256 = hashlib.sha256(content_text.encode()).hexdigest()
+            session.content_text = None
+            qa_pairs = await self._cached_parse(
+                "content", session.content_sha256, content_text, self.tester_ai.parse_content_for_analysis
+            )
+            del content_text
+            session.qa_pairs = qa_pairs
             
             if not qa_pairs:
-                session["status"] = "failed"
-                session["error"] = "No questions generated from content"
+                session.status = "failed"
+                session.error = "No questions generated from content"
+                session.update_progress()
                 return
             
             # Step 2: Extract questions for testing
             logger.info("Step 2: Extracting questions...")
             questions = await self.tester_ai.extract_questions_from_qa_pairs(qa_pairs)
-            session["questions"] = questions
-            session["progress"]["questions_total"] = len(questions)
+            session.questions = questions
+            session.update_progress(questions_total=len(questions))
             
-            # Step 3: Fire questions sequentially and get bot responses
+            # Step 3: Fire questions with bounded concurrency and get bot responses
             logger.info("Step 3: Testing bot responses...")
-            session["status"] = "testing_responses"
-            session["progress"]["current_step"] = "testing_responses"
+            session.status = "testing_responses"
+            session.update_progress(current_step="testing_responses")
             
-            test_results = await self.tester_ai.fire_questions_sequentially(
-                questions, 
-                self._handle_question_callback
-            )
-            session["test_results"] = test_results
+            test_results = await self._collect_bounded(questions, session)
+            session.test_results = test_results
             
             # Step 4: Evaluate responses
             logger.info("Step 4: Evaluating responses...")
-            session["status"] = "evaluating_responses"
-            session["progress"]["current_step"] = "evaluating_responses"
+            session.status = "evaluating_responses"
+            session.update_progress(current_step="evaluating_responses")
             
-            evaluated_results = await self.judge_ai.batch_evaluate(test_results, qa_pairs)
-            session["evaluated_results"] = evaluated_results
-            session["progress"]["evaluations_completed"] = len(evaluated_results)
+            evaluated_results = await self.judge_ai_multiturn.batch_evaluate(
+                test_results, dict(enumerate(qa_pairs)),
+                use_batch_api=JUDGE_USE_BATCH_API,
+                on_batch_status=functools.partial(self._record_batch_status, session)
+            )
+            session.evaluated_results = evaluated_results
+            session.update_progress(evaluations_completed=len(evaluated_results))
             
             # Step 5: Calculate aggregate metrics
             logger.info("Step 5: Calculating metrics...")
-            session["status"] = "calculating_metrics"
-            session["progress"]["current_step"] = "calculating_metrics"
+            session.status = "calculating_metrics"
+            session.update_progress(current_step="calculating_metrics")
             
-            aggregate_metrics = self.judge_ai.calculate_aggregate_metrics(evaluated_results)
-            session["aggregate_metrics"] = aggregate_metrics
+            aggregate_metrics = await self._run_cpu(self.judge_ai_multiturn.calculate_aggregate_metrics, evaluated_results)
+            session.aggregate_metrics = aggregate_metrics
             
             # Complete
-            session["status"] = "completed"
-            session["end_time"] = time.time()
-            session["duration"] = session["end_time"] - session["start_time"]
-            session["progress"]["current_step"] = "completed"
+            session.status = "completed"
+            session.end_time = time.time()
+            session.duration = time.monotonic() - session.t0_monotonic
+            if len(evaluated_results) > MT_BENCH_PREWARM_THRESHOLD:
+                # Memoize the dashboard analysis before announcing completion
+                await self._run_cpu(self._extract_mt_bench_analysis, session)
+            session.update_progress(current_step="completed")
             
-            logger.info(f"Content analysis completed successfully. Overall score: {aggregate_metrics.get('avg_overall_score', 0):.2f}")
+            logger.info("Content analysis completed successfully. Overall score: %.2f", aggregate_metrics.get('avg_overall_score', 0))
             
+        except asyncio.CancelledError:
+            self._mark_cancelled(session)
+            raise
         except Exception as e:
-            logger.error(f"Content analysis failed: {e}")
-            if self.current_session:
-                self.current_session["status"] = "failed"
-                self.current_session["error"] = str(e)
-                self.current_session["end_time"] = time.time() 
\ No newline at end of file
+            logger.error("Content analysis failed: %s", e)
+            session.status = "failed"
+            session.error = str(e)
+            session.end_time = time.time()
+            session.update_progress() 
\ No newline at end of file
@@ -0,0 +1,82 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from .sqlite_store import SQLiteConnection
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+    logger.info("zstandard not available; response store will keep replies uncompressed")
+
+class ResponseStore:
+    """
+    SQLite-backed L2 cache for GavinBot replies, shared across workers and restarts.
+    
+    Rows are keyed by the same SHA-256 digest as the in-process cache. Replies are
+    zstd-compressed when zstandard is installed and stored as plain text otherwise;
+    both forms are readable regardless of which one wrote them.
+    """
+    
+    def __init__(self, path: str, ttl: float, compress: bool = True):
+        self.path = path
+        self.ttl = ttl
+        self._compressor = zstandard.ZstdCompressor(level=3) if compress and ZSTD_AVAILABLE else None
+        self._decompressor = zstandard.ZstdDecompressor() if ZSTD_AVAILABLE else None
+        self._db = SQLiteConnection(path, "CREATE TABLE IF NOT EXISTS responses (key BLOB PRIMARY KEY, resp TEXT, ts REAL)")
+        
+        logger.info(f"ResponseStore opened at {path} (ttl={ttl}s, compressed={self._compressor is not None})")
+    
+    def get(self, key: bytes) -> Optional[str]:
+        """
+        Look up a stored reply.
+        
+        Args:
+            key: Cache key digest
+        
+        Returns:
+            The reply, or None if missing, expired or unreadable
+        """
+        try:
+            row = self._db.fetchone("SELECT resp, ts FROM responses WHERE key = ?", (key,))
+            if row is None or time.time() - row[1] >= self.ttl:
+                return None
+            resp = row[0]
+            if isinstance(resp, bytes):
+                if self._decompressor is None:
+                    return None
+                resp = self._decompressor.decompress(resp).decode("utf-8")
+            return resp
+        except Exception as e:
+            logger.error(f"Error reading response store: {e}")
+            return None
+    
+    def set(self, key: bytes, resp: str):
+        """
+        Store a reply; failures are logged and otherwise ignored.
+        
+        Args:
+            key: Cache key digest
+            resp: Reply text
+        """
+        try:
+            value = self._compressor.compress(resp.encode("utf-8")) if self._compressor else resp
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, resp, ts) VALUES (?, ?, ?)",
+                (key, value, time.time())
+            )
+        except Exception as e:
+            logger.error(f"Error writing response store: {e}")
+    
+    async def aget(self, key: bytes) -> Optional[str]:
+        """Async get() that runs the SQLite read in the default executor."""
+        return await asyncio.get_running_loop().run_in_executor(None, self.get, key)
+    
+    def set_in_background(self, key: bytes, resp: str):
+        """Schedule set() in the default executor without waiting for the write."""
+        asyncio.get_running_loop().run_in_executor(None, self.set, key, resp)
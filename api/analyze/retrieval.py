@@ -1,36 +1,125 @@
 """Retrieval utilities for context search using spaCy embeddings and Mem0."""
 
+import asyncio
+import copy
+import functools
 import logging
-from typing import List, Dict, Any, Optional
+import os
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 
-from spacy_pipeline import get_nlp
+import numpy as np
+
+from dynamic_batcher import AsyncDynamicBatcher
+from spacy_pipeline import get_nlp_vector_only, SPACY_BATCH_SIZE
+from vector_index import INDEX_BACKENDS, LazyHits, VectorIndex
 
 logger = logging.getLogger(__name__)
 
+# Index written by ingest_corpus.py --index; empty or missing uses Mem0 similarity_search
+RETRIEVAL_INDEX_PATH = os.getenv("RETRIEVAL_INDEX_PATH", "")
+# Index type at RETRIEVAL_INDEX_PATH: "hnsw" or "ivfpq" (approximate), "brute" (exact scan)
+# or "brute_int8" (scan over int8-quantized vectors; also reads "brute" files)
+RETRIEVAL_BACKEND = os.getenv("RETRIEVAL_BACKEND", "hnsw").lower()
+# Index-served results kept per (whitespace-stripped query, k); 0 disables the cache
+RETRIEVAL_CACHE_SIZE = int(os.getenv("RETRIEVAL_CACHE_SIZE", "1024"))
+
 # Global pipeline instance for efficiency
 _nlp_pipeline = None
 _mem0_client = None
+_ann_index: Optional[VectorIndex] = None
+
+# LRU of (hits, query tone) for queries answered by the ANN index. Only index results
+# are cached: the index is fixed once loaded, while a Mem0 store keeps changing.
+_retrieval_cache: "OrderedDict[Tuple, Tuple[LazyHits, Dict[str, Any]]]" = OrderedDict()
+_retrieval_cache_lock = threading.Lock()
+_retrieval_cache_hits = 0
+
 
+def _retrieval_cache_get(key: Tuple) -> Optional[Tuple[LazyHits, Dict[str, Any]]]:
+    """Look up cached index results and mark them as recently used."""
+    global _retrieval_cache_hits
+    with _retrieval_cache_lock:
+        cached = _retrieval_cache.get(key)
+        if cached is None:
+            return None
+        _retrieval_cache.move_to_end(key)
+        _retrieval_cache_hits += 1
+    hits, tone = cached
+    return hits, copy.deepcopy(tone)
 
-def initialize_retrieval(mem0_client=None) -> None:
-    """Initialize retrieval system with Mem0 client and spaCy pipeline.
+
+def _retrieval_cache_put(key: Tuple, hits: LazyHits, tone: Dict[str, Any]) -> None:
+    """Remember index results, evicting the oldest beyond RETRIEVAL_CACHE_SIZE."""
+    if RETRIEVAL_CACHE_SIZE <= 0:
+        return
+    with _retrieval_cache_lock:
+        _retrieval_cache[key] = (hits, copy.deepcopy(tone))
+        _retrieval_cache.move_to_end(key)
+        while len(_retrieval_cache) > RETRIEVAL_CACHE_SIZE:
+            _retrieval_cache.popitem(last=False)
+
+
+def initialize_retrieval(mem0_client=None, index_path: Optional[str] = None, backend: Optional[str] = None) -> None:
+    """Initialize retrieval system with Mem0 client, spaCy pipeline and ANN index.
     
     Args:
         mem0_client: Mem0 client instance for similarity search
+        index_path: ANN index to search instead of the client (default: RETRIEVAL_INDEX_PATH)
+        backend: "hnsw", "ivfpq", "brute" or "brute_int8" (default: RETRIEVAL_BACKEND)
     """
-    global _nlp_pipeline, _mem0_client
+    global _nlp_pipeline, _mem0_client, _ann_index
     
     if _nlp_pipeline is None:
         logger.info("Initializing spaCy pipeline for retrieval...")
-        _nlp_pipeline = get_nlp(mem0_client=None)  # Don't need VectorExporter for queries
+        # Queries only need doc.vector, so no model component runs on them
+        _nlp_pipeline = get_nlp_vector_only()
         logger.info(f"Pipeline initialized with components: {_nlp_pipeline.pipe_names}")
     
     _mem0_client = mem0_client
     logger.info(f"Mem0 client {'set' if mem0_client else 'not set'}")
+    
+    index_path = index_path if index_path is not None else RETRIEVAL_INDEX_PATH
+    backend = (backend or RETRIEVAL_BACKEND).lower()
+    if _ann_index is None and index_path:
+        index_class, available = INDEX_BACKENDS.get(backend, (None, False))
+        if index_class is None:
+            logger.warning(f"Unknown retrieval backend {backend!r}; using Mem0 similarity search")
+        elif not available:
+            logger.warning(f"The {backend} backend's library is not installed; ignoring {index_path}")
+        elif not os.path.exists(index_path):
+            logger.warning(f"ANN index not found at {index_path}; using Mem0 similarity search")
+        else:
+            try:
+                _ann_index = index_class.restore(index_path)
+                _retrieval_cache.clear()
+            except Exception as e:
+                logger.error(f"Failed to restore {backend} index from {index_path}: {e}")
+
+
+def _ann_search(vector, k: int, filters: Optional[Dict[str, Any]] = None) -> LazyHits:
+    """Search the ANN index; hits have the same shape as Mem0 similarity_search results."""
+    return _ann_index.search(vector, k, filters)
+
+
+def _filtered_cache_key(query: str, k: int, filters: Optional[Dict[str, Any]]) -> Optional[Tuple]:
+    """Retrieval cache key for a filtered query, or None when a filter value is unhashable."""
+    if not filters:
+        return (query, k)
+    key = (query, k, tuple(sorted(filters.items())))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
 
 
 def retrieve_context(query: str, k: int = 8, mem0_client: Optional[Any] = None) -> Dict[str, Any]:
-    """Run the spaCy pipeline on query and retrieve similar contexts from Mem0.
+    """Run the spaCy pipeline on query and retrieve similar contexts from the ANN index or Mem0.
+    
+    The query is used with surrounding whitespace stripped, and results served
+    by the ANN index are cached per (query, k).
     
     Args:
         query: Input text query to search for
@@ -38,7 +127,8 @@ def retrieve_context(query: str, k: int = 8, mem0_client: Optional[Any] = None)
         mem0_client: Optional Mem0 client, uses global if not provided
         
     Returns:
-        Dict with keys: 'results' (list of search hits) and 'query_tone' (tone stats)
+        Dict with keys: 'results' (search hits; LazyHits when served by the ANN index)
+        and 'query_tone' (tone stats)
         Format: {"results": [...], "query_tone": {...}}
     """
     global _nlp_pipeline, _mem0_client
@@ -50,23 +140,33 @@ def retrieve_context(query: str, k: int = 8, mem0_client: Optional[Any] = None)
     # Use provided client or global client
     client = mem0_client or _mem0_client
     
-    if client is None:
+    if client is None and _ann_index is None:
         raise ValueError("No Mem0 client available for retrieval")
     
-    if not query.strip():
+    query = query.strip()
+    if not query:
         raise ValueError("Empty query provided")
     
+    if _ann_index is not None:
+        cached = _retrieval_cache_get((query, k))
+        if cached is not None:
+            return {"results": cached[0], "query_tone": cached[1]}
+    
     # Process query through spaCy pipeline to get vector and tone
     doc = _nlp_pipeline(query)
     
     if not hasattr(doc, 'vector') or doc.vector is None:
         raise RuntimeError("No vector available from spaCy pipeline")
     
-    # Perform similarity search with Mem0
-    search_results = client.similarity_search(
-        query_vector=doc.vector,
-        k=k
-    )
+    # Perform similarity search on the ANN index, or with Mem0 when there is none
+    if _ann_index is not None:
+        search_results = _ann_search(doc.vector, k)
+        _retrieval_cache_put((query, k), search_results, doc._.tone)
+    else:
+        search_results = client.similarity_search(
+            query_vector=doc.vector,
+            k=k
+        )
     
     # Return both search results and query tone stats
     return {
@@ -75,12 +175,105 @@ def retrieve_context(query: str, k: int = 8, mem0_client: Optional[Any] = None)
     }
 
 
+def retrieve_context_batch(queries: List[str], k: int = 8, mem0_client: Optional[Any] = None) -> List[Dict[str, Any]]:
+    """Batched retrieve_context: one nlp.pipe pass over all queries and one ANN search.
+    
+    With the ANN index, cached queries are answered from the cache and repeats
+    within the batch are analyzed once.
+    
+    Args:
+        queries: Input text queries to search for
+        k: Maximum number of results per query (default: 8)
+        mem0_client: Optional Mem0 client, uses global if not provided
+        
+    Returns:
+        One {"results": [...], "query_tone": {...}} dict per query, in order
+    """
+    # Initialize if needed
+    if _nlp_pipeline is None:
+        initialize_retrieval(mem0_client)
+    
+    client = mem0_client or _mem0_client
+    
+    if client is None and _ann_index is None:
+        raise ValueError("No Mem0 client available for retrieval")
+    
+    if not queries:
+        return []
+    queries = [query.strip() for query in queries]
+    if not all(queries):
+        raise ValueError("Empty query provided")
+    
+    if _ann_index is None:
+        # Mem0 is asked per query, after one pipe pass over the batch
+        docs = _nlp_pipeline.pipe(queries, batch_size=SPACY_BATCH_SIZE)
+        return [
+            {"results": client.similarity_search(query_vector=doc.vector, k=k), "query_tone": doc._.tone}
+            for doc in docs
+        ]
+    
+    cached = [_retrieval_cache_get((query, k)) for query in queries]
+    misses = list(dict.fromkeys(query for query, entry in zip(queries, cached) if entry is None))
+    if misses:
+        # The index searches every uncached query row in one call
+        docs = list(_nlp_pipeline.pipe(misses, batch_size=SPACY_BATCH_SIZE))
+        batch_results = _ann_index.search_batch(np.stack([doc.vector for doc in docs]), k)
+        computed = {}
+        for query, doc, search_results in zip(misses, docs, batch_results):
+            _retrieval_cache_put((query, k), search_results, doc._.tone)
+            computed[query] = (search_results, doc._.tone)
+        cached = [entry if entry is not None else (computed[query][0], copy.deepcopy(computed[query][1]))
+                  for query, entry in zip(queries, cached)]
+    
+    return [{"results": hits, "query_tone": tone} for hits, tone in cached]
+
+
+async def _retrieve_context_batch_in_thread(queries: List[str], k: int) -> List[Dict[str, Any]]:
+    """Run retrieve_context_batch for a batch collected by a retrieval batcher off the event loop."""
+    return await asyncio.to_thread(retrieve_context_batch, queries, k)
+
+
+# One batcher per k; each collects queries arriving within a few milliseconds of
+# each other into one retrieve_context_batch call
+_retrieval_batchers: Dict[int, AsyncDynamicBatcher] = {}
+
+
+async def retrieve_context_async(query: str, k: int = 8, mem0_client: Optional[Any] = None) -> Dict[str, Any]:
+    """retrieve_context for async handlers, keeping the spaCy pass and search off the event loop.
+    
+    Concurrent calls that use the global client are coalesced into one batched
+    call in a worker thread; a call with its own client runs alone in one.
+    
+    Args:
+        query: Input text query to search for
+        k: Maximum number of results to return (default: 8)
+        mem0_client: Optional Mem0 client, uses global if not provided
+        
+    Returns:
+        Dict with keys: 'results' and 'query_tone', as from retrieve_context
+    """
+    if mem0_client is not None:
+        return await asyncio.to_thread(retrieve_context, query, k, mem0_client)
+    # Reject here, since one empty query would fail the whole batch it joined
+    if not query.strip():
+        raise ValueError("Empty query provided")
+    
+    batcher = _retrieval_batchers.get(k)
+    if batcher is None:
+        batcher = _retrieval_batchers[k] = AsyncDynamicBatcher(
+            functools.partial(_retrieve_context_batch_in_thread, k=k),
+            max_batch_size=SPACY_BATCH_SIZE,
+            batch_wait_timeout_s=0.005
+        )
+    return await batcher.submit(query)
+
+
 def retrieve_context_with_filters(
     query: str, 
     k: int = 8, 
     filters: Optional[Dict[str, Any]] = None,
     mem0_client: Optional[Any] = None
-) -> List[Dict[str, Any]]:
+) -> Sequence[Dict[str, Any]]:
     """Enhanced retrieval with metadata filtering support.
     
     Args:
@@ -90,7 +283,8 @@ def retrieve_context_with_filters(
         mem0_client: Optional Mem0 client
         
     Returns:
-        List of filtered context results
+        Filtered context results; LazyHits, which builds each dict on access, when
+        served by the ANN index
     """
     global _nlp_pipeline, _mem0_client
     
@@ -100,11 +294,20 @@ def retrieve_context_with_filters(
     
     client = mem0_client or _mem0_client
     
-    if client is None:
+    # The ANN index applies filters within its search, so it serves filtered queries too
+    use_index = _ann_index is not None
+    if client is None and not use_index:
         logger.warning("No Mem0 client available for filtered retrieval")
         return []
     
     try:
+        query = query.strip()
+        cache_key = _filtered_cache_key(query, k, filters) if use_index else None
+        if cache_key is not None:
+            cached = _retrieval_cache_get(cache_key)
+            if cached is not None:
+                return cached[0]
+        
         # Process query
         doc = _nlp_pipeline(query)
         
@@ -122,6 +325,14 @@ def retrieve_context_with_filters(
         if filters:
             search_kwargs["filters"] = filters
         
+        if use_index:
+            # Index hits already have the result shape and are only materialized when read
+            search_results = _ann_search(doc.vector, k, filters)
+            if cache_key is not None:
+                _retrieval_cache_put(cache_key, search_results, doc._.tone)
+            logger.info(f"Retrieved {len(search_results)} filtered context results")
+            return search_results
+        
         search_results = client.similarity_search(**search_kwargs)
         
         # Format results
@@ -158,5 +369,8 @@ def get_pipeline_info() -> Dict[str, Any]:
         "model": _nlp_pipeline.meta.get("name", "unknown"),
         "version": _nlp_pipeline.meta.get("version", "unknown"),
         "components": _nlp_pipeline.pipe_names,
-        "vector_size": _nlp_pipeline.vocab.vectors_length if _nlp_pipeline.vocab.vectors_length else None
+        "vector_size": _nlp_pipeline.vocab.vectors_length if _nlp_pipeline.vocab.vectors_length else None,
+        "ann_index_size": len(_ann_index) if _ann_index is not None else None,
+        "retrieval_cache_size": len(_retrieval_cache),
+        "retrieval_cache_hits_total": _retrieval_cache_hits
     } 
\ No newline at end of file
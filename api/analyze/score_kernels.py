@@ -0,0 +1,66 @@
+import logging
+import threading
+from typing import Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logger.info("numba not available; score aggregation will use NumPy reductions")
+
+def _dimension_stats_loop(matrix: np.ndarray, threshold: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Single pass over an (N, D) score matrix; compiled by numba when it is installed."""
+    n, d = matrix.shape
+    sums = np.zeros(d)
+    passed = np.zeros(d)
+    mins = np.zeros(d)
+    maxs = np.zeros(d)
+    if n == 0:
+        return sums, passed, mins, maxs
+    for j in range(d):
+        mins[j] = matrix[0, j]
+        maxs[j] = matrix[0, j]
+    for i in range(n):
+        for j in range(d):
+            value = matrix[i, j]
+            sums[j] += value
+            if value >= threshold:
+                passed[j] += 1.0
+            if value < mins[j]:
+                mins[j] = value
+            elif value > maxs[j]:
+                maxs[j] = value
+    return sums / n, passed / n, mins, maxs
+
+def _dimension_stats_numpy(matrix: np.ndarray, threshold: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """NumPy reductions equivalent to _dimension_stats_loop."""
+    if matrix.shape[0] == 0:
+        zeros = np.zeros(matrix.shape[1])
+        return zeros, zeros.copy(), zeros.copy(), zeros.copy()
+    return matrix.mean(axis=0), (matrix >= threshold).mean(axis=0), matrix.min(axis=0), matrix.max(axis=0)
+
+if NUMBA_AVAILABLE:
+    _dimension_stats_kernel = njit(cache=True, nogil=True)(_dimension_stats_loop)
+    # Compile in the background so the first aggregation on the request path does not
+    # pay for JIT and importing this module does not either
+    threading.Thread(target=_dimension_stats_kernel, args=(np.zeros((1, 1)), 0.5), name="score-kernel-warmup", daemon=True).start()
+else:
+    _dimension_stats_kernel = _dimension_stats_numpy
+
+def dimension_stats(matrix: np.ndarray, threshold: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per-column statistics of a score matrix.
+
+    Args:
+        matrix: (N, D) scores, one row per evaluation and one column per dimension
+        threshold: Minimum score counted as passing
+
+    Returns:
+        (means, pass_rates, mins, maxs), each of shape (D,); all zeros when N is 0
+    """
+    return _dimension_stats_kernel(np.ascontiguousarray(matrix, dtype=np.float64), float(threshold))
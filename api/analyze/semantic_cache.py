@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+import numpy as np
+
+from .sqlite_store import SQLiteConnection
+
+logger = logging.getLogger(__name__)
+
+class SemanticCache:
+    """
+    Nearest-neighbour reply cache for paraphrased questions.
+    
+    Questions are embedded and L2-normalized, so cosine similarity is a single
+    matrix-vector product over a fixed-size ring of entries; a lookup returns the
+    stored reply of the closest question when its similarity clears threshold.
+    Entries are optionally persisted to SQLite so other workers and restarts reuse them.
+    """
+    
+    def __init__(
+        self,
+        embed_fn: Callable[[str], Awaitable[List[float]]],
+        threshold: float = 0.92,
+        max_entries: int = 5000,
+        store_path: Optional[str] = None,
+        ttl: Optional[float] = None
+    ):
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        # Ring buffer: row i of _vectors pairs with _questions[i] / _responses[i]
+        self._vectors: Optional[np.ndarray] = None
+        self._questions: List[Optional[str]] = [None] * self.max_entries
+        self._responses: List[Optional[str]] = [None] * self.max_entries
+        self._size = 0
+        self._next = 0
+        
+        self._db: Optional[SQLiteConnection] = None
+        if store_path:
+            try:
+                self._db = SQLiteConnection(
+                    store_path,
+                    "CREATE TABLE IF NOT EXISTS semantic_responses "
+                    "(question TEXT PRIMARY KEY, embedding BLOB, resp TEXT, ts REAL)"
+                )
+                self._load()
+            except Exception as e:
+                logger.error(f"Could not open semantic cache store, keeping it in memory only: {e}")
+                self._db = None
+        
+        logger.info(f"SemanticCache initialized: threshold={threshold}, max_entries={self.max_entries}, loaded={self._size}")
+    
+    async def embed(self, text: str) -> np.ndarray:
+        """Embed text and L2-normalize it so dot products are cosine similarities."""
+        vector = np.asarray(await self.embed_fn(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def nearest(self, embedding: np.ndarray) -> Optional[Tuple[str, str, float]]:
+        """
+        Find the most similar cached question.
+        
+        Args:
+            embedding: Normalized query embedding from embed()
+        
+        Returns:
+            (question, response, similarity) if the best match clears threshold, else None
+        """
+        if self._size == 0 or self._vectors.shape[1] != embedding.shape[0]:
+            return None
+        scores = self._vectors[:self._size] @ embedding
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+        return self._questions[best], self._responses[best], float(scores[best])
+    
+    def put(self, embedding: np.ndarray, question: str, response: str):
+        """Add an entry, overwriting the oldest one once the ring is full."""
+        self._insert(embedding, question, response)
+        if self._db is not None:
+            asyncio.get_running_loop().run_in_executor(
+                None, self._persist, question, embedding.tobytes(), response
+            )
+    
+    def _insert(self, embedding: np.ndarray, question: str, response: str):
+        """Write one entry into the in-memory ring."""
+        if self._vectors is None or self._vectors.shape[1] != embedding.shape[0]:
+            self._vectors = np.zeros((self.max_entries, embedding.shape[0]), dtype=np.float32)
+            self._size = 0
+            self._next = 0
+        self._vectors[self._next] = embedding
+        self._questions[self._next] = question
+        self._responses[self._next] = response
+        self._next = (self._next + 1) % self.max_entries
+        self._size = min(self._size + 1, self.max_entries)
+    
+    def _persist(self, question: str, embedding: bytes, response: str):
+        """Store an entry in SQLite; failures are logged and otherwise ignored."""
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO semantic_responses (question, embedding, resp, ts) VALUES (?, ?, ?, ?)",
+                (question, embedding, response, time.time())
+            )
+        except Exception as e:
+            logger.error(f"Error writing semantic cache store: {e}")
+    
+    def _load(self):
+        """Fill the ring with the newest unexpired persisted entries."""
+        oldest = time.time() - self.ttl if self.ttl else 0.0
+        rows = self._db.fetchall(
+            "SELECT question, embedding, resp FROM semantic_responses WHERE ts >= ? ORDER BY ts DESC LIMIT ?",
+            (oldest, self.max_entries)
+        )
+        for question, embedding, response in reversed(rows):
+            self._insert(np.frombuffer(embedding, dtype=np.float32), question, response)
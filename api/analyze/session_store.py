@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+import orjson
+
+from .sqlite_store import SQLiteConnection
+
+logger = logging.getLogger(__name__)
+
+class SessionStore:
+    """
+    SQLite-backed record of analyze sessions, shared across workers and restarts.
+    
+    Each session is one row keyed by session_id. The small status fields and the
+    large result lists are stored as separate orjson blobs, so polling a session that
+    is still running elsewhere does not decode its results. Ids come from the table's
+    rowid, keeping them unique across workers that share the file.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._db = SQLiteConnection(
+            path,
+            "CREATE TABLE IF NOT EXISTS sessions "
+            "(session_id INTEGER PRIMARY KEY, session_type TEXT, state BLOB, results BLOB, updated REAL)"
+        )
+        
+        logger.info(f"SessionStore opened at {path}")
+    
+    def allocate_id(self, session_type: str) -> int:
+        """
+        Reserve the next session_id.
+        
+        Args:
+            session_type: "stress_test", "content_analysis" or "multi_turn"
+        
+        Returns:
+            A session_id no other worker sharing this store will receive
+        """
+        cursor = self._db.execute(
+            "INSERT INTO sessions (session_type, updated) VALUES (?, ?)", (session_type, time.time())
+        )
+        return cursor.lastrowid
+    
+    def save(self, session_id: int, session_type: str, state: bytes, results: bytes):
+        """
+        Write a session record; failures are logged and otherwise ignored.
+        
+        Args:
+            session_id: Session key
+            session_type: "stress_test", "content_analysis" or "multi_turn"
+            state: orjson-encoded status fields
+            results: orjson-encoded result lists and metrics
+        """
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, session_type, state, results, updated) VALUES (?, ?, ?, ?, ?)",
+                (session_id, session_type, state, results, time.time())
+            )
+        except Exception as e:
+            logger.error(f"Error writing session store: {e}")
+    
+    def save_in_background(self, session_id: int, session_type: str, state: bytes, results: bytes):
+        """Schedule save() in the default executor without waiting for the write."""
+        asyncio.get_running_loop().run_in_executor(None, self.save, session_id, session_type, state, results)
+    
+    def load(self, session_id: int, include_results: bool = True) -> Optional[Dict]:
+        """
+        Read a session record.
+        
+        Args:
+            session_id: Session key
+            include_results: Whether to also decode the result lists
+        
+        Returns:
+            Dict of the decoded state fields, plus a "results" dict when requested,
+            or None if missing, not yet saved or unreadable
+        """
+        try:
+            row = self._db.fetchone("SELECT state, results FROM sessions WHERE session_id = ?", (session_id,))
+            if row is None or row[0] is None:
+                return None
+            record = orjson.loads(row[0])
+            if include_results:
+                record["results"] = orjson.loads(row[1])
+            return record
+        except Exception as e:
+            logger.error(f"Error reading session store: {e}")
+            return None
+    
+    def latest_id(self, multi_turn: bool = False) -> Optional[int]:
+        """Highest saved session_id of the given kind, or None if there is none."""
+        clause = "session_type = 'multi_turn'" if multi_turn else "session_type != 'multi_turn'"
+        row = self._db.fetchone(f"SELECT MAX(session_id) FROM sessions WHERE state IS NOT NULL AND {clause}")
+        return row[0]
@@ -2,15 +2,49 @@
 
 import spacy
 from spacy.language import Language
+from spacy.attrs import IS_STOP, LENGTH, LOWER, POS
+from spacy.parts_of_speech import NOUN, PROPN
+from spacy.strings import get_string_id
 from spacy.tokens import Doc
-from typing import Dict, List, Optional, Set
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+import copy
+import heapq
+import itertools
 import logging
+import os
 import re
+import tempfile
+import threading
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    logger.info("pyahocorasick not available; TECH_CONCEPTS will be scanned one concept at a time")
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+    logger.info("hyperscan not available; basic entity/key-phrase extraction will use precompiled re patterns")
+
+# Texts per nlp.pipe batch in the batched query paths
+SPACY_BATCH_SIZE = int(os.getenv("SPACY_BATCH_SIZE", "64"))
+# Query insights kept per whitespace-stripped query text; 0 disables the cache
+QUERY_INSIGHTS_CACHE_SIZE = int(os.getenv("QUERY_INSIGHTS_CACHE_SIZE", "1024"))
+# Directory where the model's word vectors are saved once and memory-mapped by every
+# worker process, so they share one copy in the page cache; empty keeps private copies
+SPACY_SHARED_VECTORS_DIR = os.getenv("SPACY_SHARED_VECTORS_DIR", "")
+
 # Enhanced technical vocabulary for concept detection
-TECH_CONCEPTS = {
+TECH_CONCEPTS = frozenset({
     # Blockchain/Web3 Core
     "blockchain", "ethereum", "polkadot", "substrate", "parachain", "validator",
     "consensus", "proof of stake", "proof of work", "cross-chain", "interoperability", 
@@ -42,7 +76,111 @@ TECH_CONCEPTS = {
     # Performance & Optimization
     "throughput", "latency", "bandwidth", "concurrency", "parallelism",
     "asynchronous", "multithreading", "load balancing", "caching", "indexing"
-}
+})
+
+
+def _build_concept_automaton() -> Optional["ahocorasick.Automaton"]:
+    """Compile TECH_CONCEPTS into one Aho-Corasick automaton, or None without pyahocorasick."""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    automaton = ahocorasick.Automaton()
+    for concept in TECH_CONCEPTS:
+        automaton.add_word(concept, concept)
+    automaton.make_automaton()
+    return automaton
+
+
+_CONCEPT_AUTOMATON = _build_concept_automaton()
+
+
+def _scan_tech_concepts(text_lower: str) -> List[str]:
+    """Find every TECH_CONCEPTS entry occurring as a substring of lowercased text.
+    
+    The automaton reports all concepts in one pass over the text, in order of where
+    they end; duplicates are possible and left to the caller.
+    """
+    if _CONCEPT_AUTOMATON is not None:
+        return [concept for _, concept in _CONCEPT_AUTOMATON.iter(text_lower)]
+    return [concept for concept in TECH_CONCEPTS if concept in text_lower]
+
+
+# Token attributes for the extractor's standalone-term filter, and the values it matches:
+# StringStore hashes of every concept (compared against LOWER) and the noun POS ids
+_TECH_TERM_ATTRS = [LOWER, POS, IS_STOP, LENGTH]
+_TECH_CONCEPT_HASHES = np.array([get_string_id(concept) for concept in TECH_CONCEPTS], dtype=np.uint64)
+_NOUN_POS_IDS = np.array([NOUN, PROPN], dtype=np.uint64)
+
+
+# Substring triggers for main topics; every matching topic is reported, in this order
+TOPIC_TERMS = [
+    ("blockchain_technology", ["blockchain", "ethereum", "polkadot", "crypto", "defi", "web3", "substrate"]),
+    ("technical_development", ["code", "programming", "development", "technical", "architecture", "implementation"]),
+    ("strategy_business", ["future", "strategy", "vision", "market", "adoption", "ecosystem"])
+]
+
+# Substring triggers for question types; the first matching type wins, else "conversational"
+QUESTION_TYPE_TERMS = [
+    ("explanatory", ["how", "explain", "what is", "tell me about"]),
+    ("reasoning", ["why", "because", "reason"]),
+    ("predictive", ["when", "future", "timeline", "will"]),
+    ("comparative", ["compare", "versus", "vs", "difference", "better"]),
+    ("question", ["?"])
+]
+
+
+def _build_keyword_automaton() -> Optional["ahocorasick.Automaton"]:
+    """Compile TOPIC_TERMS and QUESTION_TYPE_TERMS into one automaton, or None without pyahocorasick.
+    
+    Each term maps to its (is_topic, table position) tags; a term may appear in both tables.
+    """
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    tags: Dict[str, List[tuple]] = {}
+    for is_topic, table in ((True, TOPIC_TERMS), (False, QUESTION_TYPE_TERMS)):
+        for position, (_, terms) in enumerate(table):
+            for term in terms:
+                tags.setdefault(term, []).append((is_topic, position))
+    automaton = ahocorasick.Automaton()
+    for term, term_tags in tags.items():
+        automaton.add_word(term, term_tags)
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+
+def _classify_topics_and_question_type(text_lower: str) -> Tuple[List[str], str]:
+    """Main topics and question type of lowercased text, from one scan for both keyword tables.
+    
+    Returns:
+        (topics in TOPIC_TERMS order, question type)
+    """
+    if _KEYWORD_AUTOMATON is not None:
+        topic_positions = set()
+        question_position = len(QUESTION_TYPE_TERMS)
+        for _, term_tags in _KEYWORD_AUTOMATON.iter(text_lower):
+            for is_topic, position in term_tags:
+                if is_topic:
+                    topic_positions.add(position)
+                elif position < question_position:
+                    question_position = position
+    else:
+        topic_positions = {
+            position for position, (_, terms) in enumerate(TOPIC_TERMS)
+            if any(term in text_lower for term in terms)
+        }
+        question_position = next(
+            (position for position, (_, terms) in enumerate(QUESTION_TYPE_TERMS)
+             if any(term in text_lower for term in terms)),
+            len(QUESTION_TYPE_TERMS)
+        )
+    
+    topics = [topic for position, (topic, _) in enumerate(TOPIC_TERMS) if position in topic_positions]
+    if question_position < len(QUESTION_TYPE_TERMS):
+        return topics, QUESTION_TYPE_TERMS[question_position][0]
+    return topics, "conversational"
+
 
 # Semantic patterns for better concept detection
 CONCEPT_PATTERNS = {
@@ -108,52 +246,185 @@ TONE_GUIDANCE = {
     }
 }
 
+# Patterns for the basic (no-spaCy) entity and key-phrase extractors
+BASIC_ENTITY_PATTERNS = {
+    "ORG": [r'\b(Ethereum|Polkadot|Bitcoin|Substrate|Web3|Microsoft|Google|Apple)\b'],
+    "TECH": [r'\b(blockchain|cryptocurrency|smart contract|DeFi|NFT)\b'],
+    "PERSON": [r'\b(Gavin Wood|Vitalik Buterin|Satoshi Nakamoto)\b']
+}
+
+TECH_PHRASE_PATTERNS = [
+    r'\b(proof of stake|smart contract|cross[- ]chain|web3 technology|blockchain technology)\b',
+    r'\b(consensus mechanism|governance system|treasury proposal)\b',
+    r'\b(runtime upgrade|parachain slot|validator set)\b'
+]
+
+# Compiled once at import rather than looked up in re's cache on every call
+_ENTITY_REGEXES = [
+    (label, re.compile(pattern, re.IGNORECASE))
+    for label, pattern_list in BASIC_ENTITY_PATTERNS.items()
+    for pattern in pattern_list
+]
+_ENTITY_LABELS = [label for label, _ in _ENTITY_REGEXES]
+_ENTITY_PATTERN_REGEXES = [regex for _, regex in _ENTITY_REGEXES]
+_TECH_PHRASE_REGEXES = [re.compile(pattern, re.IGNORECASE) for pattern in TECH_PHRASE_PATTERNS]
+# A category matches if any of its patterns does, so each category is one alternation
+_CONCEPT_CATEGORY_REGEXES = [
+    (category, re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE))
+    for category, patterns in CONCEPT_PATTERNS.items()
+]
+_STYLE_REGEXES = {
+    kind: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+    for kind, patterns in GAVIN_STYLE_PATTERNS.items()
+}
+_TONE_TRIGGER_REGEXES = [
+    (tone_type, [re.compile(trigger, re.IGNORECASE) for trigger in guidance["triggers"]], guidance)
+    for tone_type, guidance in TONE_GUIDANCE.items()
+]
+
+
+def _compile_hyperscan(patterns: List[str]) -> Optional["hyperscan.Database"]:
+    """Compile patterns into one caseless Hyperscan database reporting match starts, or None."""
+    if not HYPERSCAN_AVAILABLE:
+        return None
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[pattern.encode() for pattern in patterns],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST] * len(patterns)
+        )
+        return database
+    except Exception as e:
+        logger.warning(f"Hyperscan compilation failed, using re patterns: {e}")
+        return None
+
+
+_ENTITY_DB = _compile_hyperscan([regex.pattern for regex in _ENTITY_PATTERN_REGEXES])
+_TECH_PHRASE_DB = _compile_hyperscan(TECH_PHRASE_PATTERNS)
+
+
+def _scan_patterns(
+    database: Optional["hyperscan.Database"],
+    regexes: List[re.Pattern],
+    text: str,
+    limit: Optional[int] = None
+) -> List[tuple]:
+    """Find non-overlapping matches of each pattern, as re.finditer would.
+    
+    Args:
+        database: Hyperscan database compiled from regexes, or None
+        regexes: The same patterns, compiled with re
+        text: Text to scan
+        limit: Stop after this many matches (default: all)
+        
+    Returns:
+        (pattern index, start, end) tuples ordered by pattern, then position
+    """
+    # Hyperscan reports byte offsets, which only equal str offsets for ASCII text
+    if database is None or not text.isascii():
+        # Lazily, so the remaining patterns are never run once limit is reached
+        matches = (
+            (index, match.start(), match.end())
+            for index, regex in enumerate(regexes)
+            for match in regex.finditer(text)
+        )
+        return list(itertools.islice(matches, limit))
+    
+    hits = []
+    database.scan(text.encode(), match_event_handler=lambda index, start, end, flags, context: hits.append((index, start, end)))
+    hits.sort()
+    # Hyperscan reports every match; keep the leftmost non-overlapping ones per pattern
+    matches = []
+    for index, start, end in hits:
+        if matches and matches[-1][0] == index and start < matches[-1][2]:
+            continue
+        if len(matches) == limit:
+            break
+        matches.append((index, start, end))
+    return matches
+
+
+def _match_concept_categories(text_lower: str) -> List[str]:
+    """CONCEPT_PATTERNS categories with at least one pattern matching the text."""
+    return [category for category, regex in _CONCEPT_CATEGORY_REGEXES if regex.search(text_lower)]
+
+
+# Model components nothing here reads. attribute_ruler stays: it maps tags to token.pos_,
+# which the extractor's term filter and English noun_chunks both depend on.
+UNUSED_COMPONENTS = ["lemmatizer"]
+
 # Global spaCy pipeline cache
 _nlp_cache = None
+_nlp_vector_cache: Optional[Language] = None
+
+# LRU of extract_query_insights results; entries are private copies handed out as deep copies
+_insights_cache: "OrderedDict[str, Dict]" = OrderedDict()
+_insights_cache_lock = threading.Lock()
+_insights_cache_hits = 0
+
+
+def _insights_cache_get(key: str) -> Optional[Dict]:
+    """Look up cached insights and mark them as recently used."""
+    global _insights_cache_hits
+    with _insights_cache_lock:
+        cached = _insights_cache.get(key)
+        if cached is None:
+            return None
+        _insights_cache.move_to_end(key)
+        _insights_cache_hits += 1
+    return copy.deepcopy(cached)
+
+
+def _insights_cache_put(key: str, insights: Dict) -> None:
+    """Remember insights, evicting the oldest beyond QUERY_INSIGHTS_CACHE_SIZE.
+    
+    Results of a failed spaCy run are not kept, so a transient error does not stick.
+    """
+    if QUERY_INSIGHTS_CACHE_SIZE <= 0 or insights["extraction_method"] == "basic_fallback":
+        return
+    insights = copy.deepcopy(insights)
+    with _insights_cache_lock:
+        _insights_cache[key] = insights
+        _insights_cache.move_to_end(key)
+        while len(_insights_cache) > QUERY_INSIGHTS_CACHE_SIZE:
+            _insights_cache.popitem(last=False)
+
+
+def get_insights_cache_stats() -> Dict[str, int]:
+    """Size and lifetime hit count of the query insights cache."""
+    return {"size": len(_insights_cache), "hits_total": _insights_cache_hits}
 
 
 def extract_entities_basic(text: str) -> List[Dict]:
     """Basic entity extraction using regex patterns when spaCy is not available."""
-    entities = []
-    
-    # Simple patterns for common entities
-    patterns = {
-        "ORG": [r'\b(Ethereum|Polkadot|Bitcoin|Substrate|Web3|Microsoft|Google|Apple)\b'],
-        "TECH": [r'\b(blockchain|cryptocurrency|smart contract|DeFi|NFT)\b'],
-        "PERSON": [r'\b(Gavin Wood|Vitalik Buterin|Satoshi Nakamoto)\b']
-    }
-    
-    for label, pattern_list in patterns.items():
-        for pattern in pattern_list:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                entities.append({
-                    "text": match.group(),
-                    "label": label,
-                    "description": label.lower(),
-                    "start": match.start(),
-                    "end": match.end()
-                })
-    
-    return entities
+    return [
+        {
+            "text": text[start:end],
+            "label": _ENTITY_LABELS[index],
+            "description": _ENTITY_LABELS[index].lower(),
+            "start": start,
+            "end": end
+        }
+        for index, start, end in _scan_patterns(_ENTITY_DB, _ENTITY_PATTERN_REGEXES, text)
+    ]
 
 
 def extract_concepts_basic(text: str) -> List[str]:
     """Enhanced concept extraction without spaCy using patterns and keywords."""
-    text_lower = text.lower()
+    return _concepts_from_lower(text.lower())
+
+
+def _concepts_from_lower(text_lower: str) -> List[str]:
+    """Concept categories and TECH_CONCEPTS entries found in already-lowercased text."""
     found_concepts = []
     
     # First, check semantic patterns
-    for category, patterns in CONCEPT_PATTERNS.items():
-        for pattern in patterns:
-            if re.search(pattern, text_lower, re.IGNORECASE):
-                found_concepts.append(category)
-                break  # Only add category once
+    found_concepts.extend(_match_concept_categories(text_lower))
     
     # Then check individual technical concepts
-    for concept in TECH_CONCEPTS:
-        if concept.lower() in text_lower:
-            found_concepts.append(concept)
+    found_concepts.extend(_scan_tech_concepts(text_lower))
     
     # Remove duplicates while preserving order
     return list(dict.fromkeys(found_concepts))
@@ -161,27 +432,17 @@ def extract_concepts_basic(text: str) -> List[str]:
 
 def extract_key_phrases_basic(text: str) -> List[str]:
     """Basic key phrase extraction using simple patterns."""
-    # Extract potential phrases using simple patterns
-    phrases = []
-    
-    # Multi-word technical terms
-    tech_phrase_patterns = [
-        r'\b(proof of stake|smart contract|cross[- ]chain|web3 technology|blockchain technology)\b',
-        r'\b(consensus mechanism|governance system|treasury proposal)\b',
-        r'\b(runtime upgrade|parachain slot|validator set)\b'
-    ]
-    
-    for pattern in tech_phrase_patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        for match in matches:
-            phrases.append(match.group())
-    
-    return phrases[:10]  # Limit to 10
+    # Multi-word technical terms, limited to the first 10
+    return [text[start:end] for _, start, end in _scan_patterns(_TECH_PHRASE_DB, _TECH_PHRASE_REGEXES, text, limit=10)]
 
 
 def detect_gavin_style_requirements(text: str) -> Dict:
     """Detect if query requires Gavin Wood's philosophical communication style."""
-    text_lower = text.lower()
+    return _style_requirements_from_lower(text.lower())
+
+
+def _style_requirements_from_lower(text_lower: str) -> Dict:
+    """detect_gavin_style_requirements for already-lowercased text."""
     style_indicators = {
         "philosophical_score": 0,
         "suggested_tone": "standard",
@@ -191,25 +452,19 @@ def detect_gavin_style_requirements(text: str) -> Dict:
     }
     
     # Check for philosophical triggers
-    philosophical_matches = 0
-    for pattern in GAVIN_STYLE_PATTERNS["philosophical_triggers"]:
-        if re.search(pattern, text_lower, re.IGNORECASE):
-            philosophical_matches += 1
+    philosophical_matches = sum(1 for regex in _STYLE_REGEXES["philosophical_triggers"] if regex.search(text_lower))
     
     # Check for abstract concept indicators
-    abstract_matches = 0
-    for pattern in GAVIN_STYLE_PATTERNS["abstract_concepts"]:
-        if re.search(pattern, text_lower, re.IGNORECASE):
-            abstract_matches += 1
+    abstract_matches = sum(1 for regex in _STYLE_REGEXES["abstract_concepts"] if regex.search(text_lower))
     
     # Calculate philosophical score
     total_matches = philosophical_matches + abstract_matches
     style_indicators["philosophical_score"] = min(total_matches / 3.0, 1.0)  # Normalize to 0-1
     
     # Determine tone guidance based on question patterns
-    for tone_type, guidance in TONE_GUIDANCE.items():
-        for trigger_pattern in guidance["triggers"]:
-            if re.search(trigger_pattern, text_lower, re.IGNORECASE):
+    for tone_type, trigger_regexes, guidance in _TONE_TRIGGER_REGEXES:
+        for trigger_regex in trigger_regexes:
+            if trigger_regex.search(text_lower):
                 style_indicators["suggested_tone"] = tone_type
                 style_indicators["style_guidance"] = guidance["style"]
                 style_indicators["recommended_vocabulary"] = guidance["vocabulary"]
@@ -286,24 +541,10 @@ def entity_concept_extractor(doc: Doc) -> Doc:
                 "end": ent.end_char
             })
         
-        # Enhanced technical concept detection
-        concepts = []
-        doc_text_lower = doc.text.lower()
-        
-        # First, check semantic patterns with higher confidence
-        for category, patterns in CONCEPT_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, doc_text_lower, re.IGNORECASE):
-                    concepts.append(category)
-                    break  # Only add category once
-        
-        # Then check individual technical concepts
-        for concept in TECH_CONCEPTS:
-            if concept.lower() in doc_text_lower:
-                concepts.append(concept)
-        
-        # Remove duplicates while preserving order
-        concepts = list(dict.fromkeys(concepts))
+        # Enhanced technical concept detection; the lowercased text is kept on the Doc
+        # so the topic, question-type and style scans reuse it instead of lowering again
+        doc._.lowered = doc.text.lower()
+        concepts = _concepts_from_lower(doc._.lowered)
         
         # Key phrase extraction (noun phrases + important adjectives)
         key_phrases = []
@@ -311,16 +552,20 @@ def entity_concept_extractor(doc: Doc) -> Doc:
             if len(chunk.text.split()) >= 2:  # Multi-word phrases
                 key_phrases.append(chunk.text.strip())
         
-        # Add important standalone technical terms
-        for token in doc:
-            if (token.pos_ in ["NOUN", "PROPN"] and 
-                len(token.text) > 3 and 
-                not token.is_stop and 
-                token.text.lower() in TECH_CONCEPTS):
-                key_phrases.append(token.text)
+        # Add important standalone technical terms: nouns/proper nouns over 3 characters,
+        # not stop words, whose lowercase form is a TECH_CONCEPTS entry. Filtered over
+        # the token attribute array so only matching tokens are touched from Python.
+        attrs = doc.to_array(_TECH_TERM_ATTRS)
+        term_mask = (
+            np.isin(attrs[:, 0], _TECH_CONCEPT_HASHES)
+            & np.isin(attrs[:, 1], _NOUN_POS_IDS)
+            & (attrs[:, 2] == 0)
+            & (attrs[:, 3] > 3)
+        )
+        key_phrases.extend(doc[i].text for i in np.flatnonzero(term_mask))
         
-        # Remove duplicates and sort by length (longer phrases first)
-        key_phrases = sorted(list(set(key_phrases)), key=len, reverse=True)[:10]
+        # Remove duplicates and keep the 10 longest; nlargest selects them without sorting every phrase
+        key_phrases = heapq.nlargest(10, dict.fromkeys(key_phrases), key=len)
         
         doc._.entities_enhanced = entities
         doc._.concepts = concepts
@@ -335,6 +580,38 @@ def entity_concept_extractor(doc: Doc) -> Doc:
     return doc
 
 
+def _share_vectors(nlp: Language, directory: str) -> None:
+    """Swap the model's vector table for a read-only memory map of a copy saved in directory.
+    
+    The first process to load a given model version writes the .npy file (atomically,
+    so racing workers never see a partial file); every process then maps it, and the
+    private copy spaCy loaded is released. Inference only reads vectors; the map is
+    read-only, so in-place Vectors operations such as most_similar would fail.
+    """
+    vectors = nlp.vocab.vectors
+    if vectors.size == 0:
+        return
+    path = os.path.join(directory, f"{nlp.meta.get('lang', 'xx')}_{nlp.meta.get('name', 'model')}-{nlp.meta.get('version', '0')}.vectors.npy")
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.asarray(vectors.data))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        logger.info(f"Saved {vectors.shape[0]:,} shared word vectors to {path}")
+    
+    shared = np.load(path, mmap_mode="r")
+    if shared.shape != vectors.data.shape or shared.dtype != vectors.data.dtype:
+        logger.warning(f"Shared vectors at {path} do not match the loaded model; keeping a private copy")
+        return
+    vectors.data = shared
+    logger.info(f"Memory-mapped shared word vectors from {path}")
+
+
 def get_nlp_fast() -> Optional[Language]:
     """Get fast spaCy pipeline optimized for real-time processing."""
     global _nlp_cache
@@ -345,18 +622,24 @@ def get_nlp_fast() -> Optional[Language]:
     try:
         # Try medium model first
         try:
-            nlp = spacy.load("en_core_web_md")
+            nlp = spacy.load("en_core_web_md", disable=UNUSED_COMPONENTS)
             logger.info("✅ Loaded en_core_web_md model")
         except OSError:
             # Fallback to small model
             try:
-                nlp = spacy.load("en_core_web_sm")
+                nlp = spacy.load("en_core_web_sm", disable=UNUSED_COMPONENTS)
                 logger.info("✅ Loaded en_core_web_sm model (fallback)")
             except OSError:
                 logger.warning("❌ No spaCy model found. Using basic extraction methods.")
                 _nlp_cache = False  # Mark as unavailable
                 return None
         
+        if SPACY_SHARED_VECTORS_DIR:
+            try:
+                _share_vectors(nlp, SPACY_SHARED_VECTORS_DIR)
+            except Exception as e:
+                logger.error(f"Failed to share word vectors through {SPACY_SHARED_VECTORS_DIR}: {e}")
+        
         # Register extensions if not already registered
         if not Doc.has_extension("entities_enhanced"):
             Doc.set_extension("entities_enhanced", default=None)
@@ -364,10 +647,13 @@ def get_nlp_fast() -> Optional[Language]:
             Doc.set_extension("concepts", default=None)
         if not Doc.has_extension("key_phrases"):
             Doc.set_extension("key_phrases", default=None)
+        if not Doc.has_extension("lowered"):
+            Doc.set_extension("lowered", default=None)
         
         # Add custom entity/concept extractor
         if "entity_concept_extractor" not in nlp.pipe_names:
             nlp.add_pipe("entity_concept_extractor", last=True)
+        logger.info(f"spaCy components: {nlp.pipe_names} (disabled: {nlp.disabled})")
         
         _nlp_cache = nlp
         return nlp
@@ -378,106 +664,151 @@ def get_nlp_fast() -> Optional[Language]:
         return None
 
 
-def extract_query_insights(text: str) -> Dict:
-    """Extract entities, concepts, insights, and style guidance from query text."""
+def get_nlp_vector_only() -> Optional[Language]:
+    """Tokenizer-only pipeline sharing get_nlp_fast's vocab, for callers that only need doc.vector.
+    
+    The model's static vectors are averaged over tokens, so no component has to run;
+    the tagger, parser and NER are skipped entirely. Docs carry a tone extension
+    (None unless a component sets it) for retrieval's query_tone.
+    """
+    global _nlp_vector_cache
+    
+    if _nlp_vector_cache is not None:
+        return _nlp_vector_cache
+    
     nlp = get_nlp_fast()
+    if not nlp:
+        return None
+    
+    vector_nlp = spacy.blank(nlp.lang, vocab=nlp.vocab)
+    vector_nlp.tokenizer = nlp.tokenizer
+    vector_nlp.meta["name"] = nlp.meta.get("name", "unknown")
+    vector_nlp.meta["version"] = nlp.meta.get("version", "unknown")
+    if not Doc.has_extension("tone"):
+        Doc.set_extension("tone", default=None)
     
-    # Always detect Gavin's style requirements (works with basic methods too)
-    style_requirements = detect_gavin_style_requirements(text)
+    _nlp_vector_cache = vector_nlp
+    return vector_nlp
+
+
+def extract_query_insights(text: str) -> Dict:
+    """Extract entities, concepts, insights, and style guidance from query text.
+    
+    Results are cached per query with surrounding whitespace stripped; the
+    query is analyzed in that stripped form.
+    """
+    text = text.strip()
+    cached = _insights_cache_get(text)
+    if cached is not None:
+        return cached
+    
+    nlp = get_nlp_fast()
     
     if nlp is None:
         # Fallback to basic extraction methods
         logger.info("🔄 Using basic extraction methods (spaCy unavailable)")
-        question_type = _classify_question_type_basic(text)
-        return {
-            "entities": extract_entities_basic(text),
-            "concepts": extract_concepts_basic(text),
-            "key_phrases": extract_key_phrases_basic(text),
-            "main_topics": _extract_main_topics_basic(text),
-            "question_type": question_type,
-            "style_requirements": style_requirements,
-            "gavin_tone_guidance": generate_gavin_tone_context(style_requirements, question_type),
-            "extraction_method": "basic"
-        }
+        insights = _basic_insights(text, "basic")
+    else:
+        try:
+            insights = _insights_from_doc(nlp(text))
+        except Exception as e:
+            logger.warning(f"SpaCy processing failed, using basic methods: {e}")
+            insights = _basic_insights(text, "basic_fallback")
     
-    try:
-        doc = nlp(text)
-        question_type = _classify_question_type(doc)
-        
-        return {
-            "entities": doc._.entities_enhanced or [],
-            "concepts": doc._.concepts or [],
-            "key_phrases": doc._.key_phrases or [],
-            "main_topics": _extract_main_topics(doc),
-            "question_type": question_type,
-            "style_requirements": style_requirements,
-            "gavin_tone_guidance": generate_gavin_tone_context(style_requirements, question_type),
-            "extraction_method": "spacy"
-        }
-    except Exception as e:
-        logger.warning(f"SpaCy processing failed, using basic methods: {e}")
-        question_type = _classify_question_type_basic(text)
-        return {
-            "entities": extract_entities_basic(text),
-            "concepts": extract_concepts_basic(text),
-            "key_phrases": extract_key_phrases_basic(text),
-            "main_topics": _extract_main_topics_basic(text),
-            "question_type": question_type,
-            "style_requirements": style_requirements,
-            "gavin_tone_guidance": generate_gavin_tone_context(style_requirements, question_type),
-            "extraction_method": "basic_fallback"
-        }
+    _insights_cache_put(text, insights)
+    return insights
 
 
-def _extract_main_topics(doc: Doc) -> List[str]:
-    """Extract main topics from the document."""
-    return _extract_main_topics_basic(doc.text)
-
-
-def _extract_main_topics_basic(text: str) -> List[str]:
-    """Extract main topics using basic text analysis."""
-    topics = []
-    text_lower = text.lower()
+def extract_query_insights_batch(texts: List[str]) -> List[Dict]:
+    """Batched extract_query_insights; one nlp.pipe pass amortizes spaCy's per-call overhead.
     
-    # Look for blockchain/web3 indicators
-    blockchain_terms = ["blockchain", "ethereum", "polkadot", "crypto", "defi", "web3", "substrate"]
-    if any(term in text_lower for term in blockchain_terms):
-        topics.append("blockchain_technology")
+    Cached queries are answered from the cache and repeats within the batch are
+    analyzed once.
     
-    # Look for technical/programming indicators
-    tech_terms = ["code", "programming", "development", "technical", "architecture", "implementation"]
-    if any(term in text_lower for term in tech_terms):
-        topics.append("technical_development")
+    Args:
+        texts: Query texts
+        
+    Returns:
+        One insights dict per text, in order, as from extract_query_insights
+    """
+    keys = [text.strip() for text in texts]
+    results = [_insights_cache_get(key) for key in keys]
+    misses = list(dict.fromkeys(key for key, cached in zip(keys, results) if cached is None))
+    if not misses:
+        return results
+    
+    computed = dict(zip(misses, _extract_query_insights_uncached_batch(misses)))
+    for key, insights in computed.items():
+        _insights_cache_put(key, insights)
+    
+    # The first occurrence of each miss takes the computed dict, repeats get copies
+    handed_out = set()
+    for i, key in enumerate(keys):
+        if results[i] is None:
+            results[i] = computed[key] if key not in handed_out else copy.deepcopy(computed[key])
+            handed_out.add(key)
+    return results
+
+
+def _extract_query_insights_uncached_batch(texts: List[str]) -> List[Dict]:
+    """Run extract_query_insights_batch's analysis for texts without consulting the cache."""
+    nlp = get_nlp_fast()
     
-    # Look for business/strategy indicators
-    business_terms = ["future", "strategy", "vision", "market", "adoption", "ecosystem"]
-    if any(term in text_lower for term in business_terms):
-        topics.append("strategy_business")
+    if nlp is None:
+        logger.info("🔄 Using basic extraction methods (spaCy unavailable)")
+        return [_basic_insights(text, "basic") for text in texts]
     
-    return topics
-
-
-def _classify_question_type(doc: Doc) -> str:
-    """Classify the type of question being asked."""
-    return _classify_question_type_basic(doc.text)
+    try:
+        docs = list(nlp.pipe(texts, batch_size=SPACY_BATCH_SIZE))
+    except Exception as e:
+        logger.warning(f"SpaCy batch processing failed, using basic methods: {e}")
+        return [_basic_insights(text, "basic_fallback") for text in texts]
+    
+    insights = []
+    for text, doc in zip(texts, docs):
+        try:
+            insights.append(_insights_from_doc(doc))
+        except Exception as e:
+            logger.warning(f"SpaCy processing failed, using basic methods: {e}")
+            insights.append(_basic_insights(text, "basic_fallback"))
+    return insights
+
+
+def _insights_from_doc(doc: Doc) -> Dict:
+    """Build the insights dict from a processed spaCy Doc."""
+    # One lowercase buffer, set by entity_concept_extractor, feeds the style and keyword scans
+    text_lower = doc._.lowered or doc.text.lower()
+    style_requirements = _style_requirements_from_lower(text_lower)
+    main_topics, question_type = _classify_topics_and_question_type(text_lower)
+    
+    return {
+        "entities": doc._.entities_enhanced or [],
+        "concepts": doc._.concepts or [],
+        "key_phrases": doc._.key_phrases or [],
+        "main_topics": main_topics,
+        "question_type": question_type,
+        "style_requirements": style_requirements,
+        "gavin_tone_guidance": generate_gavin_tone_context(style_requirements, question_type),
+        "extraction_method": "spacy"
+    }
 
 
-def _classify_question_type_basic(text: str) -> str:
-    """Classify question type using basic text analysis."""
+def _basic_insights(text: str, extraction_method: str) -> Dict:
+    """Build the insights dict with the regex/keyword extractors."""
     text_lower = text.lower()
-    
-    if any(word in text_lower for word in ["how", "explain", "what is", "tell me about"]):
-        return "explanatory"
-    elif any(word in text_lower for word in ["why", "because", "reason"]):
-        return "reasoning"
-    elif any(word in text_lower for word in ["when", "future", "timeline", "will"]):
-        return "predictive"
-    elif any(word in text_lower for word in ["compare", "versus", "vs", "difference", "better"]):
-        return "comparative"
-    elif "?" in text_lower:
-        return "question"
-    else:
-        return "conversational"
+    style_requirements = _style_requirements_from_lower(text_lower)
+    main_topics, question_type = _classify_topics_and_question_type(text_lower)
+    
+    return {
+        "entities": extract_entities_basic(text),
+        "concepts": _concepts_from_lower(text_lower),
+        "key_phrases": extract_key_phrases_basic(text),
+        "main_topics": main_topics,
+        "question_type": question_type,
+        "style_requirements": style_requirements,
+        "gavin_tone_guidance": generate_gavin_tone_context(style_requirements, question_type),
+        "extraction_method": extraction_method
+    }
 
 
 # Legacy function for backward compatibility
@@ -0,0 +1,34 @@
+import sqlite3
+import threading
+from typing import Any, List, Optional, Tuple
+
+class SQLiteConnection:
+    """
+    One autocommit SQLite connection in WAL mode, shared by executor threads.
+    
+    Every statement runs under a lock, and reads fetch their rows before it is
+    released, so the stores built on it can be called from any thread.
+    """
+    
+    def __init__(self, path: str, schema: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(schema)
+    
+    def execute(self, sql: str, params: Tuple = ()) -> sqlite3.Cursor:
+        """Run a write statement; the returned cursor is only good for lastrowid/rowcount."""
+        with self._lock:
+            return self._conn.execute(sql, params)
+    
+    def fetchone(self, sql: str, params: Tuple = ()) -> Optional[Tuple[Any, ...]]:
+        """Run a query and return its first row, or None."""
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+    
+    def fetchall(self, sql: str, params: Tuple = ()) -> List[Tuple[Any, ...]]:
+        """Run a query and return all of its rows."""
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
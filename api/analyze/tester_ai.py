@@ -1,75 +1,215 @@
-import re
-import json
 import logging
-from typing import List, Dict, Tuple
+import os
+import time
+from typing import AsyncIterator, List, Dict, Optional, Tuple
+import orjson
+from aiolimiter import AsyncLimiter
 from openai import AsyncOpenAI
+from pydantic import BaseModel, ConfigDict, ValidationError
 import asyncio
 
 logger = logging.getLogger(__name__)
 
+# Questions started per second by fire_questions_sequentially, across all its callers
+QUESTION_RATE = float(os.getenv("QUESTION_RATE", "10"))
+# Model for the Q&A parses, streamed or not; it must support structured outputs
+QA_PARSE_MODEL = os.getenv("QA_PARSE_MODEL", "gpt-4o")
+
+class QAPairSchema(BaseModel):
+    """One extracted question and its answer (empty for generated questions)"""
+    model_config = ConfigDict(extra="forbid")
+    
+    question: str
+    answer: str
+
+class QAListSchema(BaseModel):
+    """JSON schema the Q&A parses are constrained to via structured outputs"""
+    model_config = ConfigDict(extra="forbid")
+    
+    pairs: List[QAPairSchema]
+
+_QA_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "qa_pairs", "schema": QAListSchema.model_json_schema(), "strict": True}
+}
+
+# Output instructions matching QAListSchema, for both the streamed and the one-shot parses
+_QA_OBJECT_FORMAT_INSTRUCTIONS = """Return ONLY a JSON object with a "pairs" array of objects with "question" and "answer" fields."""
+
+class _JsonObjectScanner:
+    """
+    Incrementally pull complete objects out of a streamed JSON document.
+    
+    Text is fed as it arrives; each call returns the objects at object_depth whose
+    closing brace has been seen, so callers can act on early items before the
+    document ends. Depth 1 yields the items of a bare array; depth 2 yields the
+    items of an array inside a wrapping object, such as {"pairs": [...]}.
+    """
+    
+    def __init__(self, object_depth: int = 1):
+        self._object_depth = object_depth
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._start = -1
+        self._in_string = False
+        self._escaped = False
+    
+    def feed(self, text: str) -> List[Dict]:
+        """
+        Scan newly received text.
+        
+        Args:
+            text: Next chunk of the model output
+            
+        Returns:
+            Objects completed by this chunk, in order
+        """
+        self._buffer += text
+        objects = []
+        buffer = self._buffer
+        for i in range(self._pos, len(buffer)):
+            char = buffer[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+                if self._depth == self._object_depth:
+                    self._start = i
+            elif char == "}" and self._depth > 0:
+                self._depth -= 1
+                if self._depth == self._object_depth - 1:
+                    try:
+                        objects.append(orjson.loads(buffer[self._start:i + 1]))
+                    except orjson.JSONDecodeError as e:
+                        logger.error(f"Skipping malformed streamed object: {e}")
+        
+        # Keep only the unfinished object so the buffer stays small
+        if self._depth >= self._object_depth:
+            self._buffer = buffer[self._start:]
+            self._start = 0
+        else:
+            self._buffer = ""
+        self._pos = len(self._buffer)
+        return objects
+
 class TesterAI:
     def __init__(self, openai_client: AsyncOpenAI):
         self.openai_client = openai_client
+        self._question_limiter = AsyncLimiter(QUESTION_RATE, 1.0)
         
-    async def parse_transcript(self, transcript_text: str) -> List[Dict[str, str]]:
-        """
-        Parse podcast transcript to extract Q&A pairs using AI.
-        Returns list of {"question": str, "answer": str} dicts.
-        """
-        try:
-            logger.info("Parsing transcript for Q&A pairs...")
-            
-            # Use AI to extract Q&A pairs from transcript
-            prompt = f"""
+    @staticmethod
+    def _transcript_prompt(transcript_text: str) -> str:
+        """Build the Q&A extraction prompt for a transcript, asking for a {"pairs": [...]} object."""
+        return f"""
             Analyze this podcast transcript and extract clear question-answer pairs. 
             Focus on questions that test knowledge about the topic being discussed.
             
-            Return ONLY a JSON array of objects with "question" and "answer" fields.
+            {_QA_OBJECT_FORMAT_INSTRUCTIONS}
             Each question should be self-contained and each answer should be the actual response from the transcript.
             
             Transcript:
             {transcript_text[:8000]}  # Limit to avoid token limits
             
             Format exactly like this:
-            [
+            {{"pairs": [
                 {{"question": "What is...", "answer": "The answer is..."}},
                 {{"question": "How does...", "answer": "It works by..."}}
-            ]
+            ]}}
             """
+    
+    async def _parse_qa_pairs(self, prompt: str, temperature: float) -> List[Dict[str, str]]:
+        """
+        Run a Q&A prompt under the QAListSchema structured output.
+        
+        Raises:
+            ValueError: If the response is not schema-valid (a refusal or a truncated reply)
+        """
+        response = await self.openai_client.chat.completions.create(
+            model=QA_PARSE_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+            max_tokens=2000,
+            response_format=_QA_RESPONSE_FORMAT
+        )
+        content = response.choices[0].message.content or ""
+        try:
+            parsed = QAListSchema.model_validate_json(content)
+        except ValidationError as e:
+            logger.debug(f"Response content: {content}")
+            raise ValueError(f"Response is not a schema-valid Q&A list: {e}") from e
+        return [pair.model_dump() for pair in parsed.pairs]
+    
+    async def parse_transcript(self, transcript_text: str) -> List[Dict[str, str]]:
+        """
+        Parse podcast transcript to extract Q&A pairs using AI.
+        Returns list of {"question": str, "answer": str} dicts.
+        """
+        try:
+            logger.info("Parsing transcript for Q&A pairs...")
+            
+            # Use AI to extract Q&A pairs from transcript; structured outputs return the parsed list
+            qa_pairs = await self._parse_qa_pairs(self._transcript_prompt(transcript_text), temperature=0.1)
             
-            response = await self.openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.1,
-                max_tokens=2000
-            )
-            
-            content = response.choices[0].message.content.strip()
-            
-            # Extract JSON from response
-            try:
-                # Find JSON array in response
-                start_idx = content.find('[')
-                end_idx = content.rfind(']') + 1
-                if start_idx != -1 and end_idx != 0:
-                    json_str = content[start_idx:end_idx]
-                    qa_pairs = json.loads(json_str)
-                    
-                    logger.info(f"Extracted {len(qa_pairs)} Q&A pairs from transcript")
-                    return qa_pairs
-                else:
-                    logger.error("No valid JSON array found in AI response")
-                    return []
-                    
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON from AI response: {e}")
-                logger.error(f"Response content: {content}")
-                return []
+            logger.info(f"Extracted {len(qa_pairs)} Q&A pairs from transcript")
+            return qa_pairs
                 
         except Exception as e:
             logger.error(f"Error parsing transcript: {e}")
             return []
     
+    async def stream_transcript(self, transcript_text: str) -> AsyncIterator[Dict[str, str]]:
+        """
+        Parse podcast transcript like parse_transcript, yielding each Q&A pair as soon
+        as the model finishes writing it.
+        
+        Args:
+            transcript_text: Raw transcript
+            
+        Yields:
+            {"question": str, "answer": str} dicts in transcript order
+            
+        Raises:
+            ValueError: If the model stopped for any reason other than a complete
+                reply (e.g. max_tokens), after yielding the pairs parsed so far
+        """
+        logger.info("Streaming transcript Q&A pairs...")
+        # Pairs sit one level down, inside the structured output's {"pairs": [...]}
+        scanner = _JsonObjectScanner(object_depth=2)
+        count = 0
+        finish_reason = None
+        stream = await self.openai_client.chat.completions.create(
+            model=QA_PARSE_MODEL,
+            messages=[{"role": "user", "content": self._transcript_prompt(transcript_text)}],
+            temperature=0.1,
+            max_tokens=2000,
+            response_format=_QA_RESPONSE_FORMAT,
+            stream=True
+        )
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+            if not choice.delta.content:
+                continue
+            for pair in scanner.feed(choice.delta.content):
+                if isinstance(pair, dict):
+                    count += 1
+                    yield pair
+        
+        logger.info(f"Extracted {count} Q&A pairs from transcript")
+        if finish_reason != "stop":
+            raise ValueError(f"Transcript stream ended incomplete (finish_reason={finish_reason})")
+    
     async def extract_questions_from_qa_pairs(self, qa_pairs: List[Dict[str, str]]) -> List[str]:
         """
         Extract just the questions from Q&A pairs for sequential firing.
@@ -104,81 +244,56 @@ class TesterAI:
             - "How does the Polkadot relay chain coordinate parachain consensus?"
             - "What are the trade-offs between Layer 1 and Layer 2 scaling solutions?"
             
-            Return ONLY a JSON array of objects with "question" and "answer" fields.
+            {_QA_OBJECT_FORMAT_INSTRUCTIONS}
             Leave the "answer" field empty since we'll get responses from the bot.
             
             Content to analyze:
             {content_text[:8000]}  # Increased limit for better analysis
             
             Format exactly like this:
-            [
+            {{"pairs": [
                 {{"question": "What is the technical difference between...", "answer": ""}},
                 {{"question": "How does parallel execution improve...", "answer": ""}},
                 {{"question": "What are the security implications of...", "answer": ""}}
-            ]
+            ]}}
             """
             
-            response = await self.openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.4,  # Slightly higher for more creative questions
-                max_tokens=2000
-            )
-            
-            content_response = response.choices[0].message.content.strip()
-            
-            # Extract JSON from response
-            try:
-                # Find JSON array in response
-                start_idx = content_response.find('[')
-                end_idx = content_response.rfind(']') + 1
-                if start_idx != -1 and end_idx != 0:
-                    json_str = content_response[start_idx:end_idx]
-                    qa_pairs = json.loads(json_str)
-                    
-                    logger.info(f"Generated {len(qa_pairs)} questions from content")
-                    for i, pair in enumerate(qa_pairs):
-                        logger.info(f"  Question {i+1}: {pair.get('question', '')[:100]}...")
-                    return qa_pairs
-                else:
-                    logger.error("No valid JSON array found in AI response")
-                    return []
-                    
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON from AI response: {e}")
-                logger.error(f"Response content: {content_response}")
-                return []
+            # Slightly higher temperature for more creative questions
+            qa_pairs = await self._parse_qa_pairs(prompt, temperature=0.4)
+            
+            logger.info(f"Generated {len(qa_pairs)} questions from content")
+            for i, pair in enumerate(qa_pairs):
+                logger.info(f"  Question {i+1}: {pair.get('question', '')[:100]}...")
+            return qa_pairs
                 
         except Exception as e:
             logger.error(f"Error parsing content for analysis: {e}")
             return []
     
-    async def fire_questions_sequentially(self, questions: List[str], orchestrator_callback) -> List[Dict]:
+    async def fire_questions_sequentially(self, questions: List[str], orchestrator_callback, concurrency: Optional[int] = None) -> List[Dict]:
         """
-        Fire questions sequentially through the orchestrator.
-        Returns list of test results.
+        Fire questions through the orchestrator, several at a time.
+        
+        Questions start at no more than QUESTION_RATE per second, with at most
+        concurrency (default: QUESTION_CONCURRENCY, 8) in flight.
+        Returns list of test results, in question order.
         """
-        results = []
+        semaphore = asyncio.Semaphore(concurrency or int(os.getenv("QUESTION_CONCURRENCY", "8")))
         
-        for i, question in enumerate(questions):
-            logger.info(f"Firing question {i+1}/{len(questions)}: {question[:50]}...")
-            
-            try:
-                # Call orchestrator to get bot response
-                result = await orchestrator_callback(question, i)
-                results.append(result)
-                
-                # Small delay between questions to avoid rate limiting
-                await asyncio.sleep(0.5)
-                
-            except Exception as e:
-                logger.error(f"Error firing question {i+1}: {e}")
-                results.append({
-                    "question_index": i,
-                    "question": question,
-                    "error": str(e),
-                    "bot_response": None,
-                    "timestamp": asyncio.get_event_loop().time()
-                })
+        async def _fire(i: int, question: str) -> Dict:
+            async with semaphore, self._question_limiter:
+                logger.info(f"Firing question {i+1}/{len(questions)}: {question[:50]}...")
+                try:
+                    # Call orchestrator to get bot response
+                    return await orchestrator_callback(question, i)
+                except Exception as e:
+                    logger.error(f"Error firing question {i+1}: {e}")
+                    return {
+                        "question_index": i,
+                        "question": question,
+                        "error": str(e),
+                        "bot_response": None,
+                        "timestamp": time.time()
+                    }
         
-        return results 
\ No newline at end of file
+        return list(await asyncio.gather(*(_fire(i, question) for i, question in enumerate(questions))))
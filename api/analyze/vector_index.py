@@ -0,0 +1,679 @@
+"""Nearest-neighbour indexes over spaCy document vectors for context retrieval."""
+
+import logging
+import threading
+from collections import abc, defaultdict
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+import numpy as np
+import orjson
+
+logger = logging.getLogger(__name__)
+
+try:
+    from usearch.index import Index
+    USEARCH_AVAILABLE = True
+except ImportError:
+    USEARCH_AVAILABLE = False
+    logger.info("usearch not available; the hnsw retrieval backend is disabled")
+
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+    logger.info("faiss not available; the ivfpq retrieval backend is disabled")
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+    logger.info("numba not available; brute-force retrieval will score with BLAS matrix products")
+
+# HNSW graph parameters: edges per node, and candidate list sizes while adding and searching
+HNSW_CONNECTIVITY = 16
+HNSW_EXPANSION_ADD = 64
+HNSW_EXPANSION_SEARCH = 100
+
+# IVF-PQ parameters: sub-quantizers per vector, bits per code, cells probed per query,
+# and the most vectors used to train the coarse and product quantizers
+IVFPQ_M = 8
+IVFPQ_NBITS = 8
+IVFPQ_NPROBE = 16
+IVFPQ_TRAIN_SAMPLE = 100_000
+
+# One search hit: row position of its record and cosine similarity
+HIT_DTYPE = np.dtype([("id", np.int64), ("score", np.float32)])
+
+
+class LazyHits(abc.Sequence):
+    """Search hits held in a HIT_DTYPE array; a hit's dict is built only when it is read.
+    
+    Items look like Mem0 similarity_search results ({'text', 'score', 'metadata'}), so
+    callers that index or iterate are unchanged, while callers that only need ids or
+    scores read the arrays without creating any dicts.
+    """
+    
+    __slots__ = ("hits", "records")
+    
+    def __init__(self, hits: np.ndarray, records: List[Dict[str, Any]]):
+        self.hits = hits
+        self.records = records
+    
+    def __len__(self) -> int:
+        return len(self.hits)
+    
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return LazyHits(self.hits[item], self.records)
+        hit_id, score = self.hits[item].tolist()
+        record = self.records[hit_id]
+        return {"text": record.get("text", ""), "score": score, "metadata": record.get("metadata", {})}
+    
+    def __repr__(self) -> str:
+        return f"LazyHits({self.to_list()!r})"
+    
+    @property
+    def ids(self) -> np.ndarray:
+        return self.hits["id"]
+    
+    @property
+    def scores(self) -> np.ndarray:
+        return self.hits["score"]
+    
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Materialize every hit, e.g. for JSON encoding."""
+        return list(self)
+
+
+class VectorIndex:
+    """Base for indexes whose keys are row positions in a list of records.
+    
+    Each record holds the 'text' and 'metadata' of one entry, so a search hit
+    resolves to its record without a lookup table. Records are saved beside the
+    index file as an orjson sidecar.
+    """
+    
+    def __init__(self, index: Any, records: List[Dict[str, Any]]):
+        self.index = index
+        self.records = records
+        # Metadata key -> value -> sorted row positions, built the first time a filter uses the key
+        self._metadata_columns: Dict[str, Dict[Any, np.ndarray]] = {}
+    
+    @staticmethod
+    def _records_path(path: Path) -> Path:
+        return path.with_name(path.name + ".records.json")
+    
+    def _save_records(self, path: Path) -> None:
+        self._records_path(path).write_bytes(orjson.dumps(self.records))
+    
+    @classmethod
+    def _load_records(cls, path: Path) -> List[Dict[str, Any]]:
+        return orjson.loads(cls._records_path(path).read_bytes())
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def _hits(self, keys: np.ndarray, scores: np.ndarray) -> LazyHits:
+        """Pack one query's (key, cosine similarity) results, dropping unfilled slots (key -1)."""
+        valid = keys >= 0
+        hits = np.empty(int(np.count_nonzero(valid)), dtype=HIT_DTYPE)
+        hits["id"] = keys[valid]
+        hits["score"] = scores[valid]
+        return LazyHits(hits, self.records)
+    
+    def _no_hits(self, count: int) -> List[LazyHits]:
+        return [LazyHits(np.empty(0, dtype=HIT_DTYPE), self.records) for _ in range(count)]
+    
+    def _top_hits(self, scores: np.ndarray, k: int, rows: Optional[np.ndarray] = None) -> LazyHits:
+        """The k best of one query's scores, best first; scores[i] belongs to record rows[i] when rows is given."""
+        keys = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+        keys = keys[np.argsort(-scores[keys], kind="stable")]
+        return self._hits(keys if rows is None else rows[keys], scores[keys])
+    
+    def _exact_hits(self, queries: np.ndarray, candidates: np.ndarray, rows: np.ndarray, k: int) -> List[LazyHits]:
+        """Score (B, d) queries against the candidate vectors of records rows by exact cosine similarity."""
+        scores = queries @ candidates.T
+        scores /= _row_norms(candidates)
+        scores /= _row_norms(queries)[:, None]
+        return [self._top_hits(row_scores, min(k, len(rows)), rows) for row_scores in scores]
+    
+    def _metadata_column(self, key: str) -> Dict[Any, np.ndarray]:
+        column = self._metadata_columns.get(key)
+        if column is None:
+            positions = defaultdict(list)
+            for row, record in enumerate(self.records):
+                value = record.get("metadata", {}).get(key)
+                try:
+                    positions[value].append(row)
+                except TypeError:
+                    # Unhashable values (lists, dicts) are only found by the linear scan below
+                    pass
+            column = {value: np.array(rows, dtype=np.int64) for value, rows in positions.items()}
+            self._metadata_columns[key] = column
+        return column
+    
+    def _filter_rows(self, filters: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Sorted row positions whose metadata equals every filter value.
+        
+        Returns:
+            None when nothing is filtered out, so callers can take their unfiltered path
+        """
+        if not filters:
+            return None
+        rows = None
+        for key, value in filters.items():
+            try:
+                matched = self._metadata_column(key).get(value, np.empty(0, dtype=np.int64))
+            except TypeError:
+                matched = np.array(
+                    [row for row, record in enumerate(self.records) if record.get("metadata", {}).get(key) == value],
+                    dtype=np.int64
+                )
+            rows = matched if rows is None else np.intersect1d(rows, matched, assume_unique=True)
+            if not len(rows):
+                break
+        return None if len(rows) == len(self.records) else rows
+
+
+class HnswIndex(VectorIndex):
+    """HNSW graph over document vectors, saved in usearch's own format."""
+    
+    @classmethod
+    def build(cls, vectors: np.ndarray, records: List[Dict[str, Any]]) -> "HnswIndex":
+        """Build an index from a batch of vectors.
+        
+        Args:
+            vectors: (N, d) document vectors
+            records: N dicts with 'text' and 'metadata', in the same order as vectors
+        
+        Returns:
+            HnswIndex over the batch
+        """
+        if not USEARCH_AVAILABLE:
+            raise RuntimeError("usearch is required to build an HNSW index")
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if len(vectors) != len(records):
+            raise ValueError(f"Got {len(vectors)} vectors for {len(records)} records")
+        
+        index = Index(
+            ndim=vectors.shape[1],
+            metric="cos",
+            connectivity=HNSW_CONNECTIVITY,
+            expansion_add=HNSW_EXPANSION_ADD,
+            expansion_search=HNSW_EXPANSION_SEARCH
+        )
+        index.add(np.arange(len(vectors), dtype=np.uint64), vectors)
+        logger.info(f"Built HNSW index over {len(vectors):,} vectors of dimension {vectors.shape[1]}")
+        return cls(index, list(records))
+    
+    def save(self, path: str) -> None:
+        """Write the graph to path and the records beside it."""
+        path = Path(path)
+        self.index.save(str(path))
+        self._save_records(path)
+        logger.info(f"Saved HNSW index with {len(self.records):,} entries to {path}")
+    
+    @classmethod
+    def restore(cls, path: str) -> "HnswIndex":
+        """Load an index written by save().
+        
+        Args:
+            path: Index file path
+        
+        Returns:
+            The restored HnswIndex
+        """
+        path = Path(path)
+        # view=True maps the saved graph read-only, so startup skips the copy into the heap
+        # and worker processes restoring the same file share its pages through the page cache
+        index = Index.restore(str(path), view=True)
+        if index is None:
+            raise ValueError(f"Not a usearch index: {path}")
+        records = cls._load_records(path)
+        logger.info(f"Restored HNSW index with {len(records):,} entries from {path}")
+        return cls(index, records)
+    
+    def search(self, vector: Sequence[float], k: int, filters: Optional[Dict[str, Any]] = None) -> LazyHits:
+        """Find the k nearest entries by cosine similarity.
+        
+        Args:
+            vector: Query vector
+            k: Maximum number of results
+            filters: Metadata values every hit must have, applied within the search
+        
+        Returns:
+            LazyHits whose items are shaped like Mem0 similarity_search results:
+            dicts with 'text', 'score' (cosine similarity) and 'metadata', best first
+        """
+        return self.search_batch(np.asarray(vector, dtype=np.float32).reshape(1, -1), k, filters)[0]
+    
+    def search_batch(self, vectors: np.ndarray, k: int, filters: Optional[Dict[str, Any]] = None) -> List[LazyHits]:
+        """Find the k nearest entries for each row of a (B, d) query matrix in one call.
+        
+        Returns:
+            One hit list per query row, as from search()
+        """
+        rows = self._filter_rows(filters)
+        if not self.records or k <= 0 or (rows is not None and not len(rows)):
+            return self._no_hits(len(vectors))
+        if rows is not None:
+            # usearch's Python API takes no search predicate, so the filtered rows are
+            # scored exactly instead of walking the graph and discarding other hits
+            candidates = np.vstack(self.index.get(rows.astype(np.uint64), dtype=np.float32))
+            return self._exact_hits(np.asarray(vectors, dtype=np.float32), candidates, rows, k)
+        matches = self.index.search(np.ascontiguousarray(vectors, dtype=np.float32), min(k, len(self.records)))
+        # usearch answers a single-row query with flat Matches rather than BatchMatches
+        counts = matches.counts.tolist() if hasattr(matches, "counts") else [matches.keys.size]
+        keys = matches.keys.astype(np.int64).reshape(len(counts), -1)
+        scores = (1.0 - matches.distances).reshape(len(counts), -1)
+        return [self._hits(keys[row, :count], scores[row, :count]) for row, count in enumerate(counts)]
+
+
+def _nearest_divisor(n: int, target: int) -> int:
+    """Divisor of n closest to target, preferring the larger on ties."""
+    return min((d for d in range(1, n + 1) if n % d == 0), key=lambda d: (abs(d - target), -d))
+
+
+def _build_ivfpq(vectors: np.ndarray, nlist: int, m: int = IVFPQ_M, nbits: int = IVFPQ_NBITS) -> "faiss.Index":
+    """Train and fill a FAISS IVF-PQ index over L2-normalized vectors.
+    
+    Args:
+        vectors: (N, d) float32 vectors, already normalized so inner product is cosine
+        nlist: Number of coarse Voronoi cells
+        m: Sub-quantizers per vector; moved to the nearest divisor of d
+        nbits: Bits per sub-quantizer code; lowered when there are too few vectors to train 2**nbits centroids
+    
+    Returns:
+        Trained faiss.IndexIVFPQ holding every vector as m codes
+    """
+    n, d = vectors.shape
+    m = _nearest_divisor(d, m)
+    nbits = max(1, min(nbits, int(np.log2(max(2, n // 39)))))
+    quantizer = faiss.IndexFlatIP(d)
+    index = faiss.IndexIVFPQ(quantizer, d, nlist, m, nbits, faiss.METRIC_INNER_PRODUCT)
+    
+    if n > IVFPQ_TRAIN_SAMPLE:
+        sample = np.random.default_rng(0).choice(n, IVFPQ_TRAIN_SAMPLE, replace=False)
+        index.train(vectors[np.sort(sample)])
+    else:
+        index.train(vectors)
+    index.add(vectors)
+    index.nprobe = min(IVFPQ_NPROBE, nlist)
+    logger.info(f"Built IVF-PQ index over {n:,} vectors: nlist={nlist}, m={m}, nbits={nbits}")
+    return index
+
+
+class IvfPqIndex(VectorIndex):
+    """FAISS IVF-PQ index storing each vector as a few bytes of product-quantized codes.
+    
+    Vectors are L2-normalized before indexing, so inner-product scores are cosine
+    similarities. The saved index file carries the coarse centroids and the PQ
+    codebook alongside the codes.
+    """
+    
+    @classmethod
+    def build(cls, vectors: np.ndarray, records: List[Dict[str, Any]]) -> "IvfPqIndex":
+        """Build an index from a batch of vectors.
+        
+        Args:
+            vectors: (N, d) document vectors
+            records: N dicts with 'text' and 'metadata', in the same order as vectors
+        
+        Returns:
+            IvfPqIndex over the batch
+        """
+        if not FAISS_AVAILABLE:
+            raise RuntimeError("faiss is required to build an IVF-PQ index")
+        vectors = np.array(vectors, dtype=np.float32, order="C")
+        if len(vectors) != len(records):
+            raise ValueError(f"Got {len(vectors)} vectors for {len(records)} records")
+        
+        faiss.normalize_L2(vectors)
+        # Keep at least ~39 training points per cell, as FAISS k-means expects
+        nlist = max(1, min(int(np.sqrt(len(vectors))), len(vectors) // 39))
+        return cls(_build_ivfpq(vectors, nlist), list(records))
+    
+    def save(self, path: str) -> None:
+        """Write the index (codes, centroids and PQ codebook) to path and the records beside it."""
+        path = Path(path)
+        faiss.write_index(self.index, str(path))
+        self._save_records(path)
+        logger.info(f"Saved IVF-PQ index with {len(self.records):,} entries to {path}")
+    
+    @classmethod
+    def restore(cls, path: str) -> "IvfPqIndex":
+        """Load an index written by save().
+        
+        Args:
+            path: Index file path
+        
+        Returns:
+            The restored IvfPqIndex
+        """
+        path = Path(path)
+        index = faiss.read_index(str(path))
+        index.nprobe = min(IVFPQ_NPROBE, index.nlist)
+        records = cls._load_records(path)
+        logger.info(f"Restored IVF-PQ index with {len(records):,} entries from {path}")
+        return cls(index, records)
+    
+    def search(self, vector: Sequence[float], k: int, filters: Optional[Dict[str, Any]] = None) -> LazyHits:
+        """Find the k nearest entries by approximate cosine similarity.
+        
+        Args:
+            vector: Query vector
+            k: Maximum number of results
+            filters: Metadata values every hit must have, applied within the search
+        
+        Returns:
+            LazyHits whose items are shaped like Mem0 similarity_search results:
+            dicts with 'text', 'score' (cosine similarity) and 'metadata', best first
+        """
+        return self.search_batch(np.asarray(vector, dtype=np.float32).reshape(1, -1), k, filters)[0]
+    
+    def search_batch(self, vectors: np.ndarray, k: int, filters: Optional[Dict[str, Any]] = None) -> List[LazyHits]:
+        """Find the k nearest entries for each row of a (B, d) query matrix in one call.
+        
+        Returns:
+            One hit list per query row, as from search(); with filters, possibly fewer
+            than k when the probed cells hold fewer matching entries
+        """
+        rows = self._filter_rows(filters)
+        if not self.records or k <= 0 or (rows is not None and not len(rows)):
+            return self._no_hits(len(vectors))
+        queries = np.array(vectors, dtype=np.float32, order="C")
+        faiss.normalize_L2(queries)
+        if rows is None:
+            scores, keys = self.index.search(queries, min(k, len(self.records)))
+        else:
+            # The selector is checked while scanning each probed inverted list
+            params = faiss.SearchParametersIVF(sel=faiss.IDSelectorBatch(rows), nprobe=self.index.nprobe)
+            scores, keys = self.index.search(queries, min(k, len(rows)), params=params)
+        return [self._hits(row_keys, row_scores) for row_keys, row_scores in zip(keys, scores)]
+
+
+def _cosine_scores_loop(query: np.ndarray, matrix: np.ndarray, inv_norms: np.ndarray, inv_query_norm: float) -> np.ndarray:
+    """Cosine similarity of query with every row of an (N, d) matrix, given reciprocal L2 norms; compiled by numba."""
+    n, d = matrix.shape
+    scores = np.empty(n, dtype=np.float32)
+    for i in prange(n):
+        total = np.float32(0.0)
+        for j in range(d):
+            total += query[j] * matrix[i, j]
+        scores[i] = total * (inv_query_norm * inv_norms[i])
+    return scores
+
+
+def _int8_scores_loop(query: np.ndarray, codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """Int32-accumulated dot products of an int8 query with (N, d) int8 codes, times each row's scale; compiled by numba."""
+    n, d = codes.shape
+    scores = np.empty(n, dtype=np.float32)
+    for i in prange(n):
+        total = np.int32(0)
+        for j in range(d):
+            total += np.int32(query[j]) * np.int32(codes[i, j])
+        scores[i] = total * scales[i]
+    return scores
+
+
+def _int8_batch_scores_loop(queries_t: np.ndarray, codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """_int8_scores_loop for a (d, B) int32 matrix of transposed query codes; compiled by numba.
+    
+    Each code element is loaded once and multiplied into all B accumulators, which
+    keeps a whole batch to a single pass over the corpus.
+    """
+    d, batch = queries_t.shape
+    n = codes.shape[0]
+    scores = np.empty((batch, n), dtype=np.float32)
+    for i in prange(n):
+        totals = np.zeros(batch, dtype=np.int32)
+        for j in range(d):
+            code = np.int32(codes[i, j])
+            for row in range(batch):
+                totals[row] += queries_t[j, row] * code
+        for row in range(batch):
+            scores[row, i] = totals[row] * scales[i]
+    return scores
+
+
+if NUMBA_AVAILABLE:
+    _cosine_scores_kernel = njit(parallel=True, fastmath=True, cache=True, nogil=True)(_cosine_scores_loop)
+    _int8_scores_kernel = njit(parallel=True, fastmath=True, cache=True, nogil=True)(_int8_scores_loop)
+    _int8_batch_scores_kernel = njit(parallel=True, fastmath=True, cache=True, nogil=True)(_int8_batch_scores_loop)
+
+
+def warm_up_brute_force() -> None:
+    """Compile the brute-force scoring kernels so the first query does not pay for JIT."""
+    if NUMBA_AVAILABLE:
+        _cosine_scores_kernel(np.ones(1, dtype=np.float32), np.ones((1, 1), dtype=np.float32), np.ones(1, dtype=np.float32), np.float32(1.0))
+        # A restored matrix is a read-only memmap, which numba compiles as a separate signature
+        readonly = np.ones((1, 1), dtype=np.float32)
+        readonly.flags.writeable = False
+        _cosine_scores_kernel(np.ones(1, dtype=np.float32), readonly, np.ones(1, dtype=np.float32), np.float32(1.0))
+        _int8_scores_kernel(np.ones(1, dtype=np.int8), np.ones((1, 1), dtype=np.int8), np.ones(1, dtype=np.float32))
+        _int8_batch_scores_kernel(np.ones((1, 2), dtype=np.int32), np.ones((1, 1), dtype=np.int8), np.ones(1, dtype=np.float32))
+
+
+if NUMBA_AVAILABLE:
+    # Compile (or load from numba's on-disk cache) in the background so importing this
+    # module stays fast; a query arriving first simply waits on numba's compile lock
+    threading.Thread(target=warm_up_brute_force, name="vector-kernel-warmup", daemon=True).start()
+
+
+def _row_norms(matrix: np.ndarray) -> np.ndarray:
+    """L2 norm of each row, with zero rows given norm 1 so they score 0 instead of NaN."""
+    norms = np.linalg.norm(matrix, axis=1).astype(np.float32)
+    norms[norms == 0] = 1.0
+    return norms
+
+
+class BruteForceIndex(VectorIndex):
+    """Exact cosine search over every stored vector, for corpora small enough to scan per query.
+    
+    The vectors are one float32 C-contiguous (N, d) matrix saved with np.save, and
+    each query is scored against all rows in a single pass. A restored matrix is a
+    read-only memory map of the saved file rather than a copy in the Python heap.
+    """
+    
+    def __init__(self, index: np.ndarray, records: List[Dict[str, Any]]):
+        super().__init__(index, records)
+        # Reciprocal row norms, computed once so scoring a query multiplies instead of taking N norms
+        self.inv_norms = 1.0 / _row_norms(index)
+    
+    @classmethod
+    def build(cls, vectors: np.ndarray, records: List[Dict[str, Any]]) -> "BruteForceIndex":
+        """Build an index from a batch of vectors.
+        
+        Args:
+            vectors: (N, d) document vectors
+            records: N dicts with 'text' and 'metadata', in the same order as vectors
+        
+        Returns:
+            BruteForceIndex over the batch
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if len(vectors) != len(records):
+            raise ValueError(f"Got {len(vectors)} vectors for {len(records)} records")
+        logger.info(f"Built brute-force index over {len(vectors):,} vectors of dimension {vectors.shape[1]}")
+        return cls(vectors, list(records))
+    
+    def save(self, path: str) -> None:
+        """Write the vector matrix to path and the records beside it."""
+        path = Path(path)
+        # Write through a file object so np.save does not append .npy to the path
+        with open(path, "wb") as f:
+            np.save(f, self.index)
+        self._save_records(path)
+        logger.info(f"Saved brute-force index with {len(self.records):,} entries to {path}")
+    
+    @classmethod
+    def restore(cls, path: str) -> "BruteForceIndex":
+        """Load an index written by save().
+        
+        Args:
+            path: Index file path
+        
+        Returns:
+            The restored BruteForceIndex
+        """
+        path = Path(path)
+        # save() writes float32 C-order, so this stays a memmap of the file; the OS page
+        # cache holds the working set and is shared by every worker serving the same index
+        matrix = np.ascontiguousarray(np.load(path, mmap_mode="r"), dtype=np.float32)
+        records = cls._load_records(path)
+        logger.info(f"Restored brute-force index with {len(records):,} entries from {path}")
+        return cls(matrix, records)
+    
+    def search(self, vector: Sequence[float], k: int, filters: Optional[Dict[str, Any]] = None) -> LazyHits:
+        """Find the k nearest entries by exact cosine similarity.
+        
+        Args:
+            vector: Query vector
+            k: Maximum number of results
+            filters: Metadata values every hit must have, applied within the search
+        
+        Returns:
+            LazyHits whose items are shaped like Mem0 similarity_search results:
+            dicts with 'text', 'score' (cosine similarity) and 'metadata', best first
+        """
+        return self.search_batch(np.asarray(vector, dtype=np.float32).reshape(1, -1), k, filters)[0]
+    
+    def search_batch(self, vectors: np.ndarray, k: int, filters: Optional[Dict[str, Any]] = None) -> List[LazyHits]:
+        """Find the k nearest entries for each row of a (B, d) query matrix.
+        
+        With filters only the matching rows are scored.
+        
+        Returns:
+            One hit list per query row, as from search()
+        """
+        rows = self._filter_rows(filters)
+        if not self.records or k <= 0 or (rows is not None and not len(rows)):
+            return self._no_hits(len(vectors))
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.shape[1] != self.index.shape[1]:
+            raise ValueError(f"Query dimension {vectors.shape[1]} does not match index dimension {self.index.shape[1]}")
+        k = min(k, len(self.records) if rows is None else len(rows))
+        return [self._top_hits(scores, k, rows) for scores in self._cosine_scores(vectors, rows)]
+    
+    def _cosine_scores(self, queries: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """(B, N) cosine similarities of float32 C-contiguous queries against every stored vector, or only rows."""
+        matrix = self.index if rows is None else self.index[rows]
+        inv_norms = self.inv_norms if rows is None else self.inv_norms[rows]
+        inv_query_norms = 1.0 / _row_norms(queries)
+        if NUMBA_AVAILABLE and len(queries) == 1:
+            return _cosine_scores_kernel(queries[0], matrix, inv_norms, inv_query_norms[0]).reshape(1, -1)
+        # One float32 GEMM for the whole batch; the BLAS library picks its
+        # AVX-512, AVX2 or NEON FMA kernel for this CPU at runtime, and it
+        # outpaces per-row kernel calls once there are several queries
+        scores = queries @ matrix.T
+        scores *= inv_norms
+        scores *= inv_query_norms[:, None]
+        return scores
+
+
+def _quantize_int8(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-row int8 quantization, so that row ~= codes * scale.
+    
+    Args:
+        matrix: (N, d) float32 vectors
+    
+    Returns:
+        (codes, scales): (N, d) int8 codes and (N,) float32 scales; all-zero rows get scale 1
+    """
+    scales = (np.abs(matrix).max(axis=1) / 127.0).astype(np.float32)
+    scales[scales == 0] = 1.0
+    codes = np.round(matrix / scales[:, None]).astype(np.int8)
+    return codes, scales
+
+
+class Int8BruteForceIndex(BruteForceIndex):
+    """BruteForceIndex holding int8 codes with a per-vector scale instead of float32 vectors.
+    
+    The corpus matrix takes a quarter of the memory, so each scan moves a quarter
+    of the bytes; products accumulate in int32 and cosine rankings stay within
+    quantization error of the float32 index. Reads the float32 matrix written by
+    the brute backend, quantizing it on load, as well as its own saved codes.
+    """
+    
+    def __init__(self, index: np.ndarray, records: List[Dict[str, Any]], scales: np.ndarray):
+        VectorIndex.__init__(self, index, records)
+        # Quantization scale over the original vector's L2 norm, so code dot products become cosines
+        self.scales = scales
+    
+    @classmethod
+    def _from_vectors(cls, vectors: np.ndarray, records: List[Dict[str, Any]]) -> "Int8BruteForceIndex":
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        codes, scales = _quantize_int8(vectors)
+        return cls(codes, records, scales / _row_norms(vectors))
+    
+    @classmethod
+    def build(cls, vectors: np.ndarray, records: List[Dict[str, Any]]) -> "Int8BruteForceIndex":
+        """Build an index from a batch of vectors.
+        
+        Args:
+            vectors: (N, d) document vectors
+            records: N dicts with 'text' and 'metadata', in the same order as vectors
+        
+        Returns:
+            Int8BruteForceIndex over the quantized batch
+        """
+        if len(vectors) != len(records):
+            raise ValueError(f"Got {len(vectors)} vectors for {len(records)} records")
+        index = cls._from_vectors(vectors, list(records))
+        logger.info(f"Built int8 brute-force index over {len(records):,} vectors of dimension {index.index.shape[1]}")
+        return index
+    
+    def save(self, path: str) -> None:
+        """Write the codes and scales to path as an .npz archive and the records beside it."""
+        path = Path(path)
+        with open(path, "wb") as f:
+            np.savez(f, codes=self.index, scales=self.scales)
+        self._save_records(path)
+        logger.info(f"Saved int8 brute-force index with {len(self.records):,} entries to {path}")
+    
+    @classmethod
+    def restore(cls, path: str) -> "Int8BruteForceIndex":
+        """Load an index written by save(), or quantize a BruteForceIndex file.
+        
+        Args:
+            path: Index file path
+        
+        Returns:
+            The restored Int8BruteForceIndex
+        """
+        path = Path(path)
+        records = cls._load_records(path)
+        saved = np.load(path)
+        if isinstance(saved, np.ndarray):
+            index = cls._from_vectors(saved, records)
+        else:
+            with saved:
+                index = cls(np.ascontiguousarray(saved["codes"]), records, saved["scales"])
+        logger.info(f"Restored int8 brute-force index with {len(records):,} entries from {path}")
+        return index
+    
+    def _cosine_scores(self, queries: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """(B, N) cosine similarities, with the queries quantized the same way as the corpus."""
+        codes = self.index if rows is None else self.index[rows]
+        scales = self.scales if rows is None else self.scales[rows]
+        query_codes, query_scales = _quantize_int8(queries)
+        if len(queries) == 1:
+            scores = _int8_scores_kernel(query_codes[0], codes, scales).reshape(1, -1)
+        else:
+            queries_t = np.ascontiguousarray(query_codes.T, dtype=np.int32)
+            scores = _int8_batch_scores_kernel(queries_t, codes, scales)
+        scores *= (query_scales / _row_norms(queries))[:, None]
+        return scores
+
+
+# RETRIEVAL_BACKEND value -> (index class, whether its library is installed)
+INDEX_BACKENDS = {
+    "hnsw": (HnswIndex, USEARCH_AVAILABLE),
+    "ivfpq": (IvfPqIndex, FAISS_AVAILABLE),
+    "brute": (BruteForceIndex, True),
+    "brute_int8": (Int8BruteForceIndex, NUMBA_AVAILABLE)
+}
@@ -5,9 +5,11 @@ from sentence_transformers import SentenceTransformer
 from openai import AsyncOpenAI
 from mem0 import Memory
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 import threading
+import httpx
 from typing import List, Dict, Any, Optional, Tuple, Union
 from dotenv import load_dotenv
 import os
@@ -50,8 +52,8 @@ logger.info(f"Environment variables with DB/CONNECTION: {list(db_vars.keys())}")
 
 logger.info("=== END ENVIRONMENT LOADING DEBUG ===")
 
-# Initialize FastAPI app
-app = FastAPI()
+# Initialize FastAPI app; responses are encoded with orjson rather than the stdlib json module
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # Add CORS middleware
 app.add_middleware(
@@ -122,7 +124,22 @@ if not openai_api_key:
     logger.error("OPENAI_API_KEY or OPENAI_TOKEN environment variable not set.")
     raise ValueError("OPENAI_API_KEY or OPENAI_TOKEN environment variable not set.")
 
-openai_client = AsyncOpenAI(api_key=openai_api_key)
+# Size the shared OpenAI connection pool for the judge's concurrency ceiling (2x headroom,
+# at least OPENAI_POOL_SIZE for the analyzer's parallel fan-out) so parallel calls reuse
+# persistent HTTP/2 connections instead of re-handshaking. The GavinBot chat handler and
+# the analyze orchestrator both use this one client.
+openai_max_concurrency = int(os.getenv("OPENAI_MAX_CONCURRENCY", "10"))
+openai_pool_size = max(openai_max_concurrency * 2, int(os.getenv("OPENAI_POOL_SIZE", "64")))
+openai_http_client = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(
+        max_connections=openai_pool_size,
+        max_keepalive_connections=openai_pool_size,
+        keepalive_expiry=60
+    ),
+    timeout=httpx.Timeout(60.0, connect=5.0)
+)
+openai_client = AsyncOpenAI(api_key=openai_api_key, http_client=openai_http_client)
 
 # Initialize Mem0 with proper configuration
 # MEM0_API_KEY is optional for self-hosted version
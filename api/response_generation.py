@@ -1,12 +1,31 @@
 """Response generation utilities and query enhancement."""
 
+import asyncio
 import logging
-from typing import Dict, Optional
-from analyze.spacy_pipeline import extract_query_insights
+from typing import Dict, List, Optional
+from analyze.dynamic_batcher import AsyncDynamicBatcher
+from analyze.spacy_pipeline import extract_query_insights, extract_query_insights_batch
 import re
 
 logger = logging.getLogger(__name__)
 
+_EMPTY_INSIGHTS = {"entities": [], "concepts": [], "key_phrases": [], "main_topics": [], "question_type": "conversational"}
+
+# Response cues expected for each question type; a response aligns if any pattern matches
+QUESTION_TYPE_RESPONSE_PATTERNS = {
+    "explanatory": [r'\b(?:because|since|due to|as a result|this means)\b', r'\b(?:example|for instance)\b'],
+    "reasoning": [r'\b(?:therefore|thus|consequently|reason|rationale)\b', r'\b(?:because|since|due to)\b'],
+    "predictive": [r'\b(?:will|would|could|might|future|trend|expect)\b', r'\b(?:likely|probably|potential)\b'],
+    "comparative": [r'\b(?:compared to|versus|vs|while|whereas|however)\b', r'\b(?:better|worse|different|similar)\b'],
+    "question": [r'\?', r'\b(?:yes|no|answer|solution)\b']
+}
+
+# Compiled once at import, each type's patterns joined into one alternation
+_QUESTION_TYPE_RESPONSE_REGEXES = {
+    question_type: re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE)
+    for question_type, patterns in QUESTION_TYPE_RESPONSE_PATTERNS.items()
+}
+
 
 def enhance_query_context(user_query: str) -> Dict:
     """
@@ -21,30 +40,61 @@ def enhance_query_context(user_query: str) -> Dict:
     """
     try:
         insights = extract_query_insights(user_query)
+        _log_insights(insights)
+        return insights
+    except Exception as e:
+        logger.warning(f"Query enhancement failed: {e}")
+        return dict(_EMPTY_INSIGHTS)
+
+
+async def _enhance_query_context_batch(user_queries: List[str]) -> List[Dict]:
+    """Run one batched spaCy pass for queries collected by _insights_batcher, in a worker thread."""
+    # spaCy holds the CPU for tens of milliseconds per batch; off the event loop other requests keep flowing
+    return await asyncio.to_thread(extract_query_insights_batch, user_queries)
+
+
+# Collects queries arriving within a few milliseconds of each other into one nlp.pipe call
+_insights_batcher = AsyncDynamicBatcher(_enhance_query_context_batch, max_batch_size=64, batch_wait_timeout_s=0.005)
+
+
+async def enhance_query_context_async(user_query: str) -> Dict:
+    """
+    enhance_query_context for request handlers; concurrent queries share one batched spaCy pass.
+    
+    Args:
+        user_query: The user's input query
         
-        # Log the insights for debugging
-        if insights.get("entities"):
-            logger.info(f"Detected entities: {[e['text'] for e in insights['entities']]}")
-        if insights.get("concepts"):
-            logger.info(f"Detected technical concepts: {insights['concepts']}")
-        if insights.get("key_phrases"):
-            logger.info(f"Key phrases: {insights['key_phrases'][:3]}")  # Show first 3
-        if insights.get("main_topics"):
-            logger.info(f"Main topics: {insights['main_topics']}")
-        
-        # Log style detection
-        style_req = insights.get("style_requirements", {})
-        if style_req.get("philosophical_score", 0) > 0.3:
-            logger.info(f"🎭 Gavin style detected - Score: {style_req['philosophical_score']:.2f}, Tone: {style_req['suggested_tone']}")
-        
-        gavin_guidance = insights.get("gavin_tone_guidance", "")
-        if gavin_guidance:
-            logger.info(f"📝 Gavin tone guidance: {len(gavin_guidance)} chars")
-        
+    Returns:
+        Dictionary containing extracted insights for prompt enhancement
+    """
+    try:
+        insights = await _insights_batcher.submit(user_query)
+        _log_insights(insights)
         return insights
     except Exception as e:
         logger.warning(f"Query enhancement failed: {e}")
-        return {"entities": [], "concepts": [], "key_phrases": [], "main_topics": [], "question_type": "conversational"}
+        return dict(_EMPTY_INSIGHTS)
+
+
+def _log_insights(insights: Dict) -> None:
+    """Log the extracted insights for debugging."""
+    if insights.get("entities"):
+        logger.info(f"Detected entities: {[e['text'] for e in insights['entities']]}")
+    if insights.get("concepts"):
+        logger.info(f"Detected technical concepts: {insights['concepts']}")
+    if insights.get("key_phrases"):
+        logger.info(f"Key phrases: {insights['key_phrases'][:3]}")  # Show first 3
+    if insights.get("main_topics"):
+        logger.info(f"Main topics: {insights['main_topics']}")
+    
+    # Log style detection
+    style_req = insights.get("style_requirements", {})
+    if style_req.get("philosophical_score", 0) > 0.3:
+        logger.info(f"🎭 Gavin style detected - Score: {style_req['philosophical_score']:.2f}, Tone: {style_req['suggested_tone']}")
+    
+    gavin_guidance = insights.get("gavin_tone_guidance", "")
+    if gavin_guidance:
+        logger.info(f"📝 Gavin tone guidance: {len(gavin_guidance)} chars")
 
 
 def format_context_enhancement(insights: Dict) -> str:
@@ -231,20 +281,8 @@ def validate_response_semantic_alignment(response_text: str, query_insights: Dic
     # Check question type alignment
     question_type = query_insights.get("question_type", "conversational")
     if question_type != "conversational":
-        type_patterns = {
-            "explanatory": [r'\b(?:because|since|due to|as a result|this means)\b', r'\b(?:example|for instance)\b'],
-            "reasoning": [r'\b(?:therefore|thus|consequently|reason|rationale)\b', r'\b(?:because|since|due to)\b'],
-            "predictive": [r'\b(?:will|would|could|might|future|trend|expect)\b', r'\b(?:likely|probably|potential)\b'],
-            "comparative": [r'\b(?:compared to|versus|vs|while|whereas|however)\b', r'\b(?:better|worse|different|similar)\b'],
-            "question": [r'\?', r'\b(?:yes|no|answer|solution)\b']
-        }
-        
-        patterns = type_patterns.get(question_type, [])
-        type_alignment = 0
-        for pattern in patterns:
-            if re.search(pattern, response_lower, re.IGNORECASE):
-                type_alignment = 1
-                break
+        type_regex = _QUESTION_TYPE_RESPONSE_REGEXES.get(question_type)
+        type_alignment = 1 if type_regex is not None and type_regex.search(response_lower) else 0
         
         alignment_score += type_alignment * 0.1
         total_checks += 0.1
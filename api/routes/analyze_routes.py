@@ -1,11 +1,12 @@
 import os
 import asyncio
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Request
-from fastapi.responses import HTMLResponse, FileResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, FileResponse, RedirectResponse, Response, StreamingResponse
+import orjson
 from pydantic import BaseModel
 from typing import Optional, Dict, Any, List
-from config import openai_client, static_path, logger
-from analyze.orchestrator import AnalyzeOrchestrator
+from config import openai_client, openai_pool_size, static_path, logger
+from analyze.orchestrator import AnalyzeOrchestrator, status_delta, to_json_bytes
 import time
 from utils.utils import add_memory
 
@@ -27,6 +28,27 @@ class ContentAnalysisRequest(BaseModel):
     text: str
     session_name: Optional[str] = None
 
+def json_response(payload: Dict[str, Any]) -> Response:
+    """Return a payload encoded with orjson, bypassing FastAPI's jsonable_encoder pass."""
+    return Response(content=to_json_bytes(payload), media_type="application/json")
+
+def progress_event_stream(statuses) -> StreamingResponse:
+    """
+    Encode an orchestrator status stream as server-sent events.
+    
+    The first event ("snapshot") carries the full status; each later event ("delta")
+    carries only the keys, and progress fields, that changed since the previous one.
+    """
+    async def events():
+        previous = None
+        async for status in statuses:
+            if previous is None:
+                yield b"event: snapshot\ndata: " + to_json_bytes(status) + b"\n\n"
+            else:
+                yield b"event: delta\ndata: " + to_json_bytes(status_delta(previous, status)) + b"\n\n"
+            previous = status
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
 def get_orchestrator():
     """Get or create the analyze orchestrator instance."""
     global orchestrator
@@ -35,7 +57,8 @@ def get_orchestrator():
         orchestrator = AnalyzeOrchestrator(
             openai_client=openai_client,
             gavin_bot_handler=create_gavin_bot_handler(),
-            use_mt_bench=True  # Enable MT-Bench evaluation
+            use_mt_bench=True,  # Enable MT-Bench evaluation
+            openai_pool_size=openai_pool_size
         )
     return orchestrator
 
@@ -99,8 +122,7 @@ def create_gavin_bot_handler():
                 
                 # Extract row number from analysis
                 if hasattr(analysis_response, 'body'):
-                    import json
-                    analysis_json = json.loads(analysis_response.body.decode())
+                    analysis_json = orjson.loads(analysis_response.body)
                     row_number = analysis_json.get("row_number", 1)
                 else:
                     row_number = analysis_response.get("row_number", 1)
@@ -165,16 +187,23 @@ async def start_analyze(request: AnalyzeRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @analyze_router.get("/status")
-async def get_analyze_status():
-    """Get current analyze session status."""
+async def get_analyze_status(session_id: Optional[int] = None, since: Optional[int] = None):
+    """
+    Get analyze session status; defaults to the latest session.
+    
+    Passing since=<progress_version> long-polls until progress changes (up to 30s).
+    """
     try:
         orchestrator = get_orchestrator()
-        status = orchestrator.get_session_status()
+        if since is not None:
+            status = await orchestrator.wait_progress(session_id, since)
+        else:
+            status = orchestrator.get_session_status(session_id)
         
         if not status:
             raise HTTPException(status_code=404, detail="No active analyze session")
         
-        return status
+        return json_response(status)
         
     except HTTPException:
         raise
@@ -182,12 +211,38 @@ async def get_analyze_status():
         logger.error(f"Error getting analyze status: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@analyze_router.get("/status/stream")
+async def stream_analyze_status(session_id: Optional[int] = None):
+    """Stream analyze session status as server-sent events until the session finishes."""
+    orchestrator = get_orchestrator()
+    if not orchestrator.get_session(session_id):
+        raise HTTPException(status_code=404, detail="No active analyze session")
+    return progress_event_stream(orchestrator.stream_progress(session_id))
+
+@analyze_router.post("/cancel")
+async def cancel_analyze(session_id: Optional[int] = None):
+    """Cancel a running analyze session; defaults to the latest session."""
+    try:
+        orchestrator = get_orchestrator()
+        status = await orchestrator.cancel_session(session_id)
+        
+        if not status:
+            raise HTTPException(status_code=404, detail="No active analyze session")
+        
+        return json_response(status)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error cancelling analyze session: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @analyze_router.get("/results")
-async def get_analyze_results():
-    """Get detailed results from completed analyze session."""
+async def get_analyze_results(session_id: Optional[int] = None):
+    """Get detailed results from completed analyze session; defaults to the latest session."""
     try:
         orchestrator = get_orchestrator()
-        results = orchestrator.get_detailed_results()
+        results = orchestrator.get_detailed_results(session_id)
         
         if not results:
             raise HTTPException(status_code=404, detail="No completed analyze results available")
@@ -230,7 +285,7 @@ async def get_analyze_results():
         else:
             results["mt_bench_available"] = False
         
-        return results
+        return json_response(results)
         
     except HTTPException:
         raise
@@ -257,17 +312,32 @@ async def start_multi_turn_test(request: MultiTurnTestRequest):
         logger.error(f"Error starting multi-turn test: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@analyze_router.get("/multi-turn/status/stream")
+async def stream_multi_turn_status(session_id: Optional[int] = None):
+    """Stream multi-turn test session status as server-sent events until the session finishes."""
+    orchestrator = get_orchestrator()
+    if not orchestrator.get_session(session_id, multi_turn=True):
+        raise HTTPException(status_code=404, detail="No active multi-turn test session")
+    return progress_event_stream(orchestrator.stream_progress(session_id, multi_turn=True))
+
 @analyze_router.get("/multi-turn/status")
-async def get_multi_turn_status():
-    """Get current multi-turn test session status."""
+async def get_multi_turn_status(session_id: Optional[int] = None, since: Optional[int] = None):
+    """
+    Get multi-turn test session status; defaults to the latest session.
+    
+    Passing since=<progress_version> long-polls until progress changes (up to 30s).
+    """
     try:
         orchestrator = get_orchestrator()
-        status = orchestrator.get_multi_turn_status()
+        if since is not None:
+            status = await orchestrator.wait_progress(session_id, since, multi_turn=True)
+        else:
+            status = orchestrator.get_multi_turn_status(session_id)
         
         if not status:
             raise HTTPException(status_code=404, detail="No active multi-turn test session")
         
-        return status
+        return json_response(status)
         
     except HTTPException:
         raise
@@ -275,17 +345,35 @@ async def get_multi_turn_status():
         logger.error(f"Error getting multi-turn test status: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@analyze_router.post("/multi-turn/cancel")
+async def cancel_multi_turn_test(session_id: Optional[int] = None):
+    """Cancel a running multi-turn test session; defaults to the latest session."""
+    try:
+        orchestrator = get_orchestrator()
+        status = await orchestrator.cancel_session(session_id, multi_turn=True)
+        
+        if not status:
+            raise HTTPException(status_code=404, detail="No active multi-turn test session")
+        
+        return json_response(status)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error cancelling multi-turn test session: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @analyze_router.get("/multi-turn/results")
-async def get_multi_turn_results():
-    """Get detailed results from completed multi-turn test session."""
+async def get_multi_turn_results(session_id: Optional[int] = None):
+    """Get detailed results from completed multi-turn test session; defaults to the latest session."""
     try:
         orchestrator = get_orchestrator()
-        results = orchestrator.get_multi_turn_results()
+        results = orchestrator.get_multi_turn_results(session_id)
         
         if not results:
             raise HTTPException(status_code=404, detail="No completed multi-turn test results available")
         
-        return results
+        return json_response(results)
         
     except HTTPException:
         raise
@@ -382,12 +470,12 @@ async def get_content_analysis_status(session_id: int):
     """Get content analysis session status by session ID."""
     try:
         orchestrator = get_orchestrator()
-        status = orchestrator.get_session_status()
+        status = orchestrator.get_session_status(session_id)
         
-        if not status or status.get("session_id") != session_id:
+        if not status:
             raise HTTPException(status_code=404, detail="Content analysis session not found")
         
-        return status
+        return json_response(status)
         
     except HTTPException:
         raise
@@ -400,15 +488,15 @@ async def get_content_analysis_results(session_id: int):
     """Get detailed results from completed content analysis session."""
     try:
         orchestrator = get_orchestrator()
-        results = orchestrator.get_detailed_results()
+        results = orchestrator.get_detailed_results(session_id)
         
-        if not results or not results.get("session_info") or results["session_info"].get("session_id") != session_id:
+        if not results or not results.get("session_info"):
             raise HTTPException(status_code=404, detail="Content analysis results not found")
         
         # Add top-level fields for easier access in frontend
         results["session_id"] = results["session_info"]["session_id"]
         results["questions"] = [pair.get("question", "") for pair in results.get("qa_pairs", [])]
-        results["test_results"] = orchestrator.current_session.get("test_results", []) if orchestrator.current_session else []
+        results["test_results"] = orchestrator.get_session(session_id).test_results
         
         # Add MT-Bench analysis if available
         if "mt_bench_analysis" in results:
@@ -448,7 +536,7 @@ async def get_content_analysis_results(session_id: int):
         else:
             results["mt_bench_available"] = False
         
-        return results
+        return json_response(results)
         
     except HTTPException:
         raise
@@ -14,7 +14,7 @@ from .memory_routes import memory_router
 from .analyze_routes import analyze_router
 from .logs_routes import logs_router
 from preprocess.preprocess_routes import deep_debug_router
-from response_generation import tone_bleurt_gate, enhance_query_context, format_context_enhancement
+from response_generation import tone_bleurt_gate, enhance_query_context_async, format_context_enhancement
 import time
 from utils.route_helpers import (
     stream_openai_response,
@@ -240,7 +240,7 @@ async def chat(handle: str, message: dict, request: Request, background_tasks: B
         
         # Extract insights from the user query using spaCy
         logger.info("🔍 Extracting query insights with spaCy...")
-        query_insights = enhance_query_context(user_message)
+        query_insights = await enhance_query_context_async(user_message)
         context_enhancement = format_context_enhancement(query_insights)
         
         # Build persona context with query insights
@@ -504,7 +504,7 @@ async def debug_analyze_prompt(request_data: dict):
             memories_with_scores = []
         
         # Extract query insights
-        query_insights = enhance_query_context(user_message)
+        query_insights = await enhance_query_context_async(user_message)
         context_enhancement = format_context_enhancement(query_insights)
         
         persona_context_parts = []
@@ -0,0 +1,37 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("openai")
+pytest.importorskip("tenacity")
+pytest.importorskip("aiolimiter")
+pytest.importorskip("orjson")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from analyze.judge_ai import JudgeAI  # noqa: E402
+from analyze.mt_bench_evaluator import MTBenchEvaluation  # noqa: E402
+
+
+def test_failed_judge_calls_are_reported_through_judge_ai():
+    judge = JudgeAI(openai_client=None)
+    dimensions = {"relevance": 0.8, "accuracy": 0.8, "clarity": 0.8, "depth": 0.8, "helpfulness": 0.8}
+    ok = MTBenchEvaluation(0.8, dimensions, "fine", ["clear"], [], 0.9)
+    failed = judge.mt_bench_evaluator._create_default_evaluation("Evaluation error: timeout")
+    
+    async def evaluate_batch_responses(qa_pairs, responses, **kwargs):
+        return [ok, failed]
+    
+    judge.mt_bench_evaluator.evaluate_batch_responses = evaluate_batch_responses
+    test_results = [{"bot_response": "a"}, {"bot_response": "b"}]
+    qa_pairs = [{"question": "q1", "answer": ""}, {"question": "q2", "answer": ""}]
+    evaluated = asyncio.run(judge.batch_evaluate(test_results, qa_pairs))
+    
+    metrics = judge.calculate_aggregate_metrics(evaluated)
+    
+    assert metrics["total_evaluations"] == 2
+    assert metrics["failed_evaluations"] == 1
+    assert metrics["avg_overall_score"] == pytest.approx(0.8)
@@ -0,0 +1,80 @@
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("orjson")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from analyze.vector_index import BruteForceIndex  # noqa: E402
+
+
+def _index():
+    vectors = np.array([
+        [1.0, 0.0, 0.0],
+        [0.9, 0.1, 0.0],
+        [0.0, 1.0, 0.0],
+        [0.7, 0.0, 0.7],
+        [0.0, 0.0, 1.0],
+    ], dtype=np.float32)
+    records = [
+        {"text": "a", "metadata": {"source": "blog", "lang": "en"}},
+        {"text": "b", "metadata": {"source": "tweet", "lang": "en"}},
+        {"text": "c", "metadata": {"source": "blog", "lang": "de"}},
+        {"text": "d", "metadata": {"source": "blog", "lang": "en", "tags": ["x", "y"]}},
+        {"text": "e", "metadata": {}},
+    ]
+    return BruteForceIndex.build(vectors, records)
+
+
+def test_unfiltered_search_ranks_every_record():
+    hits = _index().search([1.0, 0.0, 0.0], k=3)
+    
+    assert [hit["text"] for hit in hits] == ["a", "b", "d"]
+    assert hits[0]["score"] == pytest.approx(1.0)
+
+
+def test_filtered_search_only_returns_matching_records():
+    index = _index()
+    
+    hits = index.search([1.0, 0.0, 0.0], k=3, filters={"source": "blog"})
+    
+    assert [hit["text"] for hit in hits] == ["a", "d", "c"]
+    # Filtered scores are the same cosine similarities as unfiltered ones
+    unfiltered = {hit["text"]: hit["score"] for hit in index.search([1.0, 0.0, 0.0], k=5)}
+    assert [hit["score"] for hit in hits] == pytest.approx([unfiltered[text] for text in "adc"])
+
+
+def test_filters_on_several_keys_intersect():
+    index = _index()
+    
+    assert index._filter_rows({"source": "blog", "lang": "en"}).tolist() == [0, 3]
+    hits = index.search_batch(np.eye(3, dtype=np.float32), k=5, filters={"source": "blog", "lang": "en"})
+    assert [[hit["text"] for hit in row] for row in hits] == [["a", "d"], ["a", "d"], ["d", "a"]]
+
+
+def test_filter_with_no_match_returns_no_hits():
+    index = _index()
+    
+    assert len(index.search([1.0, 0.0, 0.0], k=3, filters={"source": "podcast"})) == 0
+    assert len(index.search([1.0, 0.0, 0.0], k=3, filters={"source": "tweet", "lang": "de"})) == 0
+    assert [len(row) for row in index.search_batch(np.eye(3, dtype=np.float32), k=3, filters={"lang": "fr"})] == [0, 0, 0]
+
+
+def test_unhashable_filter_values_are_matched_by_scan():
+    hits = _index().search([1.0, 0.0, 0.0], k=3, filters={"tags": ["x", "y"]})
+    
+    assert [hit["text"] for hit in hits] == ["d"]
+
+
+def test_filter_matching_every_record_takes_the_unfiltered_path():
+    index = BruteForceIndex.build(
+        np.eye(2, dtype=np.float32),
+        [{"text": "a", "metadata": {"source": "blog"}}, {"text": "b", "metadata": {"source": "blog"}}]
+    )
+    
+    assert index._filter_rows({"source": "blog"}) is None
+    assert index._filter_rows(None) is None
+    assert [hit["text"] for hit in index.search([1.0, 0.0], k=2, filters={"source": "blog"})] == ["a", "b"]